@@ -3,9 +3,37 @@ Adventures in Odyssey API Package
 """
 from .clubclient import ClubClient
 from .aioclient import AIOClient
+from .ratelimit import RateLimiter, FileRateLimiter
+from .metrics import ClientMetrics
+from .transport import LiveTransport, HTTP2Transport, RecordingTransport, ReplayTransport, CassetteMissError, create_transport
+from .decoding import JSONDecoder, OrjsonDecoder, MsgspecDecoder, DecodeError, get_decoder
+from .tokenstore import TokenStore, FileTokenStore, SQLiteTokenStore
+from .comments import CommentIndex, CommentFeed
+from .radio import RadioWatcher
+from .bulk import BulkReport
+from .deadline import Deadline, DeadlineExceeded, deadline_scope
+from .hedging import HedgingPolicy
+from .circuitbreaker import CircuitBreaker, CircuitOpenError
+from .swr import StaleWhileRevalidateCache
+from .playback import PlaybackQueue
+from .episodes import EpisodeIndex
+from .reverse import ReverseIndex
+from .singleflight import SingleFlight
+from .maintainer import SessionMaintainer
+from .tracing import Tracer, NoOpTracer, OpenTelemetryTracer, RecordingTracer
+from .httpcache import HTTPCache
+from .snapshot import CatalogSnapshot, CatalogDiff
 
 __version__ = "0.1.8"
-__all__ = ["ClubClient", "AIOClient"]
+__all__ = ["ClubClient", "AIOClient", "RateLimiter", "FileRateLimiter", "ClientMetrics",
+           "LiveTransport", "HTTP2Transport", "RecordingTransport", "ReplayTransport", "CassetteMissError", "create_transport",
+           "JSONDecoder", "OrjsonDecoder", "MsgspecDecoder", "DecodeError", "get_decoder",
+           "TokenStore", "FileTokenStore", "SQLiteTokenStore", "CommentIndex", "CommentFeed", "RadioWatcher", "BulkReport",
+           "Deadline", "DeadlineExceeded", "deadline_scope", "HedgingPolicy",
+           "CircuitBreaker", "CircuitOpenError", "StaleWhileRevalidateCache",
+           "PlaybackQueue", "EpisodeIndex", "ReverseIndex", "SingleFlight", "SessionMaintainer",
+           "Tracer", "NoOpTracer", "OpenTelemetryTracer", "RecordingTracer", "HTTPCache",
+           "CatalogSnapshot", "CatalogDiff"]
 
 import logging
 
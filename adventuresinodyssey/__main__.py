@@ -0,0 +1,8 @@
+"""
+Runs the command-line interface: python -m adventuresinodyssey --help
+"""
+import sys
+
+from .cli import main
+
+sys.exit(main())
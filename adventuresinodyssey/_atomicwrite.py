@@ -0,0 +1,39 @@
+"""
+Atomic file writes: data goes to a temporary file in the same directory, which then
+replaces the target, so readers (and other processes) never see a partial file.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Union
+
+
+def atomic_write(path: Union[str, Path], data: Union[bytes, str], fsync: bool = False):
+    """
+    Replaces `path` with `data` atomically, creating its directory if needed.
+
+    Args:
+        path: The file to write.
+        data: The contents; str is written as UTF-8.
+        fsync: If True, the data is flushed to disk before the file is replaced. Defaults to False.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+
+    fd, temp_path = tempfile.mkstemp(dir=str(path.parent), prefix=path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
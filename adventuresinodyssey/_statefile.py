@@ -0,0 +1,42 @@
+"""
+Versioned JSON state files, for the indexes and snapshots that persist between runs.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Optional, Dict, Any, Union
+
+from ._atomicwrite import atomic_write
+
+logger = logging.getLogger(__name__)
+
+
+def save_state(path: Union[str, Path], version: int, state: Dict[str, Any]):
+    """Writes `state`, tagged with its format version, to a JSON file (atomically)."""
+    atomic_write(path, json.dumps({'version': version, **state}, separators=(',', ':')))
+
+
+def load_state(path: Union[str, Path], version: int, description: str) -> Optional[Dict[str, Any]]:
+    """
+    Reads a file written by save_state().
+
+    Args:
+        path: The file.
+        version: The format version the caller understands.
+        description: What the file holds (e.g., 'comment index'), for the log.
+
+    Returns:
+        Optional[Dict[str, Any]]: The state, or None if the file does not exist or was written
+        by an incompatible version.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    with path.open('r', encoding='utf-8') as f:
+        state = json.load(f)
+    if state.get('version') != version:
+        logger.warning(f"Ignoring {description} {path}: unsupported version {state.get('version')}.")
+        return None
+    return state
@@ -4,8 +4,26 @@ Used for accessing publicly available content (e.g., promo content, radio schedu
 """
 
 import logging
-from typing import Optional, Dict, Any, List, Union
+import re
+import time
+from typing import Optional, Dict, Any, List, Union, Type, Iterator
+from urllib.parse import urlparse
 import requests
+from .ratelimit import RateLimiter
+from .metrics import ClientMetrics
+from .transport import Transport, LiveTransport
+from .decoding import JSONDecoder, get_decoder
+from .deadline import DeadlineExceeded, current_deadline, clamp_timeout, with_deadline
+from .hedging import HedgingPolicy, is_idempotent
+from .circuitbreaker import CircuitBreaker, CircuitOpenError
+from .swr import StaleWhileRevalidateCache
+from .paging import iter_pages
+from .episodes import EpisodeIndex, GROUPING_TYPES, grouping_episodes
+from .reverse import ReverseIndex, DEFAULT_MAX_AGE
+from .singleflight import SingleFlight
+from .tracing import Tracer, NoOpTracer, traced
+from .httpcache import HTTPCache
+from .snapshot import CatalogSnapshot
 
 # Configure logging
 logging.basicConfig(
@@ -26,6 +44,50 @@ DEFAULT_FIELDS = {
     "Badge__c": ["Name", "Icon__c", "Type__c"]
 }
 
+# Named fetch_content projections. 'include' lists the include flags sent to the API
+# and 'fields' the top-level fields kept in the result (None keeps the whole payload).
+CONTENT_PROJECTIONS: Dict[str, Dict[str, Any]] = {
+    'full': {
+        'include': ('tag', 'series', 'recommendations', 'player', 'parent'),
+        'fields': None,
+    },
+    'metadata': {
+        'include': ('tag', 'series', 'parent'),
+        'fields': ('id', 'name', 'short_name', 'long_name', 'description', 'episode_number', 'subtype', 'air_date',
+                   'thumbnail_small', 'album_id', 'album_name', 'tags', 'characters', 'authors'),
+    },
+    'playback': {
+        'include': ('player',),
+        'fields': ('id', 'name', 'short_name', 'download_url', 'signed_cookie', 'media_length', 'thumbnail_small'),
+    },
+}
+
+# Salesforce record IDs are 15 or 18 alphanumeric characters
+_RECORD_ID_PATTERN = re.compile(r'^[A-Za-z0-9]{15}(?:[A-Za-z0-9]{3})?$')
+
+
+def _endpoint_key(url: str) -> str:
+    """
+    Reduces a request URL to a stable endpoint key used for per-endpoint policies.
+    
+    The API base and 'apexrest/v1/' prefix are stripped and record IDs are replaced
+    with '{id}', e.g. '.../apexrest/v1/content/a354W0000046U6OQAU?tag=true' -> 'content/{id}'
+    and '.../services/oauth2/token' -> 'oauth2/token'.
+    """
+    path = urlparse(url).path
+    if '/services/' in path:
+        path = path.split('/services/', 1)[1]
+    if path.startswith(API_PREFIX):
+        path = path[len(API_PREFIX):]
+
+    segments = []
+    for segment in path.strip('/').split('/'):
+        # Require a digit so 15-letter words like 'contentgrouping' are kept
+        if _RECORD_ID_PATTERN.match(segment) and any(c.isdigit() for c in segment):
+            segment = '{id}'
+        segments.append(segment)
+    return '/'.join(segments)
+
 
 class AIOClient:
     """
@@ -33,13 +95,42 @@ class AIOClient:
     Does not handle login, profile selection, or token management.
     """
     
-    def __init__(self, timeout: int = 10):
+    def __init__(self, timeout: int = 10, rate_limiter: Optional[RateLimiter] = None, metrics: Optional[ClientMetrics] = None, transport: Optional[Transport] = None, decoder: Optional[JSONDecoder] = None, hedging: Optional[HedgingPolicy] = None, circuit_breaker: Optional[CircuitBreaker] = None, swr_cache: Optional[StaleWhileRevalidateCache] = None, single_flight: Optional[SingleFlight] = None, tracer: Optional[Tracer] = None, http_cache: Optional[HTTPCache] = None):
         """
         Initialize the AIO API client configuration for unauthenticated access.
+        
+        Args:
+            timeout: Default request timeout in seconds. Defaults to 10.
+            rate_limiter: Optional. A RateLimiter (or FileRateLimiter) consulted before every request.
+            metrics: Optional. A ClientMetrics instance that records every request.
+            transport: Optional. The Transport that sends requests (e.g., RecordingTransport, ReplayTransport).
+                       Defaults to LiveTransport().
+            decoder: Optional. The JSONDecoder for response bodies. Defaults to the fastest installed
+                     backend (msgspec, orjson, then the standard library).
+            hedging: Optional. A HedgingPolicy that duplicates slow idempotent requests (GETs and searches).
+            circuit_breaker: Optional. A CircuitBreaker that fails requests fast while their endpoint family is unhealthy.
+            swr_cache: Optional. A StaleWhileRevalidateCache serving fetch_home_playlists, fetch_carousel
+                       and fetch_radio from the last good response.
+            single_flight: Optional. A SingleFlight that makes identical idempotent requests in flight
+                           at the same time share one upstream request.
+            tracer: Optional. A Tracer (e.g., OpenTelemetryTracer) that records a span per public call,
+                    with nested auth, network, decode and postprocess spans. Defaults to NoOpTracer().
+            http_cache: Optional. An HTTPCache that stores content and content grouping responses on
+                        disk and revalidates them with conditional requests.
         """
         
         self.state = "ready"
         self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.metrics = metrics
+        self.transport = transport or LiveTransport()
+        self.decoder = decoder or get_decoder()
+        self.hedging = hedging
+        self.circuit_breaker = circuit_breaker
+        self.swr_cache = swr_cache
+        self.single_flight = single_flight
+        self.tracer = tracer or NoOpTracer()
+        self.http_cache = http_cache
         
         # Client configuration (minimal set)
         self.config = {
@@ -55,7 +146,9 @@ class AIOClient:
             # NO x-viewer-id, x-pin, or Authorization header should be set
         })
 
-    def fetch_content(self, content_id: str, page_type: str = 'promo') -> Dict[str, Any]:
+    @with_deadline
+    @traced
+    def fetch_content(self, content_id: str, page_type: str = 'promo', schema: Optional[Type] = None, projection: str = 'full') -> Dict[str, Any]:
         """
         Fetches detailed content data for a given ID.
         
@@ -65,32 +158,28 @@ class AIOClient:
         Args:
             content_id: The ID of the content to fetch (e.g., 'a354W0000046U6OQAU').
             page_type: The type of content page: 'promo' (default) or 'radio'.
+            schema: Optional. A typed schema to decode into (e.g., schemas.Content).
+            projection: Which parts of the payload to request and keep: 'full' (default), 'metadata'
+                        or 'playback'. See CONTENT_PROJECTIONS.
             
         Returns:
-            Dict[str, Any]: The parsed JSON response from the API.
+            Dict[str, Any]: The parsed JSON response from the API, trimmed to the projection's fields
+            (or a `schema` instance).
             
         Raises:
-            ValueError: If the unsupported 'full' page_type is provided.
+            ValueError: If the unsupported 'full' page_type or an unknown projection is provided.
             requests.exceptions.HTTPError: If the API request fails.
         """
         if page_type == 'full':
             raise ValueError("The 'full' page_type requires authentication and is not supported by AIOClient.")
         
+        params = self._content_params(projection)
         is_radio = (page_type == 'radio')
         
         # Base API URL structure for content details
         endpoint = f"apexrest/{self.config['api_version']}/content/{content_id}"
         url = f"{self.config['api_base']}{endpoint}"
 
-        # Standard default parameters for 'promo'
-        params = {
-            'tag': 'true',
-            'series': 'true',
-            'recommendations': 'true',
-            'player': 'true',
-            'parent': 'true'
-        }
-
         if is_radio:
             # Add radio-specific parameter
             params['radio_page_type'] = 'aired'
@@ -99,14 +188,36 @@ class AIOClient:
         logger.info(f"Attempting to fetch content ID: {content_id} (Page Type: {page_type})")
         
         try:
-            response = self.session.get(url, params=params)
+            response = self._request('GET', url, params=params, timeout=self.timeout)
             response.raise_for_status()
             logger.info(f"Content fetch successful for ID: {content_id} (Page Type: {page_type})")
-            return response.json()
+            return self._project_content(self._decode(response, schema), projection)
         except requests.exceptions.HTTPError as e:
             logger.error(f"Failed to fetch content ID {content_id} (Page Type: {page_type}): {e}")
             raise
         
+    def _content_params(self, projection: str) -> Dict[str, str]:
+        """
+        Returns the include flags for a fetch_content projection.
+        
+        Raises:
+            ValueError: If the projection is unknown.
+        """
+        if projection not in CONTENT_PROJECTIONS:
+            raise ValueError(f"Invalid projection '{projection}'. Must be one of: {', '.join(CONTENT_PROJECTIONS)}.")
+        # Flags that are left out are not included by the API, so only send the 'true' ones
+        return {flag: 'true' for flag in CONTENT_PROJECTIONS[projection]['include']}
+    
+    def _project_content(self, content: Any, projection: str) -> Any:
+        """Trims a decoded content payload to the projection's fields. Typed schemas are returned as-is."""
+        fields = CONTENT_PROJECTIONS[projection]['fields']
+        if fields is None or not isinstance(content, dict):
+            return content
+        with self.tracer.span('aio.project_content', phase='postprocess', projection=projection):
+            return {field: content[field] for field in fields if field in content}
+        
+    @with_deadline
+    @traced
     def fetch_radio(self, page_type: str = 'aired', page_number: int = 1, page_size: int = 5) -> Dict[str, Any]:
         """
         Fetches the schedule of aired or upcoming radio episodes.
@@ -148,8 +259,10 @@ class AIOClient:
         logger.info(f"Attempting to fetch {log_info} (Page {page_number}, Size {page_size})")
 
         # The endpoint is 'content/search', and the generalized get method handles the base URL.
-        return self.get("content/search", params=params)
+        return self._cached(('radio', page_type, page_number, page_size), lambda: self.get("content/search", params=params))
     
+    @with_deadline
+    @traced
     def cache_episodes(self, grouping_type: str = "Album", include_bonus: bool = False) -> List[Dict[str, Any]]:
         """
         Retrieves all available audio episodes from the specified content grouping type 
@@ -165,68 +278,165 @@ class AIOClient:
 
         Returns:
             List[Dict[str, Any]]: A flat list of cleaned episode dictionaries.
+            
+        Raises:
+            DeadlineExceeded: If the deadline passes; its `partial` holds the episodes gathered so far.
         """
 
         logger.info(f"Starting process to cache all episodes (fetching all '{grouping_type}' pages).")
         
         all_episodes = []
-        current_page = 1
-        total_pages = 1  # Will be updated after the first API call
-
-        # Loop until the current page exceeds the total number of pages
-        while current_page <= total_pages:
-            logger.debug(f"Fetching '{grouping_type}' page {current_page} of {total_pages}...")
-            
-            # Fetch content groupings (e.g., Albums or Episode Home)
-            # Use a large page size (100) to minimize the number of API calls
-            response = self.fetch_content_groupings(
-                grouping_type=grouping_type,
-                page_number=current_page, 
-                page_size=100
-            )
-            
-            # Update total pages on the first request
-            if current_page == 1:
-                try:
-                    total_pages = response['metadata']['totalPageCount']
-                    logger.info(f"Total '{grouping_type}' pages to retrieve: {total_pages}")
-                except (KeyError, TypeError):
-                    logger.warning("Could not determine totalPageCount from metadata. Assuming only one page.")
-            
-            # Process the content groupings on the current page
-            content_groupings = response.get('contentGroupings', [])
-            
-            for content_grouping in content_groupings: # <<< RENAMED FROM 'album' for generality
-                # Use a generic name for the grouping ID and Name
-                grouping_id = content_grouping.get('id')
-                grouping_name = content_grouping.get('name', f'UNKNOWN {grouping_type.upper()}')
-                
-                if not grouping_id:
+        try:
+            for episode in self.iter_episodes(grouping_type=grouping_type, include_bonus=include_bonus):
+                all_episodes.append(episode)
+        except DeadlineExceeded as e:
+            # Hand back the episodes gathered from the pages fetched so far
+            logger.warning(f"Deadline exceeded after {len(all_episodes)} episodes; returning partial results on the error.")
+            e.partial = all_episodes
+            raise
+
+        logger.info(f"Successfully cached {len(all_episodes)} clean episodes.")
+        return all_episodes
+
+    def iter_groupings(self, grouping_type: str = "Album", page_size: int = 100, concurrency: int = 1, max_pages: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yields every content grouping of a type (with its 'contentList'), page by page. Groupings
+        without an ID are skipped. Only `concurrency` pages are held in memory at a time.
+
+        Unlike the other methods, this generator takes no `deadline=`; iterate it inside
+        deadline_scope() instead.
+
+        Args:
+            grouping_type (str): The type of content grouping. Defaults to "Album".
+            page_size (int): Groupings per page. Defaults to 100, to minimize the number of API calls.
+            concurrency (int): Maximum pages fetched at once. Defaults to 1.
+            max_pages (int): Optional. Stop after this many pages.
+
+        Yields:
+            Dict[str, Any]: 'contentGroupings' items.
+        """
+        def fetch_page(page_number: int) -> Dict[str, Any]:
+            logger.debug(f"Fetching '{grouping_type}' page {page_number}...")
+            # One span per page: a span left open across the yields would also time the consumer
+            with self.tracer.span('aio.iter_groupings', **{'aio.page_number': page_number}):
+                return self.fetch_content_groupings(grouping_type=grouping_type, page_number=page_number, page_size=page_size)
+
+        for response in iter_pages(fetch_page, concurrency, max_pages):
+            for content_grouping in response.get('contentGroupings', []):
+                if not content_grouping.get('id'):
+                    grouping_name = content_grouping.get('name', f'UNKNOWN {grouping_type.upper()}')
                     logger.warning(f"Skipping {grouping_type} '{grouping_name}' due to missing ID.")
                     continue
+                yield content_grouping
 
-                episode_list = content_grouping.get('contentList', [])
-                
-                for episode in episode_list:
-                    episode_name = episode.get('name', 'Untitled Episode')
-                    
-                    # 1. Filter out episodes starting with "BONUS"
-                    if not include_bonus and episode_name.startswith("BONUS"):
-                        logger.debug(f"Skipping bonus episode: {episode_name}")
-                        continue
-
-                    # 2. Add the grouping ID to the episode dictionary
-                    # Note: Keeping the key as 'album_id' for consistency with previous usage
-                    clean_episode = episode.copy() 
-                    clean_episode['album_id'] = grouping_id # Still using 'album_id' key
-                    
-                    all_episodes.append(clean_episode)
-                    
-            current_page += 1
-
-        logger.info(f"Successfully cached {len(all_episodes)} clean episodes across {total_pages} pages.")
-        return all_episodes
+    def iter_episodes(self, grouping_type: str = "Album", include_bonus: bool = False, page_size: int = 100, concurrency: int = 1, max_pages: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the episodes of every content grouping of a type, page by page, as cache_episodes
+        returns them (each with the grouping's ID as 'album_id'). Only `concurrency` pages are
+        held in memory at a time.
+
+        Unlike the other methods, this generator takes no `deadline=`; iterate it inside
+        deadline_scope() instead.
+
+        Args:
+            grouping_type (str): The type of content grouping to fetch episodes from. Defaults to "Album".
+            include_bonus (bool): If True, episodes starting with "BONUS" are included. Defaults to False.
+            page_size (int): Groupings per page. Defaults to 100, to minimize the number of API calls.
+            concurrency (int): Maximum pages fetched at once. Defaults to 1.
+            max_pages (int): Optional. Stop after this many pages of groupings.
+
+        Yields:
+            Dict[str, Any]: Cleaned episode dictionaries.
+        """
+        for content_grouping in self.iter_groupings(grouping_type, page_size, concurrency, max_pages):
+            yield from grouping_episodes(content_grouping, include_bonus)
+
+    @with_deadline
+    @traced
+    def build_episode_index(self, grouping_types: Optional[List[str]] = None, include_bonus: bool = False, index_path: Optional[str] = None, concurrency: int = 1) -> EpisodeIndex:
+        """
+        Crawls every content grouping type once and merges their episodes into one
+        deduplicated index, each episode listing all of its grouping memberships.
+        
+        Args:
+            grouping_types: Optional. The grouping types to crawl. Defaults to Album, Series,
+                            Collection and 'Episode Home'.
+            include_bonus: If True, episodes starting with "BONUS" are included. Defaults to False.
+            index_path: Optional. A file to save the index to.
+            concurrency: Pages fetched at once per grouping type. Defaults to 1.
+            
+        Returns:
+            EpisodeIndex: The index (see adventuresinodyssey.episodes).
+            
+        Raises:
+            DeadlineExceeded: If the deadline passes; its `partial` is the index built so far.
+        """
+        index = EpisodeIndex()
+        try:
+            index.crawl(self, grouping_types or GROUPING_TYPES, include_bonus=include_bonus, concurrency=concurrency)
+        except DeadlineExceeded as e:
+            e.partial = index
+            raise
+        if index_path:
+            index.save(index_path)
+        return index
+
+    @with_deadline
+    @traced
+    def build_reverse_index(self, index_path: Optional[str] = None, kinds: Optional[List[str]] = None, concurrency: int = 8, max_age: Optional[float] = DEFAULT_MAX_AGE) -> ReverseIndex:
+        """
+        Builds (or incrementally rebuilds) the character, author and theme to episode indexes.
+        
+        Args:
+            index_path: Optional. A file to load the index from and save it back to, so later
+                        runs only fetch the entities that are new or have changed.
+            kinds: Optional. Any of 'character', 'author' and 'theme'. Defaults to all three.
+            concurrency: Maximum detail pages fetched at once. Defaults to 8.
+            max_age: Refetch entities whose detail page is older than this many seconds; this is
+                     how new episodes of existing entities are picked up. Defaults to a day.
+                     None refetches only new or changed listing entries.
+            
+        Returns:
+            ReverseIndex: The index (see adventuresinodyssey.reverse).
+            
+        Raises:
+            DeadlineExceeded: If the deadline passes while reading the listings; its `partial`
+                              is the index built so far (also saved to index_path).
+        """
+        index = ReverseIndex.load(index_path) if index_path else ReverseIndex()
+        try:
+            index.build(self, kinds, concurrency=concurrency, max_age=max_age)
+        except DeadlineExceeded as e:
+            e.partial = index
+            if index_path:
+                index.save(index_path)
+            raise
+        if index_path:
+            index.save(index_path)
+        return index
+
+    @with_deadline
+    @traced
+    def snapshot_catalog(self, grouping_types: Optional[List[str]] = None, include_bonus: bool = False, concurrency: int = 1) -> CatalogSnapshot:
+        """
+        Takes a snapshot of the catalog: a content hash for every episode (as cache_episodes
+        returns them) and every content grouping.
+        
+        Args:
+            grouping_types: Optional. The grouping types to include. Defaults to ['Album'].
+            include_bonus: If True, episodes starting with "BONUS" are included. Defaults to False.
+            concurrency: Pages fetched at once per grouping type. Defaults to 1.
+            
+        Returns:
+            CatalogSnapshot: The snapshot (see adventuresinodyssey.snapshot).
+            
+        Raises:
+            DeadlineExceeded: If the deadline passes.
+        """
+        return CatalogSnapshot.capture(self, grouping_types or ['Album'], include_bonus=include_bonus, concurrency=concurrency)
     
+    @with_deadline
+    @traced
     def fetch_content_group(self, group_id: str) -> Dict[str, Any]:
         """
         Fetches detailed data for a content grouping (e.g., an album or series).
@@ -243,7 +453,9 @@ class AIOClient:
         # Uses the unauthenticated get helper
         return self.get(f"contentgrouping/{group_id}")
 
-    def fetch_content_groupings(self, page_number: int = 1, page_size: int = 25, grouping_type: str = 'Album', payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    @with_deadline
+    @traced
+    def fetch_content_groupings(self, page_number: int = 1, page_size: int = 25, grouping_type: str = 'Album', payload: Optional[Dict[str, Any]] = None, schema: Optional[Type] = None) -> Dict[str, Any]:
         """
         Searches for and fetches a paginated list of content groupings (e.g., albums/series).
         
@@ -255,9 +467,10 @@ class AIOClient:
             page_size: The number of results per page. Defaults to 25.
             grouping_type: The type of content grouping to search for: 'Album' (default), 'Series', 'Collection', 'Episode Home', etc.
             payload: Optional. A complete request body (dictionary) to send instead of the default structured payload.
+            schema: Optional. A typed schema to decode into (e.g., schemas.GroupingPage).
             
         Returns:
-            Dict[str, Any]: The parsed JSON response from the API.
+            Dict[str, Any]: The parsed JSON response from the API (or a `schema` instance).
             
         Raises:
             requests.exceptions.HTTPError: If the API request fails.
@@ -279,8 +492,10 @@ class AIOClient:
         logger.info(f"Attempting to fetch content groupings ({log_info})")
         
         # Uses the unauthenticated post helper
-        return self.post("contentgrouping/search", request_payload)
+        return self.post("contentgrouping/search", request_payload, schema=schema)
             
+    @with_deadline
+    @traced
     def fetch_characters(self, page_number: int = 1, page_size: int = 200) -> Dict[str, Any]:
         """
         Fetches a paginated list of characters (e.g., 'Whit', 'Connie', 'Eugene').
@@ -305,6 +520,8 @@ class AIOClient:
         
         return self.post("character/search", request_payload)
 
+    @with_deadline
+    @traced
     def fetch_cast_and_crew(self, page_number: int = 1, page_size: int = 25) -> Dict[str, Any]:
         """
         Fetches a paginated list of cast and crew (authors).
@@ -329,6 +546,8 @@ class AIOClient:
         
         return self.post("author/search", request_payload)
     
+    @with_deadline
+    @traced
     def fetch_themes(self, page_number: int = 1, page_size: int = 25) -> Dict[str, Any]:
         """
         Fetches a paginated list of themes (Topics) via a POST request.
@@ -348,6 +567,8 @@ class AIOClient:
         # POST to: apexrest/v1/topic/search
         return self.post("topic/search", payload=themes_json)
 
+    @with_deadline
+    @traced
     def fetch_theme(self, theme_id: str) -> Dict[str, Any]:
         """
         Retrieves detailed information for a specific theme (Topic) by its ID.
@@ -362,6 +583,8 @@ class AIOClient:
         endpoint = f"topic/{theme_id}?tag=true"
         return self.get(endpoint)
     
+    @with_deadline
+    @traced
     def fetch_character(self, character_id: str) -> Dict[str, Any]:
         """
         Retrieves detailed information for a specific character by its ID.
@@ -375,6 +598,8 @@ class AIOClient:
         endpoint = "character/" + character_id
         return self.get(endpoint)
     
+    @with_deadline
+    @traced
     def fetch_author(self, author_id: str) -> Dict[str, Any]:
         """
         Retrieves detailed information for a specific author by its ID.
@@ -388,6 +613,8 @@ class AIOClient:
         endpoint = "author/" + author_id
         return self.get(endpoint)
     
+    @with_deadline
+    @traced
     def fetch_home_playlists(self) -> Dict[str, Any]:
         """
         Fetches newish content groups from the API.
@@ -398,8 +625,10 @@ class AIOClient:
         Raises:
             requests.exceptions.HTTPError: If the API request fails after all retry attempts.
         """
-        return self.get("viewer/home?personal_playlists=true&playlists=true")
+        return self._cached(('home_playlists',), lambda: self.get("viewer/home?personal_playlists=true&playlists=true"))
     
+    @with_deadline
+    @traced
     def fetch_carousel(self) -> Dict[str, Any]:
         """
         Fetches the carousel.
@@ -410,7 +639,17 @@ class AIOClient:
         Raises:
             requests.exceptions.HTTPError: If the API request fails after all retry attempts.
         """
-        return self.get("viewer/home?carousel=true&notifications=true")
+        return self._cached(('carousel',), lambda: self.get("viewer/home?carousel=true&notifications=true"))
+
+    def _cached(self, key: tuple, load) -> Any:
+        """
+        Serves a landing-page response through the stale-while-revalidate cache, if one is set.
+        Entries are keyed by viewer ID too, as ClubClient's landing pages are per profile.
+        """
+        if self.swr_cache is None:
+            return load()
+        viewer_key = (self.session.headers.get('x-viewer-id'),) + key
+        return self.swr_cache.get(viewer_key, load, on_event=lambda name: self._record_event(name, key[0]))
     
     def _clean_search_results(self, raw_results: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -458,6 +697,8 @@ class AIOClient:
         return cleaned_results
 
 
+    @with_deadline
+    @traced
     def search_all(self, query: str) -> Dict[str, Any]:
         """
         Performs a comprehensive, multi-object search across the API for a given query,
@@ -495,8 +736,11 @@ class AIOClient:
         raw_response = self.post("search", payload=search_payload)
         
         # 2. Clean the raw response before returning
-        return self._clean_search_results(raw_response)
+        with self.tracer.span('aio.clean_search_results', phase='postprocess'):
+            return self._clean_search_results(raw_response)
     
+    @with_deadline
+    @traced
     def search(self, 
                query: str, 
                search_objects: Union[str, List[Dict[str, Any]], None] = None
@@ -563,18 +807,170 @@ class AIOClient:
         raw_response = self.post("search", payload=search_payload)
         
         # 3. Clean the raw response before returning
-        return self._clean_search_results(raw_response)
+        with self.tracer.span('aio.clean_search_results', phase='postprocess'):
+            return self._clean_search_results(raw_response)
         
-    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[int] = None) -> Dict[str, Any]:
+    def _request(self, method: str, url: str, session: Optional[requests.Session] = None, **kwargs) -> requests.Response:
+        """
+        Sends a single HTTP request through the client's request pipeline.
+        
+        Every network call made by the clients (including auth calls) goes through here,
+        so per-request policies such as rate limiting and metrics are applied in one place.
+        
+        Args:
+            method: The HTTP method (e.g., 'GET', 'POST').
+            url: The absolute URL to request.
+            session: Optional. The session to send the request with. Defaults to self.session.
+            **kwargs: Passed through to the transport (params, json, headers, timeout).
+                      A missing timeout defaults to self.timeout, and any timeout is
+                      shortened to the time left on the current deadline.
+            
+        Returns:
+            requests.Response: The raw response. Status codes are not checked here.
+            
+        Raises:
+            DeadlineExceeded: If the current deadline passes before or during the request.
+            CircuitOpenError: If the circuit breaker's circuit for the endpoint family is open.
+        """
+        endpoint = _endpoint_key(url)
+        if self.http_cache is not None and self.http_cache.applies(method, endpoint):
+            return self._cached_request(method, url, endpoint, session, **kwargs)
+        return self._shared_request(method, url, endpoint, session, **kwargs)
+
+    def _cached_request(self, method: str, url: str, endpoint: str, session: Optional[requests.Session] = None, **kwargs) -> requests.Response:
+        """Serves a request from the HTTP cache, revalidating a stale entry with a conditional request."""
+        cache = self.http_cache
+        headers = dict((session or self.session).headers)
+        headers.update(kwargs.get('headers') or {})
+        key = cache.key(method, url, kwargs.get('params'), kwargs.get('json'), headers)
+
+        entry, fresh = cache.lookup(key, headers)
+        if fresh:
+            cache.record('hit')
+            self._record_event('http_cache_hits', endpoint)
+            return cache.to_response(entry, url)
+        if entry is not None:
+            kwargs['headers'] = dict(kwargs.get('headers') or {}, **cache.conditional_headers(entry))
+
+        request_time = time.time()
+        response = self._shared_request(method, url, endpoint, session, **kwargs)
+        if entry is not None and response.status_code == 304:
+            cache.record('revalidated')
+            self._record_event('http_cache_revalidated', endpoint)
+            return cache.to_response(cache.update(key, entry, response, request_time), url)
+
+        cache.record('miss')
+        self._record_event('http_cache_misses', endpoint)
+        cache.store(key, response, headers, request_time)
+        return response
+
+    def _shared_request(self, method: str, url: str, endpoint: str, session: Optional[requests.Session] = None, **kwargs) -> requests.Response:
+        """Sends a request, sharing it with identical idempotent requests in flight if single_flight is set."""
+        if self.single_flight is None or not is_idempotent(method, endpoint):
+            return self._send_request(method, url, endpoint, session, **kwargs)
+
+        # Per-request headers (e.g. conditional ones) are sent on top of the session's
+        headers = dict((session or self.session).headers)
+        headers.update(kwargs.get('headers') or {})
+        key = SingleFlight.request_key(method, url, kwargs.get('params'), kwargs.get('json'), headers)
+
+        def send_shared() -> requests.Response:
+            response = self._send_request(method, url, endpoint, session, **kwargs)
+            # Read the body before other threads get the response
+            response.content
+            return response
+
+        response, shared = self.single_flight.do(key, send_shared)
+        if shared:
+            self._record_event('coalesced', endpoint)
+        return response
+
+    def _send_request(self, method: str, url: str, endpoint: str, session: Optional[requests.Session] = None, **kwargs) -> requests.Response:
+        """Sends one request through the circuit breaker, rate limiter, hedging and metrics (see _request)."""
+        breaker = self.circuit_breaker
+        family = CircuitBreaker.family(endpoint)
+
+        if breaker is not None:
+            try:
+                # Before the rate limiter, so rejected requests never wait for a slot
+                breaker.before_request(family)
+            except CircuitOpenError:
+                self._record_event('circuit_rejected', family)
+                raise
+
+        try:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(endpoint)
+
+            # Checked after the rate limiter, which may have waited
+            kwargs['timeout'] = clamp_timeout(kwargs.get('timeout') or self.timeout)
+        except BaseException:
+            if breaker is not None:
+                breaker.cancel(family)
+            raise
+
+        def send() -> requests.Response:
+            return self.transport.send(session or self.session, method, url, **kwargs)
+
+        attributes = {'http.request.method': method, 'aio.endpoint': endpoint}
+        with self.tracer.span(f"{method} {endpoint}", phase='network', **attributes) as span:
+            start = time.perf_counter()
+            try:
+                if self.hedging is not None and self.hedging.applies(method, endpoint):
+                    response = self.hedging.execute(endpoint, send, on_event=lambda name: self._record_event(name, endpoint))
+                else:
+                    response = send()
+            except requests.exceptions.RequestException as e:
+                elapsed = time.perf_counter() - start
+                if self.metrics is not None:
+                    self.metrics.record_request(endpoint, method, None, elapsed)
+                deadline = current_deadline()
+                if isinstance(e, requests.exceptions.Timeout) and deadline is not None and deadline.expired:
+                    # The caller ran out of time; that is not the backend failing, but it still counts as slow
+                    if breaker is not None:
+                        breaker.record(family, False, elapsed)
+                    raise DeadlineExceeded(f"Deadline of {deadline.seconds:.3g}s exceeded during {method} {endpoint}") from e
+                if breaker is not None:
+                    breaker.record(family, True, elapsed)
+                raise
+            except BaseException:
+                if breaker is not None:
+                    breaker.cancel(family)
+                raise
+
+            if breaker is not None:
+                breaker.record(family, response.status_code >= 500, time.perf_counter() - start)
+            span.set_attribute('http.response.status_code', response.status_code)
+        if self.metrics is not None:
+            self.metrics.record_request(
+                endpoint, method, response.status_code,
+                time.perf_counter() - start, len(response.content)
+            )
+        return response
+
+    def _record_event(self, name: str, endpoint: Optional[str] = None):
+        """Increments a metrics counter if metrics are enabled."""
+        if self.metrics is not None:
+            self.metrics.increment(name, endpoint)
+
+    def _decode(self, response: requests.Response, schema: Optional[Type] = None) -> Any:
+        """Decodes a response body with the client's decoder, optionally into a typed schema."""
+        with self.tracer.span('aio.decode', phase='decode', **{'aio.body_bytes': len(response.content)}):
+            return self.decoder.decode(response.content, schema)
+
+    @with_deadline
+    @traced
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[int] = None, schema: Optional[Type] = None) -> Dict[str, Any]:
         """
         Performs an unauthenticated GET request to a generalized API endpoint.
         
         Args:
             endpoint: The relative API path (e.g., 'content/random').
             params: Optional dictionary of query parameters.
+            schema: Optional. A typed schema to decode the response into (see adventuresinodyssey.schemas).
             
         Returns:
-            Dict[str, Any]: The parsed JSON response from the API.
+            Dict[str, Any]: The parsed JSON response from the API (or a `schema` instance).
             
         Raises:
             requests.exceptions.HTTPError: If the API request fails.
@@ -588,9 +984,9 @@ class AIOClient:
         try:
             logger.info(f"Attempting GET request to: {full_endpoint}")
             # Add the timeout parameter here
-            response = self.session.get(url, params=params, timeout=request_timeout)
+            response = self._request('GET', url, params=params, timeout=request_timeout)
             response.raise_for_status()
-            return response.json()
+            return self._decode(response, schema)
         except requests.exceptions.Timeout:
             logger.error(f"Request to {full_endpoint} timed out.")
             raise
@@ -598,16 +994,19 @@ class AIOClient:
             logger.error(f"GET request failed: {e}")
             raise
 
-    def post(self, endpoint: str, payload: Dict[str, Any], timeout: Optional[int] = None) -> Dict[str, Any]:
+    @with_deadline
+    @traced
+    def post(self, endpoint: str, payload: Dict[str, Any], timeout: Optional[int] = None, schema: Optional[Type] = None) -> Dict[str, Any]:
         """
         Performs an unauthenticated POST request to a generalized API endpoint with JSON data.
         
         Args:
             endpoint: The relative API path (e.g., 'contentgrouping/search').
             payload: The JSON dictionary to be sent in the request body.
+            schema: Optional. A typed schema to decode the response into (see adventuresinodyssey.schemas).
             
         Returns:
-            Dict[str, Any]: The parsed JSON response from the API.
+            Dict[str, Any]: The parsed JSON response from the API (or a `schema` instance).
             
         Raises:
             requests.exceptions.HTTPError: If the API request fails.
@@ -620,9 +1019,9 @@ class AIOClient:
         try:
             logger.info(f"Attempting POST request to: {full_endpoint}")
             # Add the timeout parameter here
-            response = self.session.post(url, json=payload, timeout=request_timeout)
+            response = self._request('POST', url, json=payload, timeout=request_timeout)
             response.raise_for_status()
-            return response.json()
+            return self._decode(response, schema)
         except requests.exceptions.Timeout:
             logger.error(f"POST request to {full_endpoint} timed out.")
             raise
@@ -0,0 +1,181 @@
+"""
+Bulk mutations with bounded concurrency and per-item reports.
+
+run_bulk() applies one operation to many items on a thread pool, retries only the
+items that failed with a retryable error (timeouts, connection errors, 429 and 5xx),
+and returns a BulkReport with one entry per item. ClubClient's bulk_* methods use it
+under a single up-front authentication check.
+
+Operations that aren't idempotent (creating comments, playlists and bookmarks) pass
+is_safe_to_resend instead: a POST that timed out or got a 5xx may already have been
+applied, so only errors raised before the server could act on it are retried.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Callable, Iterable
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from .circuitbreaker import CircuitOpenError
+from .deadline import current_deadline, deadline_scope
+
+logger = logging.getLogger(__name__)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Returns True for errors worth retrying: timeouts, connection errors, 429 and 5xx responses."""
+    if isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return False
+
+
+def is_safe_to_resend(error: Exception) -> bool:
+    """
+    Returns True for errors after which a non-idempotent request can be sent again: 429
+    responses, circuit breaker rejections, and connection errors raised before the request
+    was sent (connect timeouts, failed connections and TLS handshakes).
+    """
+    if isinstance(error, CircuitOpenError):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError):
+        return error.response is not None and error.response.status_code == 429
+    if isinstance(error, (requests.exceptions.ConnectTimeout, requests.exceptions.SSLError, requests.exceptions.ProxyError)):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError) and not isinstance(error, requests.exceptions.Timeout):
+        # requests wraps urllib3's MaxRetryError, whose reason says whether a connection was ever made
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+        return isinstance(reason, NewConnectionError)
+    return False
+
+
+class BulkReport:
+    """
+    Outcome of a bulk operation, one result per input item, in input order.
+
+    Each result is a dict: {'item', 'ok', 'result', 'error', 'attempts'}.
+    """
+
+    def __init__(self, operation: str, results: List[Dict[str, Any]], elapsed: float = 0.0):
+        self.operation = operation
+        self.results = results
+        self.elapsed = elapsed
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __iter__(self):
+        return iter(self.results)
+
+    @property
+    def succeeded(self) -> List[Dict[str, Any]]:
+        return [r for r in self.results if r['ok']]
+
+    @property
+    def failed(self) -> List[Dict[str, Any]]:
+        return [r for r in self.results if not r['ok']]
+
+    @property
+    def ok(self) -> bool:
+        """True if every item succeeded."""
+        return all(r['ok'] for r in self.results)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a JSON-serializable summary, with the errors of failed items."""
+        return {
+            'operation': self.operation,
+            'total': len(self.results),
+            'succeeded': len(self.succeeded),
+            'failed': len(self.failed),
+            'elapsed': round(self.elapsed, 3),
+            'failures': [{'item': r['item'], 'error': r['error'], 'attempts': r['attempts']} for r in self.failed],
+        }
+
+    def __repr__(self) -> str:
+        return f"BulkReport({self.operation!r}, succeeded={len(self.succeeded)}, failed={len(self.failed)})"
+
+
+def run_bulk(operation: str, items: Iterable[Any], func: Callable[[Any], Any], max_workers: int = 8,
+             retries: int = 2, retry_delay: float = 1.0, retryable: Callable[[Exception], bool] = is_retryable) -> BulkReport:
+    """
+    Applies `func` to every item with bounded concurrency.
+
+    Args:
+        operation: A name for the operation (used in logs and the report).
+        items: The items to process.
+        func: Called with one item; its return value is stored as the item's 'result'.
+        max_workers: Maximum concurrent calls. Defaults to 8.
+        retries: Extra rounds for items that failed with a retryable error. Defaults to 2.
+        retry_delay: Seconds to wait before the first retry round; doubles every round. Defaults to 1.
+        retryable: Decides which errors are retried. Defaults to is_retryable; use is_safe_to_resend
+                   for operations that aren't idempotent.
+
+    Returns:
+        BulkReport: One result per item, in input order. If the current deadline passes,
+        the items not yet done fail with a deadline error.
+    """
+    start = time.perf_counter()
+    results = [{'item': item, 'ok': False, 'result': None, 'error': None, 'attempts': 0} for item in items]
+    # Worker threads don't inherit context variables, so carry the caller's deadline over
+    deadline = current_deadline()
+
+    def attempt(result: Dict[str, Any]) -> Optional[Exception]:
+        result['attempts'] += 1
+        try:
+            with deadline_scope(deadline):
+                result['result'] = func(result['item'])
+            result['ok'] = True
+            result['error'] = None
+            return None
+        except Exception as e:
+            result['error'] = str(e)
+            return e
+
+    pending = results
+    delay = retry_delay
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        for round_number in range(retries + 1):
+            errors = list(pool.map(attempt, pending))
+            pending = [r for r, e in zip(pending, errors) if e is not None and retryable(e)]
+            if not pending or round_number == retries:
+                break
+            if deadline is not None and deadline.remaining() <= delay:
+                logger.warning(f"{operation}: not retrying {len(pending)} failed item(s); the deadline is too close.")
+                break
+            logger.warning(f"{operation}: retrying {len(pending)} failed item(s) in {delay:.1f}s.")
+            time.sleep(delay)
+            delay *= 2
+
+    report = BulkReport(operation, results, time.perf_counter() - start)
+    logger.info(f"{operation}: {len(report.succeeded)} succeeded, {len(report.failed)} failed in {report.elapsed:.2f}s.")
+    return report
+
+
+def chunk_playlist_payload(payload: Dict[str, Any], max_items: int) -> List[Dict[str, Any]]:
+    """
+    Splits a create_playlist payload into payloads of one grouping each, with at most
+    `max_items` entries in its 'contentList'. A grouping that is split keeps its name
+    with a ' (Part i of n)' suffix.
+
+    Raises:
+        ValueError: If the payload has no 'contentGroupings' or max_items is below 1.
+    """
+    if max_items < 1:
+        raise ValueError("max_items must be at least 1.")
+    if not payload.get('contentGroupings'):
+        raise ValueError("JSON payload must contain the 'contentGroupings' key.")
+
+    chunks = []
+    for grouping in payload['contentGroupings']:
+        content_list = grouping.get('contentList', [])
+        parts = [content_list[i:i + max_items] for i in range(0, len(content_list), max_items)] or [[]]
+        for number, part in enumerate(parts, start=1):
+            chunk_grouping = dict(grouping, contentList=part)
+            if len(parts) > 1:
+                chunk_grouping['name'] = f"{grouping.get('name', 'Playlist')} (Part {number} of {len(parts)})"
+            chunks.append(dict(payload, contentGroupings=[chunk_grouping]))
+    return chunks
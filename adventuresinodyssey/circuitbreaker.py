@@ -0,0 +1,227 @@
+"""
+Per-endpoint-family circuit breaker.
+
+Requests are grouped by endpoint family, the first segment of the endpoint key
+('content', 'contentgrouping', 'search', 'oauth2', ...). Each family has a circuit:
+
+* closed: requests flow; outcomes over the last `window` requests are tracked. Once at
+  least `min_requests` were seen, the circuit opens if the share of failures (connection
+  errors, timeouts, 5xx) reaches `error_threshold`, or the share of responses slower than
+  `slow_call_seconds` reaches `slow_call_threshold`.
+* open: requests fail immediately with CircuitOpenError for `open_seconds`.
+* half-open: up to `half_open_max_calls` probe requests are let through at a time. After
+  `half_open_successes` healthy probes the circuit closes; any failed probe reopens it.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Optional, Dict, Any, List, Callable, Deque, Tuple
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """
+    Raised instead of sending a request while its endpoint family's circuit is open.
+    A requests ConnectionError, so existing error handling treats it as the backend being down.
+    """
+
+    def __init__(self, family: str, retry_after: float):
+        super().__init__(f"Circuit for '{family}' is open; retry in {retry_after:.1f}s")
+        self.family = family
+        self.retry_after = retry_after
+
+
+class _Circuit:
+    def __init__(self, window: int):
+        self.state = CLOSED
+        # Recent outcomes as (failed, slow)
+        self.outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)
+        self.opened_at = 0.0
+        self.probes_in_flight = 0
+        self.probe_successes = 0
+        self.rejected = 0
+
+
+class CircuitBreaker:
+    """
+    Tracks request outcomes per endpoint family and rejects requests to failing families.
+    """
+
+    def __init__(self, error_threshold: float = 0.5, slow_call_seconds: Optional[float] = None,
+                 slow_call_threshold: float = 0.8, window: int = 20, min_requests: int = 10,
+                 open_seconds: float = 30.0, half_open_max_calls: int = 1, half_open_successes: int = 2):
+        """
+        Args:
+            error_threshold: Share of failed requests in the window that opens the circuit. Defaults to 0.5.
+            slow_call_seconds: Optional. Responses slower than this count as slow.
+            slow_call_threshold: Share of slow requests in the window that opens the circuit. Defaults to 0.8.
+            window: Number of recent requests considered per family. Defaults to 20.
+            min_requests: Requests needed in the window before the circuit can open. Defaults to 10.
+            open_seconds: How long an open circuit rejects requests before probing. Defaults to 30.
+            half_open_max_calls: Concurrent probe requests allowed while half-open. Defaults to 1.
+            half_open_successes: Healthy probes needed to close the circuit again. Defaults to 2.
+        """
+        self.error_threshold = error_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_threshold = slow_call_threshold
+        self.window = window
+        self.min_requests = min_requests
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.half_open_successes = half_open_successes
+
+        self._lock = threading.Lock()
+        # Map: endpoint family -> circuit
+        self._circuits: Dict[str, _Circuit] = {}
+        self._listeners: List[Callable[[str, str, str], None]] = []
+
+    @staticmethod
+    def family(endpoint: str) -> str:
+        """Returns the endpoint family of an endpoint key (e.g., 'content/{id}' -> 'content')."""
+        return endpoint.split('/', 1)[0]
+
+    def add_listener(self, callback: Callable[[str, str, str], None]):
+        """Registers a callback called with (family, old_state, new_state) on every transition."""
+        self._listeners.append(callback)
+
+    def _now(self) -> float:
+        return time.monotonic()
+
+    def _circuit(self, family: str) -> _Circuit:
+        circuit = self._circuits.get(family)
+        if circuit is None:
+            circuit = self._circuits[family] = _Circuit(self.window)
+        return circuit
+
+    def _transition(self, family: str, circuit: _Circuit, state: str, changes: List[Tuple[str, str, str]]):
+        """Changes state (lock held). Listeners are notified by the caller after the lock is released."""
+        if circuit.state == state:
+            return
+        changes.append((family, circuit.state, state))
+        circuit.state = state
+        circuit.probes_in_flight = 0
+        circuit.probe_successes = 0
+        if state == OPEN:
+            circuit.opened_at = self._now()
+        elif state == CLOSED:
+            circuit.outcomes.clear()
+
+    def _notify(self, changes: List[Tuple[str, str, str]]):
+        for family, old, new in changes:
+            log = logger.warning if new == OPEN else logger.info
+            log(f"Circuit for '{family}' changed from {old} to {new}.")
+            for callback in list(self._listeners):
+                try:
+                    callback(family, old, new)
+                except Exception as e:
+                    logger.error(f"Circuit listener failed: {e}")
+
+    def before_request(self, family: str):
+        """
+        Admits a request, or rejects it while the family's circuit is open.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with all probe slots taken.
+        """
+        changes: List[Tuple[str, str, str]] = []
+        try:
+            with self._lock:
+                circuit = self._circuit(family)
+
+                if circuit.state == OPEN:
+                    waited = self._now() - circuit.opened_at
+                    if waited < self.open_seconds:
+                        circuit.rejected += 1
+                        raise CircuitOpenError(family, self.open_seconds - waited)
+                    self._transition(family, circuit, HALF_OPEN, changes)
+
+                if circuit.state == HALF_OPEN:
+                    if circuit.probes_in_flight >= self.half_open_max_calls:
+                        circuit.rejected += 1
+                        raise CircuitOpenError(family, 0.0)
+                    circuit.probes_in_flight += 1
+        finally:
+            self._notify(changes)
+
+    def cancel(self, family: str):
+        """Releases an admitted request that was never sent (its outcome says nothing about the backend)."""
+        with self._lock:
+            circuit = self._circuit(family)
+            if circuit.state == HALF_OPEN:
+                circuit.probes_in_flight = max(0, circuit.probes_in_flight - 1)
+
+    def record(self, family: str, failed: bool, latency: float):
+        """Records the outcome of an admitted request."""
+        slow = self.slow_call_seconds is not None and latency > self.slow_call_seconds
+        changes: List[Tuple[str, str, str]] = []
+
+        with self._lock:
+            circuit = self._circuit(family)
+
+            if circuit.state == HALF_OPEN:
+                circuit.probes_in_flight = max(0, circuit.probes_in_flight - 1)
+                if failed or slow:
+                    self._transition(family, circuit, OPEN, changes)
+                else:
+                    circuit.probe_successes += 1
+                    if circuit.probe_successes >= self.half_open_successes:
+                        self._transition(family, circuit, CLOSED, changes)
+
+            elif circuit.state == CLOSED:
+                circuit.outcomes.append((failed, slow))
+                total = len(circuit.outcomes)
+                if total >= self.min_requests:
+                    failures = sum(1 for f, _ in circuit.outcomes if f)
+                    slow_calls = sum(1 for _, s in circuit.outcomes if s)
+                    if failures / total >= self.error_threshold or (
+                            self.slow_call_seconds is not None and slow_calls / total >= self.slow_call_threshold):
+                        self._transition(family, circuit, OPEN, changes)
+
+        self._notify(changes)
+
+    def state(self, family: str) -> str:
+        """Returns 'closed', 'open' or 'half_open' for an endpoint family."""
+        with self._lock:
+            circuit = self._circuits.get(family)
+            if circuit is None:
+                return CLOSED
+            # An open circuit whose wait is over will admit a probe on the next request
+            if circuit.state == OPEN and self._now() - circuit.opened_at >= self.open_seconds:
+                return HALF_OPEN
+            return circuit.state
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Returns every family's state, recent error/slow rates and rejected count."""
+        with self._lock:
+            families = list(self._circuits)
+        result = {}
+        for family in families:
+            state = self.state(family)
+            with self._lock:
+                circuit = self._circuits[family]
+                total = len(circuit.outcomes)
+                result[family] = {
+                    'state': state,
+                    'requests_in_window': total,
+                    'error_rate': sum(1 for f, _ in circuit.outcomes if f) / total if total else 0.0,
+                    'slow_rate': sum(1 for _, s in circuit.outcomes if s) / total if total else 0.0,
+                    'rejected': circuit.rejected,
+                }
+        return result
+
+    def reset(self, family: Optional[str] = None):
+        """Closes one family's circuit (or all of them) and forgets its history."""
+        with self._lock:
+            if family is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(family, None)
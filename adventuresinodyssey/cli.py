@@ -0,0 +1,225 @@
+"""
+Command-line interface: `python -m adventuresinodyssey {export,changes} ...`.
+
+Exports stream records as pages arrive, as NDJSON (one JSON object per line) or CSV,
+to stdout or a file, optionally compressed. Only a few pages are held at a time, so
+memory use does not grow with the size of the catalog.
+
+    python -m adventuresinodyssey export episodes -o episodes.ndjson.gz --concurrency 4
+    python -m adventuresinodyssey export groupings --grouping-type Series --format csv
+    python -m adventuresinodyssey export radio --schedule upcoming --max-pages 2
+
+`changes` snapshots the catalog, writes what changed since the previous snapshot as an
+NDJSON change feed, and saves the new snapshot for the next run:
+
+    python -m adventuresinodyssey changes catalog_snapshot.json -o changes.ndjson
+"""
+
+import argparse
+import bz2
+import csv
+import gzip
+import io
+import json
+import logging
+import lzma
+import sys
+from typing import Optional, Dict, Any, List, Iterator, IO
+
+from . import set_logging_level
+from .aioclient import AIOClient
+from .deadline import deadline_scope
+from .snapshot import CatalogSnapshot
+from .paging import iter_pages, page_records
+
+logger = logging.getLogger(__name__)
+
+COMPRESSORS = {'gzip': gzip.open, 'bz2': bz2.open, 'xz': lzma.open}
+SUFFIXES = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz'}
+
+# Export kinds backed by a plain paginated search: kind -> (client method, records key, default page size)
+SEARCH_EXPORTS = {
+    'characters': ('fetch_characters', 'characters', 200),
+    'authors': ('fetch_cast_and_crew', 'authors', 100),
+    'themes': ('fetch_themes', 'topics', 100),
+}
+
+
+def _iter_records(client: AIOClient, args: argparse.Namespace) -> Iterator[Dict[str, Any]]:
+    """Yields the records of an export, page by page."""
+    def pages(fetch_page, page_size):
+        def fetch(page_number: int) -> Dict[str, Any]:
+            return fetch_page(page_number, page_size)
+        return iter_pages(fetch, args.concurrency, args.max_pages)
+
+    if args.kind == 'episodes':
+        yield from client.iter_episodes(grouping_type=args.grouping_type, include_bonus=args.include_bonus,
+                                        page_size=args.page_size or 100, concurrency=args.concurrency,
+                                        max_pages=args.max_pages)
+
+    elif args.kind == 'groupings':
+        for grouping in client.iter_groupings(args.grouping_type, page_size=args.page_size or 100,
+                                              concurrency=args.concurrency, max_pages=args.max_pages):
+            if not args.with_content:
+                grouping = {k: v for k, v in grouping.items() if k != 'contentList'}
+            yield grouping
+
+    elif args.kind == 'radio':
+        for page in pages(lambda n, size: client.fetch_radio(page_type=args.schedule, page_number=n, page_size=size),
+                          args.page_size or 25):
+            yield from page.get('results', [])
+
+    else:
+        method, key, default_size = SEARCH_EXPORTS[args.kind]
+        fetch = getattr(client, method)
+        for page in pages(lambda n, size: fetch(page_number=n, page_size=size), args.page_size or default_size):
+            yield from page_records(page, key)
+
+
+def _open_output(path: Optional[str], compression: Optional[str]) -> IO[bytes]:
+    """Opens the binary output stream: a file or stdout, compressed if asked for (or by suffix)."""
+    if compression is None and path:
+        compression = next((name for suffix, name in SUFFIXES.items() if path.endswith(suffix)), None)
+
+    if path and path != '-':
+        if compression:
+            return COMPRESSORS[compression](path, 'wb')
+        return open(path, 'wb')
+
+    stdout = sys.stdout.buffer
+    if compression:
+        return COMPRESSORS[compression](stdout, 'wb')
+    return stdout
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def write_records(records: Iterator[Dict[str, Any]], stream: IO[bytes], output_format: str = 'ndjson',
+                  fields: Optional[List[str]] = None) -> int:
+    """
+    Writes records to a binary stream as they arrive.
+
+    Args:
+        records: The records to write.
+        stream: A binary stream (file, stdout buffer or compressor).
+        output_format: 'ndjson' or 'csv'. Defaults to 'ndjson'.
+        fields: Optional. The fields to write. For CSV, defaults to the first record's fields;
+                nested values are written as JSON.
+
+    Returns:
+        int: The number of records written.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8', newline='', write_through=True)
+    count = 0
+    writer = None
+    try:
+        for record in records:
+            if output_format == 'csv':
+                if writer is None:
+                    writer = csv.DictWriter(text, fieldnames=fields or list(record), extrasaction='ignore')
+                    writer.writeheader()
+                writer.writerow({key: _csv_value(value) for key, value in record.items()})
+            else:
+                if fields:
+                    record = {field: record.get(field) for field in fields}
+                text.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+            count += 1
+    finally:
+        text.flush()
+        # Leave the underlying stream open; the caller owns it
+        text.detach()
+    return count
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m adventuresinodyssey',
+                                     description="Adventures in Odyssey API command-line tools.")
+    parser.add_argument('--log-level', default='WARNING', help="Logging level (default: WARNING).")
+    parser.add_argument('--timeout', type=float, default=10, help="Per-request timeout in seconds (default: 10).")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export = commands.add_parser('export', help="Stream a catalog listing as NDJSON or CSV.")
+    export.add_argument('kind', choices=['episodes', 'groupings', 'radio'] + list(SEARCH_EXPORTS))
+    export.add_argument('-o', '--output', help="Output file (default: stdout). '.gz', '.bz2' and '.xz' compress.")
+    export.add_argument('-f', '--format', dest='output_format', choices=['ndjson', 'csv'], default='ndjson')
+    export.add_argument('--fields', help="Comma-separated fields to write (CSV default: the first record's fields).")
+    export.add_argument('--compress', choices=list(COMPRESSORS), help="Compress the output (default: by file suffix).")
+    export.add_argument('--concurrency', type=int, default=1, help="Pages fetched at once (default: 1).")
+    export.add_argument('--page-size', type=int, help="Records per page.")
+    export.add_argument('--max-pages', type=int, help="Stop after this many pages.")
+    export.add_argument('--deadline', type=float, help="Give up after this many seconds.")
+    export.add_argument('--grouping-type', default='Album', help="episodes/groupings: grouping type (default: Album).")
+    export.add_argument('--include-bonus', action='store_true', help="episodes: include 'BONUS' episodes.")
+    export.add_argument('--with-content', action='store_true', help="groupings: keep each grouping's contentList.")
+    export.add_argument('--schedule', choices=['aired', 'upcoming'], default='aired', help="radio: schedule (default: aired).")
+
+    changes = commands.add_parser('changes', help="Write the catalog changes since the last snapshot as NDJSON.")
+    changes.add_argument('snapshot', help="Snapshot file: the previous snapshot is read from it and the new one saved to it.")
+    changes.add_argument('-o', '--output', help="Output file (default: stdout). '.gz', '.bz2' and '.xz' compress.")
+    changes.add_argument('--compress', choices=list(COMPRESSORS), help="Compress the output (default: by file suffix).")
+    changes.add_argument('--grouping-type', action='append', dest='grouping_types',
+                         help="Grouping type to include; repeatable (default: Album).")
+    changes.add_argument('--include-bonus', action='store_true', help="Include 'BONUS' episodes.")
+    changes.add_argument('--ids-only', action='store_true', help="Leave the records out of the feed (IDs and hashes only).")
+    changes.add_argument('--concurrency', type=int, default=1, help="Pages fetched at once (default: 1).")
+    changes.add_argument('--deadline', type=float, help="Give up after this many seconds.")
+    return parser
+
+
+def _changes(client: AIOClient, args: argparse.Namespace) -> int:
+    """Runs the 'changes' command. The new snapshot is saved only once the feed is written."""
+    previous = CatalogSnapshot.load(args.snapshot)
+    stream = _open_output(args.output, args.compress)
+    try:
+        with deadline_scope(args.deadline):
+            snapshot = CatalogSnapshot.capture(client, args.grouping_types or ['Album'], include_bonus=args.include_bonus,
+                                               concurrency=args.concurrency, keep_records=not args.ids_only)
+        changes = snapshot.diff(previous)
+        write_records(changes.feed(include_records=not args.ids_only), stream)
+    except Exception as e:
+        logger.error(f"Catalog snapshot failed: {e}")
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if stream is not sys.stdout.buffer:
+            stream.close()
+        else:
+            stream.flush()
+
+    snapshot.save(args.snapshot)
+    logger.info(f"Catalog changes: {changes.summary()}")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    set_logging_level(args.log_level)
+
+    client = AIOClient(timeout=args.timeout)
+    if args.command == 'changes':
+        return _changes(client, args)
+    fields = [field.strip() for field in args.fields.split(',')] if args.fields else None
+
+    stream = _open_output(args.output, args.compress)
+    try:
+        with deadline_scope(args.deadline):
+            count = write_records(_iter_records(client, args), stream, args.output_format, fields)
+    except BrokenPipeError:
+        # The reader went away (e.g., piped into `head`)
+        return 0
+    except Exception as e:
+        logger.error(f"Export of {args.kind} failed: {e}")
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if stream is not sys.stdout.buffer:
+            stream.close()
+        else:
+            stream.flush()
+
+    logger.info(f"Exported {count} {args.kind}.")
+    return 0
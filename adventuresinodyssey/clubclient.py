@@ -3,14 +3,29 @@ Adventures in Odyssey API Authentication Client
 """
 
 import logging
-import json
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from collections import Counter
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, List, Union, Type, Iterable, Iterator
 from urllib.parse import urlencode, urlparse, parse_qs
 import requests
 from playwright.sync_api import sync_playwright, Page, TimeoutError as PlaywrightTimeout
-from .aioclient import AIOClient
+from .aioclient import AIOClient, _endpoint_key
+from .ratelimit import RateLimiter
+from .metrics import ClientMetrics
+from .transport import Transport
+from .decoding import JSONDecoder
+from .tokenstore import TokenStore, FileTokenStore
+from .comments import CommentIndex, CommentFeed
+from .bulk import BulkReport, run_bulk, chunk_playlist_payload, is_safe_to_resend
+from .deadline import DeadlineExceeded, current_deadline, with_deadline
+from .hedging import HedgingPolicy
+from .circuitbreaker import CircuitBreaker, CircuitOpenError
+from .swr import StaleWhileRevalidateCache
+from .singleflight import SingleFlight
+from .tracing import Tracer, traced
+from .httpcache import HTTPCache
 
 # Configure logging
 logging.basicConfig(
@@ -22,6 +37,9 @@ logger = logging.getLogger(__name__)
 # Define the common API prefix to be used for the new generalized methods
 API_PREFIX = 'apexrest/v1/'
 
+# Largest 'contentList' sent in one create_playlist request by bulk_create_playlists
+PLAYLIST_CHUNK_SIZE = 200
+
 DEFAULT_FIELDS = {
     "Content__c": ["Name", "Thumbnail_Small__c", "Subtype__c", "Episode_Number__c"],
     "Content_Grouping__c": ["Name", "Image_URL__c", "Type__c"],
@@ -38,7 +56,7 @@ class ClubClient(AIOClient):
     Handles login, token management, and authenticated API requests.
     """
     
-    def __init__(self, email: str, password: str, viewer_id: Optional[str] = None, profile_username: Optional[str] = None, pin: Optional[str] = None, auto_relogin: bool = True, config_path: str = 'club_session.json', timeout: int = 10):
+    def __init__(self, email: str, password: str, viewer_id: Optional[str] = None, profile_username: Optional[str] = None, pin: Optional[str] = None, auto_relogin: bool = True, config_path: str = 'club_session.json', timeout: int = 10, rate_limiter: Optional[RateLimiter] = None, metrics: Optional[ClientMetrics] = None, transport: Optional[Transport] = None, decoder: Optional[JSONDecoder] = None, token_store: Optional[TokenStore] = None, hedging: Optional[HedgingPolicy] = None, circuit_breaker: Optional[CircuitBreaker] = None, swr_cache: Optional[StaleWhileRevalidateCache] = None, single_flight: Optional[SingleFlight] = None, tracer: Optional[Tracer] = None, http_cache: Optional[HTTPCache] = None):
         """
         Initialize the AIO API client
         
@@ -48,9 +66,27 @@ class ClubClient(AIOClient):
             viewer_id: Optional. The specific Viewer ID (profile) to use. If provided, profile_username is ignored.
             profile_username: Optional. The username of the profile to select after account login. Required if viewer_id is not set.
             pin: Optional. The PIN for the selected profile. Defaults to '0000' if not provided.
+            rate_limiter: Optional. A RateLimiter (or FileRateLimiter) consulted before every request, including auth calls.
+            metrics: Optional. A ClientMetrics instance that records every request and auth event.
+            transport: Optional. The Transport that sends requests (e.g., RecordingTransport, ReplayTransport).
+            decoder: Optional. The JSONDecoder for response bodies. Defaults to the fastest installed backend.
+            token_store: Optional. Where the session is persisted and shared between processes (e.g., SQLiteTokenStore).
+                         Defaults to a FileTokenStore at config_path.
+            hedging: Optional. A HedgingPolicy that duplicates slow idempotent requests (GETs and searches).
+            circuit_breaker: Optional. A CircuitBreaker that fails requests fast while their endpoint family is unhealthy.
+            swr_cache: Optional. A StaleWhileRevalidateCache serving fetch_home_playlists, fetch_carousel
+                       and fetch_radio from the last good response. Entries are kept per viewer ID.
+            single_flight: Optional. A SingleFlight that makes identical idempotent requests in flight
+                           at the same time share one upstream request.
+            tracer: Optional. A Tracer (e.g., OpenTelemetryTracer) that records a span per public call,
+                    with nested auth, network, decode and postprocess spans. Defaults to NoOpTracer().
+            http_cache: Optional. An HTTPCache that stores content and content grouping responses on
+                        disk (partitioned by viewer ID) and revalidates them with conditional requests.
         """
 
-        super().__init__()
+        super().__init__(rate_limiter=rate_limiter, metrics=metrics, transport=transport, decoder=decoder, hedging=hedging,
+                         circuit_breaker=circuit_breaker, swr_cache=swr_cache,
+                         single_flight=single_flight, tracer=tracer, http_cache=http_cache)
         self.timeout = timeout
 
         # User credentials
@@ -65,6 +101,19 @@ class ClubClient(AIOClient):
         # Session tokens
         self._refresh_token: Optional[str] = None
         self.session_token: Optional[str] = None
+        # Last access token known to be valid, and the number of open bulk_session() scopes
+        self._verified_token: Optional[str] = None
+        # Last access token the server rejected, so a copy of it in the token store isn't adopted again
+        self._rejected_token: Optional[str] = None
+        self._bulk_depth = 0
+        self._bulk_lock = threading.Lock()
+        # Until this monotonic time, a token equal to _verified_token is trusted without an
+        # introspect (set by SessionMaintainer, which re-verifies it in the background)
+        self._verified_until = 0.0
+        # Map: content type -> (signed cookie query string, monotonic time fetched)
+        self._signed_cookies: Dict[str, tuple] = {}
+        # fetch_signed_cookie() reuses a cookie younger than this many seconds (None: always fetch)
+        self.signed_cookie_max_age: Optional[float] = None
         
         # State tracking
         self.logging_in = False
@@ -82,9 +131,14 @@ class ClubClient(AIOClient):
         }
 
         self.config_file = Path(config_path) 
+        self.token_store = token_store or FileTokenStore(self.config_file)
         
         self._load_session_state()
         
+        # Keep AIOClient's unauthenticated session for 'promo' requests, so they reuse
+        # pooled connections instead of opening a new one per call
+        self._public_session = self.session
+        
         # Setup HTTP session
         self.session = requests.Session()
         self.session.headers.update({
@@ -93,6 +147,8 @@ class ClubClient(AIOClient):
             'x-viewer-id': self.viewer_id if self.viewer_id else '',
             'x-pin': self.pin
         })
+        if self.session_token:
+            self.session.headers['Authorization'] = f"Bearer {self.session_token}"
     
     def login(self) -> bool:
         """
@@ -108,6 +164,7 @@ class ClubClient(AIOClient):
         self.logging_in = True
         self.state = "logging in"
         logger.info("Starting OAuth login...")
+        self._record_event('auth_login')
         
         try:
             # --- PHASE 1: OAuth Web Login (Get Session Token) ---
@@ -196,7 +253,7 @@ class ClubClient(AIOClient):
             raise RuntimeError(f"Failed to login: {e}")
         
     def _save_session_state(self):
-        """Saves the essential session data to a local JSON file."""
+        """Saves the essential session data to the token store."""
         if not self._refresh_token or not self.viewer_id:
             logger.debug("Skipping save: Missing refresh token or viewer ID.")
             return
@@ -205,27 +262,28 @@ class ClubClient(AIOClient):
             'refresh_token': self._refresh_token,
             'viewer_id': self.viewer_id,
             # Note: Storing the PIN is a security risk, but required for profile switching.
-            'pin': self.pin 
+            'pin': self.pin,
+            # Shared so other processes using the same store can adopt it instead of refreshing
+            'access_token': self.session_token
         }
         
         try:
-            with self.config_file.open('w', encoding='utf-8') as f:
-                json.dump(state, f, indent=4)
-            logger.info(f"Session state saved to {self.config_file}")
+            self.token_store.save(state)
+            logger.info("Session state saved to the token store")
         except Exception as e:
             logger.error(f"Failed to save session state: {e}")
 
     def _load_session_state(self) -> bool:
-        """Loads the essential session data from a local JSON file."""
-        if not self.config_file.exists():
-            return False
-            
+        """Loads the essential session data from the token store."""
         try:
-            with self.config_file.open('r', encoding='utf-8') as f:
-                state = json.load(f)
+            state = self.token_store.load()
+            if not state:
+                return False
 
             # 1. ALWAYS load the refresh token (this is the core of persistence)
             self._refresh_token = state.get('refresh_token')
+            # The access token may still be valid; ensure_authenticated() introspects it before use
+            self.session_token = state.get('access_token')
             
             # 2. CONDITIONALLY load profile parameters
             
@@ -266,9 +324,9 @@ class ClubClient(AIOClient):
         try:
             # Note: This API call needs the Authorization header set from Phase 1, 
             # but *before* the final x-viewer-id is set.
-            response = self.session.get(viewer_url)
+            response = self._request('GET', viewer_url, timeout=self.timeout)
             response.raise_for_status()
-            data = response.json()
+            data = self._decode(response)
             
             profiles = data.get("profiles", [])
             if not profiles:
@@ -370,17 +428,79 @@ class ClubClient(AIOClient):
             'client_secret': self.config['client_secret']
         }
         
-        response = self.session.post(token_url, params=token_params, timeout=10)
+        response = self._request('POST', token_url, params=token_params, timeout=10)
         response.raise_for_status()
         
-        return response.json()
+        return self._decode(response)
     
+    def _adopt_stored_tokens(self) -> bool:
+        """
+        Re-reads the token store and picks up tokens saved by another process.
+        
+        Returns:
+            bool: True if a different, valid access token was adopted, so no refresh is needed.
+        """
+        try:
+            state = self.token_store.load()
+        except Exception as e:
+            logger.error(f"Failed to read token store: {e}")
+            return False
+        
+        # Always take the latest refresh token, since another process may have rotated ours
+        if state.get('refresh_token'):
+            self._refresh_token = state['refresh_token']
+        
+        stored_token = state.get('access_token')
+        if stored_token and stored_token != self.session_token and stored_token != self._rejected_token:
+            # The store may hold a token that has since expired; only adopt one that still works
+            data = self._introspect(stored_token) if self.session.headers.get('x-viewer-id') else None
+            if data and data.get('active', False):
+                self.session_token = stored_token
+                self.session.headers['Authorization'] = f"Bearer {self.session_token}"
+                self._record_event('auth_shared_token')
+                logger.info("Adopted access token refreshed by another process.")
+                return True
+            logger.info("Access token in the token store is no longer valid.")
+            self._rejected_token = stored_token
+        return False
+
+    def _discard_stored_tokens(self, refresh_token: str):
+        """
+        Removes a rejected refresh token (and the access token saved with it) from the token
+        store, so this or another process doesn't adopt them again. Called with the store's lock held.
+        """
+        try:
+            state = self.token_store.load()
+            # Another process may have rotated the refresh token since; keep a newer one
+            if state and state.get('refresh_token') == refresh_token:
+                state['refresh_token'] = None
+                state['access_token'] = None
+                self.token_store.save(state)
+        except Exception as e:
+            logger.error(f"Failed to clear rejected tokens from the token store: {e}")
+    
+    @with_deadline
+    @traced
     def refresh_session(self) -> bool:
-        """Refresh the session using the refresh token."""
+        """
+        Refresh the session using the refresh token.
+        
+        Holds the token store's lock, so when several processes share a store only the
+        first one refreshes; the others adopt the access token it saved.
+        """
+        with self.token_store.lock():
+            if self._adopt_stored_tokens():
+                return True
+            return self._refresh_access_token()
+    
+    def _refresh_access_token(self) -> bool:
+        """Exchanges the refresh token for a new access token and saves it to the token store."""
         if not self._refresh_token:
             logger.info("Session refresh skipped: no refresh token available")
             return False
         
+        self._record_event('auth_refresh')
+
         try:
             token_url = f"{self.config['api_base']}oauth2/token"
             token_params = {
@@ -390,29 +510,48 @@ class ClubClient(AIOClient):
                 'client_secret': self.config['client_secret'],
             }
             
-            response = self.session.post(token_url, params=token_params, timeout=10)
+            response = self._request('POST', token_url, params=token_params, timeout=10)
             
             if response.status_code == 200:
-                token_data = response.json()
+                token_data = self._decode(response)
                 self.session_token = token_data.get('access_token')
                 if token_data.get('refresh_token'):
                     self._refresh_token = token_data.get('refresh_token')
                 
                 self.session.headers['Authorization'] = f"Bearer {self.session_token}"
                 logger.info("Token refresh successful!")
+                self._save_session_state()
                 return True
-            else:
-                logger.warning(f"Token refresh failed with status {response.status_code}. Full login will be required.")
+            elif self._grant_rejected(response):
+                logger.warning(f"Refresh token was rejected (status {response.status_code}). Full login will be required.")
+                self._discard_stored_tokens(self._refresh_token)
                 self.session_token = None
                 self._refresh_token = None
                 return False
+            else:
+                # A server error or rate limit says nothing about the tokens; keep them for the next try
+                logger.warning(f"Token refresh failed with status {response.status_code}.")
+                return False
                 
+        except (CircuitOpenError, DeadlineExceeded):
+            # oauth2 is known to be down, or we ran out of time: fail fast instead of dropping the tokens
+            raise
         except Exception as e:
+            # Transport errors keep the tokens too
             logger.error(f"Session refresh failed: {e}")
-            self.session_token = None
-            self._refresh_token = None
             return False
     
+    def _grant_rejected(self, response: requests.Response) -> bool:
+        """True if a token response rejects the refresh token itself (an 'invalid_grant' error)."""
+        if response.status_code not in (400, 401):
+            return False
+        try:
+            return self._decode(response).get('error') == 'invalid_grant'
+        except (ValueError, AttributeError):
+            return False
+    
+    @with_deadline
+    @traced
     def check_session(self) -> bool:
         """Check if the current session token is valid and required headers are set."""
         if not self.session_token:
@@ -423,52 +562,127 @@ class ClubClient(AIOClient):
             logger.debug("Session check failed: x-viewer-id is missing.")
             return False
         
+        data = self._introspect()
+        return bool(data and data.get('active', False))
+    
+    def _introspect(self, token: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Introspects an access token.
+        
+        Args:
+            token: Optional. The token to check. Defaults to the current session token.
+        
+        Returns:
+            Optional[Dict[str, Any]]: The introspection response ('active', and 'exp' if the
+            server reports the expiry), or None if the check failed.
+        """
+        self._record_event('auth_introspect')
+
         try:
             introspect_url = f"{self.config['api_base']}oauth2/introspect"
             introspect_params = {
-                'token': self.session_token,
+                'token': token or self.session_token,
                 'token_type_hint': 'access_token',
                 'client_id': self.config['client_id'],
                 'client_secret': self.config['client_secret']
             }
             
-            response = self.session.post(introspect_url, params=introspect_params, timeout=10)
+            response = self._request('POST', introspect_url, params=introspect_params, timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
-                return data.get('active', False)
+                return self._decode(response)
             
-            return False
+            return None
             
+        except (CircuitOpenError, DeadlineExceeded):
+            # Says nothing about the token, so don't let callers treat it as rejected
+            raise
         except Exception as e:
             logger.error(f"Session check failed: {e}")
-            return False
+            return None
     
+    @with_deadline
+    @traced(phase='auth')
     def ensure_authenticated(self) -> bool:
         """
         Ensure the client is authenticated, attempting login/refresh as needed.
         
         Returns:
             bool: True if authenticated, False otherwise
+            
+        Raises:
+            CircuitOpenError: If the 'oauth2' circuit is open. The current tokens are kept.
+            DeadlineExceeded: If the current deadline passes. No browser login is started after it has.
         """
+        # Inside bulk_session() the token was checked once up front; skip the per-call
+        # introspect until a request gets a 401 (see _request)
+        # The same goes while a SessionMaintainer vouches for the token
+        if (self._bulk_depth or time.monotonic() < self._verified_until) and self.session_token and self.session_token == self._verified_token:
+            return True
+        
         # 1. Check if current session is valid
         if self.check_session():
             logger.debug("Session is valid.")
+            self._verified_token = self.session_token
             return True
+        if self.session_token:
+            self._rejected_token = self.session_token
+        
+        # Steps 2 and 3 hold the token store's lock, so processes sharing the store
+        # do one refresh (or login) between them instead of one each
+        rejected_token = self.session_token
+        with self.token_store.lock():
+            # Another thread of this client refreshed while we waited for the lock
+            if self.session_token and self.session_token != rejected_token:
+                logger.debug("Session was refreshed by another thread.")
+                self._record_event('coalesced', 'oauth2/token')
+                return True
+
+            # 2. Try to refresh session (or adopt a token another process just got)
+            logger.info("Session invalid, attempting refresh...")
+            if self.refresh_session():
+                self._verified_token = self.session_token
+                return True
+            
+            # 3. Fall back to full login (Only if enabled), which the deadline can't interrupt
+            deadline = current_deadline()
+            if deadline is not None:
+                deadline.check()
+            if self.config['auto_relogin']:
+                logger.info("Refresh failed, attempting full login...")
+                return self.login()
+            else:
+                logger.warning("Refresh failed. Automatic full login is disabled.")
+                return False # Return False if we can't refresh and can't relogin
+    
+    def _request(self, method: str, url: str, session: Optional[requests.Session] = None, **kwargs) -> requests.Response:
+        response = super()._request(method, url, session=session, **kwargs)
+        if response.status_code == 401:
+            # The token was rejected, so the next ensure_authenticated() must check it again
+            self._verified_token = None
+        return response
+    
+    @contextmanager
+    def bulk_session(self) -> Iterator["ClubClient"]:
+        """
+        Authenticates once, then skips the per-request session check for calls made inside
+        the block (from any thread). A 401 still triggers a refresh and retry as usual.
         
-        # 2. Try to refresh session
-        logger.info("Session invalid, attempting refresh...")
-        if self.refresh_session():
-            return True
-        
-        # 3. Fall back to full login (Only if enabled)
-        if self.config['auto_relogin']:
-            logger.info("Refresh failed, attempting full login...")
-            return self.login()
-        else:
-            logger.warning("Refresh failed. Automatic full login is disabled.")
-            return False # Return False if we can't refresh and can't relogin
+        Raises:
+            RuntimeError: If authentication fails.
+        """
+        if not self.ensure_authenticated():
+            raise RuntimeError("Cannot start bulk operation: Failed to authenticate user.")
+        with self._bulk_lock:
+            self._bulk_depth += 1
+        try:
+            yield self
+        finally:
+            with self._bulk_lock:
+                self._bulk_depth -= 1
     
+    @with_deadline
+    @traced
     def change_profile(self, viewer_id: str, pin: str) -> bool:
         """
         Switches the active profile (viewer) for authenticated requests without
@@ -497,20 +711,29 @@ class ClubClient(AIOClient):
         logger.info("Profile successfully switched. Headers updated.")
         return True
 
-    def fetch_content(self, content_id: str, page_type: str = 'full') -> Dict[str, Any]:
+    @with_deadline
+    @traced
+    def fetch_content(self, content_id: str, page_type: str = 'full', schema: Optional[Type] = None, projection: str = 'full') -> Dict[str, Any]:
         """
         Fetches detailed content data for a given ID, based on page_type.
         
         Args:
             content_id: The ID of the content to fetch (e.g., 'a354W0000046U6OQAU').
             page_type: The type of content page: 'full' (default), 'radio', or 'promo'.
+            schema: Optional. A typed schema to decode into (e.g., schemas.Content).
+            projection: Which parts of the payload to request and keep: 'full' (default), 'metadata'
+                        or 'playback'. See CONTENT_PROJECTIONS.
             
         Returns:
-            Dict[str, Any]: The parsed JSON response from the API.
+            Dict[str, Any]: The parsed JSON response from the API, trimmed to the projection's fields
+            (or a `schema` instance).
             
         Raises:
+            ValueError: If an unknown projection is provided.
             requests.exceptions.HTTPError: If the API request fails after all retry attempts.
         """
+        params = self._content_params(projection)
+        
         # Determine authentication requirement and request parameters
         needs_auth = (page_type != 'promo')
         is_radio = (page_type == 'radio')
@@ -526,32 +749,20 @@ class ClubClient(AIOClient):
             # Promo page type requires NO authentication/viewer/pin headers
             logger.info("Fetching content for 'promo' page type (unauthenticated request).")
             
-            # Use a clean set of headers, keeping only the experience name if necessary
-            headers = {'x-experience-name': 'Adventures In Odyssey'}
-            # Temporarily remove default Authorization header for this request type
-            session_to_use = requests.Session()
-            session_to_use.headers.update(headers)
+            # Use the unauthenticated session, which only carries the x-experience-name header
+            session_to_use = self._public_session
             
         # Base API URL structure for content details
         endpoint = f"apexrest/{self.config['api_version']}/content/{content_id}"
         url = f"{self.config['api_base']}{endpoint}"
 
-        # Standard default parameters for 'full' and 'promo'
-        params = {
-            'tag': 'true',
-            'series': 'true',
-            'recommendations': 'true',
-            'player': 'true',
-            'parent': 'true'
-        }
-
         if is_radio:
             # Add radio-specific parameter
             params['radio_page_type'] = 'aired'
             logger.info("Fetching content for 'radio' page type, adding radio_page_type=aired.")
 
         def make_request():
-            response = session_to_use.get(url, params=params)
+            response = self._request('GET', url, session=session_to_use, params=params, timeout=self.timeout)
             return response
 
         try:
@@ -562,10 +773,12 @@ class ClubClient(AIOClient):
             # 2. Handle Unauthorized (401) ONLY if authentication was required (needs_auth)
             if needs_auth and response.status_code == 401:
                 logger.warning("Initial request failed with 401 Unauthorized. Attempting re-authentication...")
+                self._record_event('auth_reauth_401')
                 
                 # Try to refresh/re-login
                 if self.ensure_authenticated():
                     logger.info("Re-authentication successful. Retrying request...")
+                    self._record_event('retries', _endpoint_key(url))
                     # 3. Retry attempt
                     response = make_request()
                 else:
@@ -576,12 +789,14 @@ class ClubClient(AIOClient):
             response.raise_for_status()
             
             logger.info(f"Content fetch successful for ID: {content_id} (Page Type: {page_type})")
-            return response.json()
+            return self._project_content(self._decode(response, schema), projection)
 
         except requests.exceptions.HTTPError as e:
             logger.error(f"Failed to fetch content ID {content_id} (Page Type: {page_type}): {e}")
             raise
         
+    @with_deadline
+    @traced
     def fetch_badge(self, badge_id: str) -> Dict[str, Any]:
         """
         Fetches detailed data for a badge (sometimes called an adventure).
@@ -597,6 +812,8 @@ class ClubClient(AIOClient):
         """
         return self.get(f"badges/{badge_id}")
             
+    @with_deadline
+    @traced
     def send_progress(self, content_id: str, progress: int, status: str) -> Dict[str, Any]:
         """
         Sends playback progress and status updates for a specific content ID.
@@ -627,6 +844,28 @@ class ClubClient(AIOClient):
         return self.put("content", request_payload)
 
 
+    @with_deadline
+    @traced
+    def bulk_send_progress(self, updates: Iterable[Dict[str, Any]], max_workers: int = 8, retries: int = 2) -> BulkReport:
+        """
+        Sends many progress updates concurrently under one authentication check.
+        
+        Args:
+            updates: Dicts with 'content_id', 'progress' and 'status' (see send_progress).
+            max_workers: Maximum concurrent requests. Defaults to 8.
+            retries: Extra attempts for items that failed with a retryable error. Defaults to 2.
+            
+        Returns:
+            BulkReport: One result per update.
+        """
+        def send(update: Dict[str, Any]) -> Dict[str, Any]:
+            return self.send_progress(update['content_id'], update['progress'], update['status'])
+        
+        with self.bulk_session():
+            return run_bulk('bulk_send_progress', updates, send, max_workers, retries)
+
+    @with_deadline
+    @traced
     def fetch_random(self) -> Dict[str, Any]:
         """
         Fetches a random piece of content (episode/media) from the API.
@@ -639,6 +878,8 @@ class ClubClient(AIOClient):
         """
         return self.get("content/random")
 
+    @with_deadline
+    @traced
     def fetch_badges(self, page_number: int = 1, page_size: int = 25) -> Dict[str, Any]:
         """
         Fetches a paginated list of available badges for the profile.
@@ -665,7 +906,9 @@ class ClubClient(AIOClient):
         return self.post("badge/search", request_payload)
     
     
-    def fetch_comments(self, related_id: str = None, page_number: int = 1, page_size: int = 10) -> Dict[str, Any]:
+    @with_deadline
+    @traced
+    def fetch_comments(self, related_id: str = None, page_number: int = 1, page_size: int = 10, schema: Optional[Type] = None) -> Dict[str, Any]:
         """
         Fetches a paginated list of comments. Can fetch comments related to a 
         specific content item or fetch a general list of comments if no ID is provided.
@@ -676,9 +919,10 @@ class ClubClient(AIOClient):
                         a general list.
             page_number: The page number to retrieve. Defaults to 1.
             page_size: The number of results per page. Defaults to 10.
+            schema: Optional. A typed schema to decode into (e.g., schemas.CommentPage).
             
         Returns:
-            Dict[str, Any]: The parsed JSON response containing the comments.
+            Dict[str, Any]: The parsed JSON response containing the comments (or a `schema` instance).
         
         Raises:
             requests.exceptions.HTTPError: If the API request fails.
@@ -695,132 +939,97 @@ class ClubClient(AIOClient):
             json_data["relatedToId"] = related_id
 
         # POST to: apexrest/v1/comment/search
-        return self.post("comment/search", payload=json_data)
+        return self.post("comment/search", payload=json_data, schema=schema)
+    
+    @with_deadline
+    @traced
+    def build_comment_index(self, index_path: Optional[str] = None, page_size: int = 100, max_pages: Optional[int] = None) -> CommentIndex:
+        """
+        Pages through all comments and builds a reply-tree index of them.
+        
+        Args:
+            index_path: Optional. A file to load the index from and save it back to, so
+                        later runs only fetch comments posted since the last one.
+            page_size: Comments per request. Defaults to 100.
+            max_pages: Optional. Stop after this many pages.
+            
+        Returns:
+            CommentIndex: The index (see adventuresinodyssey.comments).
+            
+        Raises:
+            DeadlineExceeded: If the deadline passes; its `partial` is the index built so far
+                              (also saved to index_path).
+        """
+        index = CommentIndex.load(index_path) if index_path else CommentIndex()
+        try:
+            index.update(self, page_size=page_size, max_pages=max_pages)
+        except DeadlineExceeded as e:
+            e.partial = index
+            if index_path:
+                index.save(index_path)
+            raise
+        if index_path:
+            index.save(index_path)
+        return index
     
-    def find_comment_pages(self) -> List[Dict[str, Any]]:
+    def comment_feed(self, related_id: Optional[str] = None, cursor: Optional[Dict[str, Any]] = None, **kwargs) -> CommentFeed:
         """
-        Fetches the latest comments, traces replies back to their root content page,
+        Returns a feed that polls for new comments, fetching only until it reaches ones it has seen.
+        
+        Args:
+            related_id: Optional. Only follow comments on this content item.
+            cursor: Optional. A cursor saved from a previous feed (feed.cursor()), to resume from.
+            **kwargs: Passed to CommentFeed (page_size, include_existing, max_pages).
+            
+        Returns:
+            CommentFeed: Call poll() for the new comments, or iterate follow().
+        """
+        return CommentFeed(self, related_id=related_id, cursor=cursor, **kwargs)
+    
+    @with_deadline
+    @traced
+    def find_comment_pages(self, index_path: Optional[str] = None, limit: Optional[int] = None, include_unnamed: bool = False) -> List[Dict[str, Any]]:
+        """
+        Indexes all comments, traces replies back to their root content page,
         and returns a list of unique related page IDs, types, and names, 
         sorted by the frequency of their appearance (most commented pages first).
         
-        All root comments and replies found in the sample are counted toward the page.
+        All root comments and replies are counted toward the page.
+        
+        Args:
+            index_path: Optional. Persist the comment index here so reruns are incremental
+                        (and an interrupted crawl resumes where it stopped).
+            limit: Optional. Return at most this many pages.
+            include_unnamed: If True, pages whose comments carry no page name are included
+                             as "Unknown Name". Defaults to False.
+            
+        Raises:
+            DeadlineExceeded: If the deadline passes; its `partial` ranks the comments indexed so far.
         """
         
         logger.info("Starting process to find unique comment pages (including replies).")
         
         try:
-            # Fetch comments (using a large page size for better thread coverage)
-            response: Dict[str, Any] = self.fetch_comments(page_size=100)
+            index = self.build_comment_index(index_path=index_path)
+        except DeadlineExceeded as e:
+            # Rank what was indexed before the deadline
+            e.partial = e.partial.top_pages(limit, include_unnamed)
+            raise
         except Exception as e:
             logger.error(f"Failed to fetch comments during page lookup: {e}")
             return [] 
         
-        comments = response.get("comments", [])
-        
-        if not comments:
+        if not len(index):
             logger.warning("No comments found in the API response.")
             return []
-            
-        logger.debug(f"Successfully retrieved {len(comments)} comments.")
-
-        # --- STEP 1: Index all comments for efficient tracing ---
-        # Map: Comment ID -> Full Comment Object
-        comment_index: Dict[str, Dict[str, Any]] = {
-            comment['id']: comment for comment in comments if 'id' in comment
-        }
-        
-        # --- STEP 2: Tracing Helper Function ---
-        def get_ultimate_page_info(
-            current_comment: Dict[str, Any]
-        ) -> Optional[tuple[str, str, str]]:
-            """
-            Recursively traces a comment's parent thread until the ultimate 
-            content page is found (relatedToObject != "Comment").
-            Returns (page_id, page_type, page_name) or None if the thread 
-            root is not in the current sample.
-            """
-            # Start with the current comment
-            comment_obj = current_comment
-            
-            # Use a safe loop to prevent infinite recursion, though unlikely here
-            max_depth = 5 
-            for _ in range(max_depth):
-                related_object = comment_obj.get("relatedToObject")
-                
-                # Check if we have hit the root comment (attached to a page)
-                if related_object and related_object != "Comment":
-                    page_id = comment_obj.get("relatedToId")
-                    page_name = comment_obj.get("relatedToName")
-                    
-                    if page_id and page_name:
-                        return (page_id, related_object, page_name)
-                    else:
-                        # Root found, but details are missing (shouldn't happen)
-                        return None 
-
-                # If it is a reply, we must trace back
-                elif related_object == "Comment":
-                    parent_id = comment_obj.get("inReplyToCommentId")
-                    
-                    if not parent_id:
-                        # Reply has no parent ID, stop tracing
-                        return None
-                        
-                    # Look up the parent in the index
-                    parent_comment = comment_index.get(parent_id)
-                    
-                    if parent_comment:
-                        # Found parent in the sample, continue tracing
-                        comment_obj = parent_comment
-                        continue
-                    else:
-                        # Parent not found in the sample (outside the 100), stop tracing
-                        return None
-                
-                # Default case for unexpected structure
-                return None 
-            
-            # If max depth is reached
-            return None
-
-        # --- STEP 3: Count and Map All Comments (including replies) ---
-        page_counts = Counter()
-        # Map: Page ID -> (Page Type, Page Name)
-        page_details_map: Dict[str, tuple[str, str]] = {} 
-
-        for comment in comments:
-            page_info = get_ultimate_page_info(comment)
-            
-            if page_info:
-                page_id, page_type, page_name = page_info
-                
-                # 1. Count: Increment the count for the ultimate page ID
-                page_counts[page_id] += 1
-                
-                # 2. Map: Store page details (Name and Type)
-                if page_id not in page_details_map:
-                    page_details_map[page_id] = (page_type, page_name)
-
-        # --- STEP 4: Format the final output ---
         
-        # Sort the unique page IDs by count (most frequent first)
-        sorted_page_ids = sorted(page_counts.items(), key=lambda item: item[1], reverse=True)
-        
-        result: List[Dict[str, Any]] = []
-        for page_id, count in sorted_page_ids:
-            page_type, page_name = page_details_map.get(page_id, ("Unknown Type", "Unknown Name"))
-            
-            result.append({
-                "id": page_id,
-                "name": page_name,
-                "page_type": page_type,
-                "comment_count": count
-            })
-            
-        logger.info(f"Found {len(result)} unique pages with comments (total comments counted: {sum(page_counts.values())}).")
+        result = index.top_pages(limit, include_unnamed)
+        logger.info(f"Found {len(result)} unique pages with comments (total comments indexed: {len(index)}).")
         
         return result
 
+    @with_deadline
+    @traced
     def post_comment(self, message: str, related_id: str) -> Dict[str, Any]:
         """
         Posts a new comment to a content item (episode, grouping, etc.).
@@ -854,6 +1063,29 @@ class ClubClient(AIOClient):
         # ClubClient's post method will handle authentication and retries
         return self.post("comment", payload=comment_payload)
     
+    @with_deadline
+    @traced
+    def bulk_post_comments(self, comments: Iterable[Dict[str, str]], max_workers: int = 4, retries: int = 2) -> BulkReport:
+        """
+        Posts many comments concurrently under one authentication check.
+        
+        Args:
+            comments: Dicts with 'message' and 'related_id' (see post_comment).
+            max_workers: Maximum concurrent requests. Defaults to 4.
+            retries: Extra attempts for items that failed before the server could apply them (429, refused
+                     connections, open circuit); timeouts and 5xx aren't retried, to avoid duplicates. Defaults to 2.
+            
+        Returns:
+            BulkReport: One result per comment.
+        """
+        def post(comment: Dict[str, str]) -> Dict[str, Any]:
+            return self.post_comment(comment['message'], comment['related_id'])
+        
+        with self.bulk_session():
+            return run_bulk('bulk_post_comments', comments, post, max_workers, retries, retryable=is_safe_to_resend)
+    
+    @with_deadline
+    @traced
     def post_reply(self, message: str, related_id: str) -> Dict[str, Any]:
         """
         Posts a reply to a comment.
@@ -885,6 +1117,8 @@ class ClubClient(AIOClient):
         # ClubClient's post method will handle authentication and retries
         return self.post("comment", payload=reply_payload)
     
+    @with_deadline
+    @traced
     def fetch_bookmarks(self) -> Dict[str, Any]:
         """
         Retrieves all content bookmarked by the current club member.
@@ -901,6 +1135,8 @@ class ClubClient(AIOClient):
         # Use the ClubClient's authenticated GET method
         return self.get(endpoint)
 
+    @with_deadline
+    @traced
     def bookmark(self, content_id: str) -> Dict[str, Any]:
         """
         Creates a new bookmark for a given piece of content.
@@ -927,6 +1163,26 @@ class ClubClient(AIOClient):
         # Use the ClubClient's authenticated POST method
         return self.post("bookmark", payload=payload)
     
+    @with_deadline
+    @traced
+    def bulk_bookmark(self, content_ids: Iterable[str], max_workers: int = 8, retries: int = 2) -> BulkReport:
+        """
+        Bookmarks many content items concurrently under one authentication check.
+        
+        Args:
+            content_ids: The IDs of the content items to bookmark.
+            max_workers: Maximum concurrent requests. Defaults to 8.
+            retries: Extra attempts for items that failed before the server could apply them (429, refused
+                     connections, open circuit); timeouts and 5xx aren't retried, to avoid duplicates. Defaults to 2.
+            
+        Returns:
+            BulkReport: One result per content ID (see adventuresinodyssey.bulk).
+        """
+        with self.bulk_session():
+            return run_bulk('bulk_bookmark', content_ids, self.bookmark, max_workers, retries, retryable=is_safe_to_resend)
+    
+    @with_deadline
+    @traced
     def fetch_profiles(self) -> Dict[str, Any]:
         """
         Fetches the profiles.
@@ -939,6 +1195,8 @@ class ClubClient(AIOClient):
         """
         return self.get("viewer")
     
+    @with_deadline
+    @traced
     def create_playlist(self, json_payload: dict) -> str:
         """
         Creates a new content grouping (playlist) by directly posting the 
@@ -997,6 +1255,34 @@ class ClubClient(AIOClient):
             logger.debug(f"Raw Response: {response}")
             raise KeyError("API response was missing the expected 'contentGroupings[0]['id']' field.")
         
+    @with_deadline
+    @traced
+    def bulk_create_playlists(self, payloads: Iterable[dict], max_items: int = PLAYLIST_CHUNK_SIZE, max_workers: int = 4, retries: int = 2) -> BulkReport:
+        """
+        Creates many playlists concurrently under one authentication check.
+        
+        Each grouping in a payload becomes its own request. A grouping whose 'contentList' is
+        longer than `max_items` is split into several playlists named '<name> (Part i of n)'.
+        
+        Args:
+            payloads: create_playlist payloads ({"contentGroupings": [ ... ]}).
+            max_items: Largest 'contentList' per request. Defaults to PLAYLIST_CHUNK_SIZE (200).
+            max_workers: Maximum concurrent requests. Defaults to 4.
+            retries: Extra attempts for items that failed before the server could apply them (429, refused
+                     connections, open circuit); timeouts and 5xx aren't retried, to avoid duplicates. Defaults to 2.
+            
+        Returns:
+            BulkReport: One result per request; each successful 'result' is the new playlist ID.
+            
+        Raises:
+            ValueError: If a payload has no 'contentGroupings'.
+        """
+        chunks = [chunk for payload in payloads for chunk in chunk_playlist_payload(payload, max_items)]
+        with self.bulk_session():
+            return run_bulk('bulk_create_playlists', chunks, self.create_playlist, max_workers, retries, retryable=is_safe_to_resend)
+        
+    @with_deadline
+    @traced
     def fetch_playlists(self, page_number: int = 1, page_size: int = 25) -> Dict[str, Any]:
         """
         Fetches the custom playlists made by current user.
@@ -1023,13 +1309,17 @@ class ClubClient(AIOClient):
         # Uses the unauthenticated post helper
         return self.post("contentgrouping/search", request_payload)
         
-    def fetch_signed_cookie(self, content_type: str = 'audio') -> str:
+    @with_deadline
+    @traced
+    def fetch_signed_cookie(self, content_type: str = 'audio', max_age: Optional[float] = None) -> str:
         """
         Fetches the content data for a known audio or video test ID, extracts the 
         signed cookie URL, and returns the query string portion *prefixed with '?'*.
 
         Args:
             content_type: The type of content to fetch: 'audio' or 'video'.
+            max_age: Optional. Reuse the last cookie fetched for this type if it is younger than
+                     this many seconds. Defaults to signed_cookie_max_age (None: always fetch).
 
         Returns:
             str: The signed cookie URL query string, including the leading '?' (e.g., ?Policy=...&Signature=...&Key-Pair-Id=...).
@@ -1047,6 +1337,13 @@ class ClubClient(AIOClient):
         else:
             raise ValueError(f"Invalid content_type '{content_type}'. Must be 'audio' or 'video'.")
 
+        if max_age is None:
+            max_age = self.signed_cookie_max_age
+        cached = self._signed_cookies.get(content_type.lower())
+        if max_age is not None and cached is not None and time.monotonic() - cached[1] < max_age:
+            logger.debug(f"Reusing signed {content_type} cookie.")
+            return cached[0]
+
         # 1. Fetch the content data
         # Note: This uses the default 'full' page_type, which is authenticated.
         content_data = self.fetch_content(content_id)
@@ -1073,9 +1370,13 @@ class ClubClient(AIOClient):
         
         # *** MODIFICATION HERE ***
         # Prepend the '?' to the query string before returning.
-        return '?' + parsed_url.query
+        cookie = '?' + parsed_url.query
+        self._signed_cookies[content_type.lower()] = (cookie, time.monotonic())
+        return cookie
         
-    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None, timeout: Optional[int] = None) -> Dict[str, Any]:
+    @with_deadline
+    @traced
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None, timeout: Optional[int] = None, schema: Optional[Type] = None) -> Dict[str, Any]:
         """
         Performs an authenticated GET request to a generalized API endpoint.
 
@@ -1083,9 +1384,10 @@ class ClubClient(AIOClient):
             endpoint: The relative API path (e.g., 'content/random').
             params: Optional dictionary of query parameters.
             headers: Optional dictionary of headers to override or add for this request.
+            schema: Optional. A typed schema to decode the response into (see adventuresinodyssey.schemas).
             
         Returns:
-            Dict[str, Any]: The parsed JSON response from the API.
+            Dict[str, Any]: The parsed JSON response from the API (or a `schema` instance).
             
         Raises:
             requests.exceptions.HTTPError: If the API request fails after all retry attempts.
@@ -1109,7 +1411,7 @@ class ClubClient(AIOClient):
 
         def make_request():
             # Pass the custom headers to the request call
-            response = self.session.get(url, params=params, headers=request_headers, timeout=request_timeout)
+            response = self._request('GET', url, params=params, headers=request_headers, timeout=request_timeout)
             return response
 
         try:
@@ -1119,8 +1421,10 @@ class ClubClient(AIOClient):
             # Handle 401 Unauthorized
             if response.status_code == 401:
                 logger.warning("GET request failed with 401 Unauthorized. Attempting re-authentication...")
+                self._record_event('auth_reauth_401')
                 if self.ensure_authenticated():
                     logger.info("Re-authentication successful. Retrying request...")
+                    self._record_event('retries', _endpoint_key(url))
                     # If re-auth succeeds, the session headers are updated, but we still need 
                     # to use the potentially overridden headers for the retry.
                     # Since session.headers updates 'Authorization', we re-copy it here.
@@ -1133,13 +1437,15 @@ class ClubClient(AIOClient):
 
             response.raise_for_status()
             logger.info(f"GET request successful for: {full_endpoint}")
-            return response.json()
+            return self._decode(response, schema)
 
         except requests.exceptions.HTTPError as e:
             logger.error(f"GET request failed for {full_endpoint}: {e}")
             raise
 
-    def post(self, endpoint: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None, timeout: Optional[int] = None) -> Dict[str, Any]:
+    @with_deadline
+    @traced
+    def post(self, endpoint: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None, timeout: Optional[int] = None, schema: Optional[Type] = None) -> Dict[str, Any]:
         """
         Performs an authenticated POST request to a generalized API endpoint with JSON data.
         
@@ -1147,9 +1453,10 @@ class ClubClient(AIOClient):
             endpoint: The relative API path (e.g., 'contentgrouping/search').
             payload: The JSON dictionary to be sent in the request body.
             headers: Optional dictionary of headers to override or add for this request.
+            schema: Optional. A typed schema to decode the response into (see adventuresinodyssey.schemas).
             
         Returns:
-            Dict[str, Any]: The parsed JSON response from the API.
+            Dict[str, Any]: The parsed JSON response from the API (or a `schema` instance).
             
         Raises:
             requests.exceptions.HTTPError: If the API request fails after all retry attempts.
@@ -1172,7 +1479,7 @@ class ClubClient(AIOClient):
         def make_request():
             # Pass the custom headers to the request call
             # Use json=payload to automatically set Content-Type: application/json
-            response = self.session.post(url, json=payload, headers=request_headers, timeout=request_timeout)
+            response = self._request('POST', url, json=payload, headers=request_headers, timeout=request_timeout)
             return response
 
         try:
@@ -1182,8 +1489,10 @@ class ClubClient(AIOClient):
             # Handle 401 Unauthorized
             if response.status_code == 401:
                 logger.warning("POST request failed with 401 Unauthorized. Attempting re-authentication...")
+                self._record_event('auth_reauth_401')
                 if self.ensure_authenticated():
                     logger.info("Re-authentication successful. Retrying request...")
+                    self._record_event('retries', _endpoint_key(url))
                     # Update request headers after re-authentication
                     request_headers = self.session.headers.copy()
                     if headers:
@@ -1194,12 +1503,14 @@ class ClubClient(AIOClient):
 
             response.raise_for_status()
             logger.info(f"POST request successful for: {full_endpoint}")
-            return response.json()
+            return self._decode(response, schema)
 
         except requests.exceptions.HTTPError as e:
             logger.error(f"POST request failed for {full_endpoint}: {e}")
             raise
 
+    @with_deadline
+    @traced
     def put(self, endpoint: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None, timeout: Optional[int] = None) -> Dict[str, Any]:
         """
         Performs an authenticated PUT request to a generalized API endpoint with JSON data.
@@ -1233,7 +1544,7 @@ class ClubClient(AIOClient):
         def make_request():
             # Pass the custom headers to the request call
             # Use json=payload to automatically set Content-Type: application/json
-            response = self.session.put(url, json=payload, headers=request_headers, timeout=request_timeout)
+            response = self._request('PUT', url, json=payload, headers=request_headers, timeout=request_timeout)
             return response
 
         try:
@@ -1243,8 +1554,10 @@ class ClubClient(AIOClient):
             # Handle 401 Unauthorized
             if response.status_code == 401:
                 logger.warning("PUT request failed with 401 Unauthorized. Attempting re-authentication...")
+                self._record_event('auth_reauth_401')
                 if self.ensure_authenticated():
                     logger.info("Re-authentication successful. Retrying request...")
+                    self._record_event('retries', _endpoint_key(url))
                     # Update request headers after re-authentication
                     request_headers = self.session.headers.copy()
                     if headers:
@@ -1256,12 +1569,14 @@ class ClubClient(AIOClient):
             response.raise_for_status()
             logger.info(f"PUT request successful for: {full_endpoint}")
             # API might return no content for PUT (204 No Content), so check for content before parsing
-            return response.json() if response.content else {"status": "success"}
+            return self._decode(response) if response.content else {"status": "success"}
 
         except requests.exceptions.HTTPError as e:
             logger.error(f"PUT request failed for {full_endpoint}: {e}")
             raise
         
+    @with_deadline
+    @traced
     def delete(self, endpoint: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None, timeout: Optional[int] = None) -> Dict[str, Any]:
         """
         Performs an authenticated DELETE request to a generalized API endpoint.
@@ -1294,7 +1609,7 @@ class ClubClient(AIOClient):
 
         def make_request():
             # Use the delete method of the session
-            response = self.session.delete(url, params=params, headers=request_headers, timeout=request_timeout)
+            response = self._request('DELETE', url, params=params, headers=request_headers, timeout=request_timeout)
             return response
 
         try:
@@ -1304,8 +1619,10 @@ class ClubClient(AIOClient):
             # Handle 401 Unauthorized
             if response.status_code == 401:
                 logger.warning("DELETE request failed with 401 Unauthorized. Attempting re-authentication...")
+                self._record_event('auth_reauth_401')
                 if self.ensure_authenticated():
                     logger.info("Re-authentication successful. Retrying request...")
+                    self._record_event('retries', _endpoint_key(url))
                     
                     # Refresh headers with the new session token, then re-apply overrides
                     request_headers = self.session.headers.copy()
@@ -1318,7 +1635,7 @@ class ClubClient(AIOClient):
             response.raise_for_status()
             logger.info(f"DELETE request successful for: {full_endpoint}")
             
-            return response.json()
+            return self._decode(response)
 
         except requests.exceptions.HTTPError as e:
             logger.error(f"DELETE request failed for {full_endpoint}: {e}")
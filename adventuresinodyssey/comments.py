@@ -0,0 +1,377 @@
+"""
+Comment thread index for the Adventures in Odyssey API.
+
+CommentIndex pages through every comment (newest first) and resolves each reply to the
+root comment of its thread, and that root to the page it was posted on. Each comment's
+root is memoized, so a reply costs one lookup of its parent's root instead of a walk
+up the thread. Replies seen before their parent wait until the parent arrives.
+
+Per-page comment counts, thread sizes and the top-N pages are then answered from
+counters. The index can be saved and loaded, and update() only fetches comments newer
+than the ones already indexed. An interrupted crawl resumes from the page it stopped at.
+
+CommentFeed polls for new comments with a CreatedDate/ID cursor, fetching only until it
+reaches comments it has already seen.
+"""
+
+import json
+import logging
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Union, Iterator, Callable
+
+from ._statefile import save_state, load_state
+from .deadline import DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+
+class CommentIndex:
+    """
+    Reply-tree index of comments, keyed by comment ID.
+    """
+
+    def __init__(self):
+        # Map: Comment ID -> {'parent': ID} for replies, or {'page', 'page_type', 'name'} for root comments.
+        # Both carry 'created' (the comment's CreatedDate).
+        self._comments: Dict[str, Dict[str, Any]] = {}
+        # Map: Comment ID -> ID of the root comment of its thread (memoized resolution)
+        self._root_of: Dict[str, str] = {}
+        # Map: Parent comment ID -> replies that arrived before the parent
+        self._waiting: Dict[str, List[str]] = {}
+        # Map: Page ID -> {'page_type', 'name'}
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self._page_counts: Counter = Counter()
+        self._thread_sizes: Counter = Counter()
+        # Pages sorted by comment count, rebuilt on the first top_pages() after a change
+        self._ranking: Optional[List[str]] = None
+        # True once a crawl has reached the oldest comment
+        self.complete = False
+        # Until then, the page an interrupted crawl continues from
+        self.next_page = 1
+
+    def __len__(self) -> int:
+        return len(self._comments)
+
+    def __contains__(self, comment_id: str) -> bool:
+        return comment_id in self._comments
+
+    @property
+    def unresolved(self) -> int:
+        """Number of replies whose parent comment is not (yet) in the index."""
+        return sum(len(replies) for replies in self._waiting.values())
+
+    # --- building ---
+
+    def add(self, comment: Dict[str, Any]) -> bool:
+        """
+        Adds a comment from the API (a 'comments' item of comment/search).
+
+        Returns:
+            bool: True if the comment was new, False if it was already indexed or has no ID.
+        """
+        comment_id = comment.get('id')
+        if not comment_id or comment_id in self._comments:
+            return False
+
+        related_object = comment.get('relatedToObject')
+        if related_object == 'Comment':
+            record = {'parent': comment.get('inReplyToCommentId') or comment.get('relatedToId')}
+        else:
+            record = {'page': comment.get('relatedToId'), 'page_type': related_object, 'name': comment.get('relatedToName')}
+        record['created'] = comment.get('CreatedDate')
+
+        self._add_record(comment_id, record)
+        return True
+
+    def _add_record(self, comment_id: str, record: Dict[str, Any]):
+        self._comments[comment_id] = record
+
+        if 'parent' in record:
+            root = self._root_of.get(record['parent'])
+            if root is None:
+                # Parent not indexed yet (it is older, or was deleted): resolve when it arrives
+                self._waiting.setdefault(record['parent'], []).append(comment_id)
+                return
+        else:
+            root = comment_id
+            if record.get('page') and record['page'] not in self.pages:
+                self.pages[record['page']] = {'page_type': record.get('page_type'), 'name': record.get('name')}
+
+        page_id = self._comments[root].get('page')
+
+        # Resolve this comment, then any replies that were waiting on it (and on those, ...)
+        stack = [comment_id]
+        while stack:
+            current = stack.pop()
+            self._root_of[current] = root
+            self._thread_sizes[root] += 1
+            if page_id:
+                self._page_counts[page_id] += 1
+            stack.extend(self._waiting.pop(current, ()))
+
+        self._ranking = None
+
+    def update(self, client, page_size: int = 100, max_pages: Optional[int] = None) -> int:
+        """
+        Fetches comments newest first and adds them to the index.
+
+        Once a full crawl has completed, stops at the first page that contains an
+        already-indexed comment, since everything after it is older. An unfinished crawl
+        continues from the page it stopped at (comments posted since only push older ones
+        onto later pages, so none are skipped), then fetches the new comments from page 1.
+
+        Args:
+            client: A ClubClient (anything with fetch_comments(page_number=, page_size=)).
+            page_size: Comments per request. Defaults to 100. Keep it the same between runs,
+                       since next_page counts pages of this size.
+            max_pages: Optional. Stop after this many pages.
+
+        Returns:
+            int: The number of new comments added.
+
+        Raises:
+            DeadlineExceeded: If the current deadline passes. The comments fetched so far stay
+                              in the index, and its `partial` is the number added.
+        """
+        added = 0
+        fetched = 0
+        page_number = 1 if self.complete else self.next_page
+        resumed = page_number > 1
+        if resumed:
+            logger.info(f"Resuming comment crawl from page {page_number}.")
+
+        while max_pages is None or fetched < max_pages:
+            try:
+                response = client.fetch_comments(page_number=page_number, page_size=page_size)
+            except DeadlineExceeded as e:
+                logger.warning(f"Deadline exceeded while indexing comments; {added} new comments were indexed.")
+                e.partial = added
+                raise
+            fetched += 1
+            comments = response.get('comments', [])
+            page_added = sum(self.add(comment) for comment in comments)
+            added += page_added
+            if comments:
+                logger.debug(f"Comment page {page_number}: {page_added} new of {len(comments)}.")
+
+            total_pages = response.get('metadata', {}).get('totalPageCount')
+            if len(comments) < page_size or (total_pages is not None and page_number >= total_pages):
+                self.complete = True
+                self.next_page = 1
+                if resumed:
+                    # Reached the oldest comment; now fetch those posted since the crawl began
+                    resumed = False
+                    page_number = 1
+                    continue
+                break
+
+            if self.complete and page_added < len(comments):
+                # Reached comments indexed by a previous run
+                break
+
+            page_number += 1
+            if not self.complete:
+                self.next_page = page_number
+
+        logger.info(f"Indexed {added} new comments ({len(self)} total, {self.unresolved} unresolved replies).")
+        return added
+
+    # --- queries ---
+
+    def page_of(self, comment_id: str) -> Optional[str]:
+        """Returns the ID of the page a comment (or reply) belongs to, or None if unresolved."""
+        root = self._root_of.get(comment_id)
+        return self._comments[root].get('page') if root else None
+
+    def page_comment_count(self, page_id: str) -> int:
+        """Returns the number of comments, including replies, on a page."""
+        return self._page_counts.get(page_id, 0)
+
+    def thread_size(self, comment_id: str) -> int:
+        """Returns the size of the thread containing a comment (its root comment plus all replies)."""
+        root = self._root_of.get(comment_id)
+        return self._thread_sizes[root] if root else 0
+
+    def top_pages(self, limit: Optional[int] = None, include_unnamed: bool = False) -> List[Dict[str, Any]]:
+        """
+        Returns pages sorted by comment count (most commented first).
+
+        Args:
+            limit: Optional. Return at most this many pages.
+            include_unnamed: If True, pages whose comments carry no page name are included
+                             as "Unknown Name". Defaults to False.
+
+        Returns:
+            List[Dict[str, Any]]: Items with 'id', 'name', 'page_type' and 'comment_count'.
+        """
+        if self._ranking is None:
+            self._ranking = [page_id for page_id, _ in self._page_counts.most_common()]
+
+        result = []
+        for page_id in self._ranking:
+            if limit is not None and len(result) >= limit:
+                break
+            details = self.pages.get(page_id, {})
+            if not include_unnamed and not details.get('name'):
+                continue
+            result.append({
+                'id': page_id,
+                'name': details.get('name') or "Unknown Name",
+                'page_type': details.get('page_type') or "Unknown Type",
+                'comment_count': self._page_counts[page_id],
+            })
+        return result
+
+    # --- persistence ---
+
+    def save(self, path: Union[str, Path]):
+        """Writes the index to a JSON file (atomically)."""
+        save_state(path, INDEX_VERSION, {'complete': self.complete, 'next_page': self.next_page, 'comments': self._comments})
+        logger.info(f"Saved comment index ({len(self)} comments) to {path}")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "CommentIndex":
+        """
+        Loads an index saved with save(). Returns an empty index if the file does not
+        exist or was written by an incompatible version.
+        """
+        index = cls()
+        state = load_state(path, INDEX_VERSION, 'comment index')
+        if state is None:
+            return index
+
+        for comment_id, record in state.get('comments', {}).items():
+            index._add_record(comment_id, record)
+        index.complete = state.get('complete', False)
+        index.next_page = state.get('next_page', 1)
+        logger.info(f"Loaded comment index ({len(index)} comments) from {path}")
+        return index
+
+
+class CommentFeed:
+    """
+    Incremental feed of new comments.
+
+    Keeps a high-water mark: the newest CreatedDate seen and the IDs of the comments
+    posted at that instant. Each poll() fetches pages newest first until it reaches a
+    comment at or below the mark, and returns only the comments after it.
+    """
+
+    def __init__(self, client, related_id: Optional[str] = None, page_size: int = 25,
+                 cursor: Optional[Dict[str, Any]] = None, include_existing: bool = False, max_pages: Optional[int] = None):
+        """
+        Args:
+            client: A ClubClient (anything with fetch_comments(related_id=, page_number=, page_size=)).
+            related_id: Optional. Only follow comments on this content item.
+            page_size: Comments per request. Defaults to 25.
+            cursor: Optional. A cursor from a previous run (see cursor()), to resume without replaying history.
+            include_existing: Without a cursor, the first poll only sets the mark and returns nothing.
+                              Set True to have it return the latest page instead.
+            max_pages: Optional. Upper bound on pages fetched per poll. Comments beyond it are skipped.
+        """
+        self.client = client
+        self.related_id = related_id
+        self.page_size = page_size
+        self.include_existing = include_existing
+        self.max_pages = max_pages
+
+        cursor = cursor or {}
+        if cursor.get('related_id', related_id) != related_id:
+            raise ValueError(f"Cursor is for related_id '{cursor.get('related_id')}', not '{related_id}'.")
+        self.created: Optional[str] = cursor.get('created')
+        self._ids_at_created = set(cursor.get('ids', []))
+        self._started = 'created' in cursor
+
+    def cursor(self) -> Dict[str, Any]:
+        """Returns the JSON-serializable cursor state."""
+        return {
+            'related_id': self.related_id,
+            'created': self.created,
+            'ids': sorted(self._ids_at_created),
+        }
+
+    def save(self, path: Union[str, Path]):
+        """Writes the cursor to a JSON file."""
+        Path(path).write_text(json.dumps(self.cursor()), encoding='utf-8')
+
+    @classmethod
+    def load(cls, client, path: Union[str, Path], **kwargs) -> "CommentFeed":
+        """Creates a feed resuming from a cursor file, or a fresh feed if the file does not exist."""
+        path = Path(path)
+        cursor = json.loads(path.read_text(encoding='utf-8')) if path.exists() else None
+        return cls(client, cursor=cursor, **kwargs)
+
+    def _is_new(self, comment: Dict[str, Any]) -> bool:
+        created = comment.get('CreatedDate') or ''
+        if self.created is None or created > self.created:
+            return True
+        return created == self.created and comment.get('id') not in self._ids_at_created
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """
+        Fetches the comments posted since the last poll.
+
+        Returns:
+            List[Dict[str, Any]]: The new comments, oldest first.
+        """
+        first_poll = not self._started
+        new_comments: List[Dict[str, Any]] = []
+        seen_this_poll = set()
+        page_number = 1
+
+        while self.max_pages is None or page_number <= self.max_pages:
+            response = self.client.fetch_comments(related_id=self.related_id, page_number=page_number, page_size=self.page_size)
+            comments = response.get('comments', [])
+
+            reached_mark = False
+            for comment in comments:
+                # Offsets shift when comments arrive mid-poll, so a comment can repeat across pages
+                if comment.get('id') in seen_this_poll:
+                    continue
+                if not self._is_new(comment):
+                    reached_mark = True
+                    break
+                seen_this_poll.add(comment.get('id'))
+                new_comments.append(comment)
+
+            # Without a cursor, one page is enough to set the mark
+            if reached_mark or first_poll or len(comments) < self.page_size:
+                break
+            page_number += 1
+        else:
+            logger.warning(f"Comment feed stopped after {self.max_pages} pages; older new comments were skipped.")
+
+        self._started = True
+        if new_comments:
+            self._advance(new_comments)
+        if first_poll and not self.include_existing:
+            return []
+
+        new_comments.reverse()
+        return new_comments
+
+    def _advance(self, comments: List[Dict[str, Any]]):
+        newest = max((c.get('CreatedDate') or '') for c in comments)
+        if self.created is None or newest > self.created:
+            self.created = newest
+            self._ids_at_created = set()
+        self._ids_at_created.update(c.get('id') for c in comments if (c.get('CreatedDate') or '') == self.created)
+
+    def follow(self, interval: float = 30.0, stop: Optional[Callable[[], bool]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Polls forever (or until `stop()` returns True), yielding each new comment.
+
+        Args:
+            interval: Seconds between polls. Defaults to 30.
+            stop: Optional. Checked before every poll.
+        """
+        while stop is None or not stop():
+            try:
+                yield from self.poll()
+            except Exception as e:
+                logger.error(f"Comment feed poll failed: {e}")
+            time.sleep(interval)
@@ -0,0 +1,127 @@
+"""
+Deadlines for API calls.
+
+Every public client method accepts `deadline=` (seconds, or a Deadline). While the call
+runs, the deadline is held in a context variable, so each request made underneath it,
+however deeply nested, gets a timeout no longer than the time left, and no new request
+starts once it has passed. A nested deadline can only shorten the one around it.
+
+Compound operations (cache_episodes, build_comment_index, bulk_*) stop when the deadline
+passes: cache_episodes and the comment index raise DeadlineExceeded with what they had
+gathered in its `partial` attribute, and bulk reports mark the remaining items as failed.
+"""
+
+import contextvars
+import functools
+import time
+from contextlib import contextmanager
+from typing import Optional, Any, Union, Iterator, Callable
+
+import requests
+
+__all__ = ["Deadline", "DeadlineExceeded", "current_deadline", "deadline_scope", "with_deadline", "clamp_timeout"]
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """
+    Raised when an operation's deadline passes. A requests Timeout, so existing
+    timeout handling catches it. `partial` holds any results gathered before it did.
+    """
+
+    def __init__(self, message: str = "Deadline exceeded", partial: Any = None):
+        super().__init__(message)
+        self.partial = partial
+
+
+class Deadline:
+    """
+    A point in time (on the monotonic clock) by which an operation must finish.
+    """
+
+    def __init__(self, seconds: float):
+        """
+        Args:
+            seconds: Time budget from now, in seconds.
+        """
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Returns the seconds left (0 once expired)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self, partial: Any = None):
+        """
+        Raises:
+            DeadlineExceeded: If the deadline has passed.
+        """
+        if self.expired:
+            raise DeadlineExceeded(f"Deadline of {self.seconds:.3g}s exceeded", partial)
+
+    def __repr__(self) -> str:
+        return f"Deadline({self.seconds!r}, remaining={self.remaining():.3f})"
+
+
+_current_deadline: contextvars.ContextVar = contextvars.ContextVar('aio_deadline', default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Returns the deadline in effect for the current thread/task, if any."""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Union[float, Deadline, None]) -> Iterator[Optional[Deadline]]:
+    """
+    Runs the block under a deadline. If a shorter deadline is already in effect, it is kept.
+
+    Args:
+        deadline: Seconds from now, a Deadline, or None (no change).
+    """
+    outer = _current_deadline.get()
+    if deadline is None:
+        yield outer
+        return
+
+    if not isinstance(deadline, Deadline):
+        deadline = Deadline(deadline)
+    if outer is not None and outer.expires_at <= deadline.expires_at:
+        deadline = outer
+
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def with_deadline(func: Callable) -> Callable:
+    """Decorator adding a keyword-only `deadline` argument (seconds or Deadline) to a client method."""
+    @functools.wraps(func)
+    def wrapper(*args, deadline: Union[float, Deadline, None] = None, **kwargs):
+        if deadline is None:
+            return func(*args, **kwargs)
+        with deadline_scope(deadline):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def clamp_timeout(timeout: Optional[float]) -> Optional[float]:
+    """
+    Clamps a request timeout to the time left on the current deadline.
+
+    Raises:
+        DeadlineExceeded: If the deadline has already passed.
+    """
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return timeout
+
+    remaining = deadline.remaining()
+    if remaining <= 0:
+        raise DeadlineExceeded(f"Deadline of {deadline.seconds:.3g}s exceeded")
+    return remaining if timeout is None else min(timeout, remaining)
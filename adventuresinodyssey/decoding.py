@@ -0,0 +1,153 @@
+"""
+Pluggable JSON decoding for API responses.
+
+The clients decode every response body with a JSONDecoder (see AIOClient._decode).
+By default the fastest installed backend is used: msgspec, then orjson, then the
+standard library. Passing a typed schema (see adventuresinodyssey.schemas) decodes
+straight from bytes into compact structs instead of dictionaries; this needs msgspec.
+
+Every backend raises DecodeError, a requests.exceptions.JSONDecodeError, for an invalid
+body, as response.json() does.
+"""
+
+import json
+import logging
+from typing import Optional, Any, Type
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+class DecodeError(requests.exceptions.JSONDecodeError):
+    """Raised when a response body is not valid JSON (or does not match the requested schema)."""
+
+
+def _decode_error(message: str, content: bytes, pos: int = 0) -> DecodeError:
+    doc = content.decode('utf-8', errors='replace') if isinstance(content, (bytes, bytearray)) else str(content)
+    return DecodeError(message, doc, pos)
+
+
+def _decode_typed(content: bytes, schema: Type) -> Any:
+    if msgspec is None:
+        raise ImportError("Decoding into typed schemas requires msgspec. Install it with: pip install msgspec")
+    try:
+        return msgspec.json.decode(content, type=schema)
+    except msgspec.DecodeError as e:
+        raise _decode_error(f"Failed to decode response as {schema.__name__}: {e}", content) from e
+
+
+class JSONDecoder:
+    """
+    Standard library decoder. Also the base class for the faster backends.
+    """
+
+    name = 'json'
+
+    def decode(self, content: bytes, schema: Optional[Type] = None) -> Any:
+        """
+        Decodes a response body.
+
+        Args:
+            content: The raw response body.
+            schema: Optional. A msgspec Struct type (e.g., schemas.Content) to decode into.
+
+        Returns:
+            Any: Plain dicts/lists, or an instance of `schema`.
+
+        Raises:
+            DecodeError: If the body is not valid JSON or does not match `schema`.
+        """
+        if schema is not None:
+            return _decode_typed(content, schema)
+        try:
+            return json.loads(content)
+        except ValueError as e:
+            raise _decode_error(f"Failed to decode response: {getattr(e, 'msg', e)}", content, getattr(e, 'pos', 0)) from e
+
+
+class OrjsonDecoder(JSONDecoder):
+    """Decoder backed by orjson."""
+
+    name = 'orjson'
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("OrjsonDecoder requires orjson. Install it with: pip install orjson")
+
+    def decode(self, content: bytes, schema: Optional[Type] = None) -> Any:
+        if schema is not None:
+            return _decode_typed(content, schema)
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError as e:
+            raise _decode_error(f"Failed to decode response: {e.msg}", content, e.pos) from e
+
+
+class MsgspecDecoder(JSONDecoder):
+    """Decoder backed by msgspec."""
+
+    name = 'msgspec'
+
+    def __init__(self):
+        if msgspec is None:
+            raise ImportError("MsgspecDecoder requires msgspec. Install it with: pip install msgspec")
+        self._decoder = msgspec.json.Decoder()
+        # Map: schema type -> cached typed decoder
+        self._typed_decoders = {}
+
+    def decode(self, content: bytes, schema: Optional[Type] = None) -> Any:
+        decoder = self._decoder
+        if schema is not None:
+            decoder = self._typed_decoders.get(schema)
+            if decoder is None:
+                decoder = msgspec.json.Decoder(schema)
+                self._typed_decoders[schema] = decoder
+
+        try:
+            return decoder.decode(content)
+        except msgspec.DecodeError as e:
+            raise _decode_error(f"Failed to decode response: {e}", content) from e
+
+
+DECODERS = {
+    'json': JSONDecoder,
+    'orjson': OrjsonDecoder,
+    'msgspec': MsgspecDecoder,
+}
+
+
+def get_decoder(name: str = 'auto') -> JSONDecoder:
+    """
+    Returns a decoder by name.
+
+    Args:
+        name: 'auto' (default; fastest installed), 'msgspec', 'orjson' or 'json'.
+
+    Returns:
+        JSONDecoder: The decoder instance.
+
+    Raises:
+        ValueError: If the name is unknown.
+        ImportError: If the requested backend is not installed.
+    """
+    if name == 'auto':
+        if msgspec is not None:
+            return MsgspecDecoder()
+        if orjson is not None:
+            return OrjsonDecoder()
+        return JSONDecoder()
+
+    if name not in DECODERS:
+        raise ValueError(f"Invalid decoder '{name}'. Must be 'auto', 'msgspec', 'orjson' or 'json'.")
+    return DECODERS[name]()
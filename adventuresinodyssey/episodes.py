@@ -0,0 +1,184 @@
+"""
+Unified episode index across content grouping types.
+
+The same episode is listed in several groupings: its Album, a Series, Collections and
+'Episode Home'. EpisodeIndex crawls every grouping type once and merges what it finds
+into one record per episode ID, listing all of the episode's grouping memberships, so
+each episode is stored once however many groupings it appears in.
+
+Each record holds the episode's fields from the grouping listings plus:
+    'groupings': [{'id', 'name', 'type'}, ...] in the order they were found
+    'album_id':  the first Album membership (or the first membership), as cache_episodes sets it
+
+grouping_episodes() is the one place a grouping's 'contentList' is turned into episodes
+(the BONUS filter and 'album_id'); iter_episodes, this index and catalog snapshots use it.
+"""
+
+import logging
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Union, Iterator, Iterable
+
+from ._statefile import save_state, load_state
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+# Grouping types crawled by default
+GROUPING_TYPES = ('Album', 'Series', 'Collection', 'Episode Home')
+
+
+def grouping_episodes(grouping: Dict[str, Any], include_bonus: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the episodes a content grouping lists, each a copy with the grouping's ID as 'album_id'.
+
+    Args:
+        grouping: A 'contentGroupings' item (see AIOClient.iter_groupings).
+        include_bonus: If True, episodes starting with "BONUS" are included. Defaults to False.
+    """
+    grouping_id = grouping.get('id')
+    for episode in grouping.get('contentList', []):
+        episode_name = episode.get('name', 'Untitled Episode')
+        if not include_bonus and episode_name.startswith("BONUS"):
+            logger.debug(f"Skipping bonus episode: {episode_name}")
+            continue
+        # Note: Keeping the key as 'album_id' for consistency with previous usage
+        yield dict(episode, album_id=grouping_id)
+
+
+class EpisodeIndex:
+    """
+    Deduplicated episodes keyed by ID, each with all of its grouping memberships.
+    """
+
+    def __init__(self):
+        # Map: Episode ID -> merged episode record
+        self._episodes: Dict[str, Dict[str, Any]] = {}
+        # Map: Grouping ID -> {'id', 'name', 'type', 'episodes': [episode IDs]}
+        self.groupings: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._episodes)
+
+    def __contains__(self, episode_id: str) -> bool:
+        return episode_id in self._episodes
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._episodes.values())
+
+    def get(self, episode_id: str) -> Optional[Dict[str, Any]]:
+        """Returns the merged record of an episode, or None."""
+        return self._episodes.get(episode_id)
+
+    def episodes(self, grouping_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Returns every episode, or only those in at least one grouping of `grouping_type`."""
+        if grouping_type is None:
+            return list(self._episodes.values())
+        return [episode for episode in self._episodes.values()
+                if any(g['type'] == grouping_type for g in episode['groupings'])]
+
+    def in_grouping(self, grouping_id: str) -> List[Dict[str, Any]]:
+        """Returns the episodes of a grouping, in listing order."""
+        grouping = self.groupings.get(grouping_id)
+        if grouping is None:
+            return []
+        return [self._episodes[episode_id] for episode_id in grouping['episodes'] if episode_id in self._episodes]
+
+    # --- building ---
+
+    def add_grouping(self, grouping: Dict[str, Any], grouping_type: str, include_bonus: bool = False) -> int:
+        """
+        Merges one content grouping (a 'contentGroupings' item of contentgrouping/search).
+
+        Args:
+            grouping: The grouping, with its 'contentList'.
+            grouping_type: The type it was listed under (its own 'type' field wins if present).
+            include_bonus: If True, episodes starting with "BONUS" are included. Defaults to False.
+
+        Returns:
+            int: The number of episodes not seen before.
+        """
+        grouping_id = grouping.get('id')
+        if not grouping_id:
+            # iter_groupings already skips (and logs) these
+            return 0
+
+        membership = {'id': grouping_id, 'name': grouping.get('name'), 'type': grouping.get('type') or grouping_type}
+        entry = self.groupings.setdefault(grouping_id, dict(membership, episodes=[]))
+        listed = set(entry['episodes'])
+
+        added = 0
+        for summary in grouping_episodes(grouping, include_bonus):
+            episode_id = summary.get('id')
+            if not episode_id:
+                continue
+
+            record = self._episodes.get(episode_id)
+            if record is None:
+                record = self._episodes[episode_id] = dict(summary, groupings=[], album_id=None)
+                added += 1
+            else:
+                # Listings may carry different subsets of fields; keep the first value of each
+                for key, value in summary.items():
+                    record.setdefault(key, value)
+
+            if not any(g['id'] == grouping_id for g in record['groupings']):
+                record['groupings'].append(dict(membership))
+                if record['album_id'] is None or (membership['type'] == 'Album' and not self._in_album(record)):
+                    record['album_id'] = grouping_id
+
+            if episode_id not in listed:
+                entry['episodes'].append(episode_id)
+                listed.add(episode_id)
+        return added
+
+    def _in_album(self, record: Dict[str, Any]) -> bool:
+        """True if the record's album_id already points at an Album."""
+        return any(g['id'] == record['album_id'] and g['type'] == 'Album' for g in record['groupings'])
+
+    def crawl(self, client, grouping_types: Iterable[str] = GROUPING_TYPES, include_bonus: bool = False,
+              page_size: int = 100, concurrency: int = 1) -> int:
+        """
+        Pages through every grouping of each type and merges their episodes.
+
+        Args:
+            client: An AIOClient or ClubClient.
+            grouping_types: The grouping types to crawl. Defaults to GROUPING_TYPES.
+            include_bonus: If True, episodes starting with "BONUS" are included. Defaults to False.
+            page_size: Groupings per request. Defaults to 100.
+            concurrency: Pages fetched at once per grouping type. Defaults to 1.
+
+        Returns:
+            int: The number of episodes not seen before.
+        """
+        added = 0
+        for grouping_type in grouping_types:
+            type_added = 0
+            for grouping in client.iter_groupings(grouping_type, page_size=page_size, concurrency=concurrency):
+                type_added += self.add_grouping(grouping, grouping_type, include_bonus)
+            logger.info(f"Indexed '{grouping_type}' groupings: {type_added} new episode(s), {len(self)} in total.")
+            added += type_added
+        return added
+
+    # --- persistence ---
+
+    def save(self, path: Union[str, Path]):
+        """Writes the index to a JSON file (atomically)."""
+        save_state(path, INDEX_VERSION, {'episodes': self._episodes, 'groupings': self.groupings})
+        logger.info(f"Saved episode index ({len(self)} episodes) to {path}")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "EpisodeIndex":
+        """
+        Loads an index saved with save(). Returns an empty index if the file does not
+        exist or was written by an incompatible version.
+        """
+        index = cls()
+        state = load_state(path, INDEX_VERSION, 'episode index')
+        if state is None:
+            return index
+
+        index._episodes = state.get('episodes', {})
+        index.groupings = state.get('groupings', {})
+        logger.info(f"Loaded episode index ({len(index)} episodes) from {path}")
+        return index
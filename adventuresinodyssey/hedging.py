@@ -0,0 +1,209 @@
+"""
+Hedged requests for idempotent reads.
+
+With a HedgingPolicy on a client, an idempotent request (GET, or a POST to a '.../search'
+endpoint) that has not answered within the endpoint's recent p95 (configurable) latency
+gets a duplicate, and whichever answers first with a non-5xx response wins. The loser is
+left to finish in the background and its response is discarded.
+
+Hedges are capped by a budget: at most `budget` extra requests per request seen (e.g.
+0.05 = 5% extra load), so a slow backend is never hit with twice the traffic. Hedges
+are not counted against a client's rate limiter; the budget is what bounds them.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED, TimeoutError as FutureTimeoutError
+from typing import Optional, Dict, Any, Callable, Deque
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+def is_idempotent(method: str, endpoint: str) -> bool:
+    """Returns True for requests safe to send twice: GET/HEAD, and POSTs to search endpoints."""
+    method = method.upper()
+    if method in ('GET', 'HEAD'):
+        return True
+    return method == 'POST' and endpoint.rsplit('/', 1)[-1] == 'search'
+
+
+class HedgingPolicy:
+    """
+    Decides when to send a duplicate of a slow request, and runs both.
+    """
+
+    def __init__(self, percentile: float = 0.95, initial_delay: float = 0.5, min_delay: float = 0.01,
+                 max_delay: float = 5.0, budget: float = 0.05, window: int = 256, min_samples: int = 20,
+                 max_workers: int = 32, idempotent: Callable[[str, str], bool] = is_idempotent):
+        """
+        Args:
+            percentile: Hedge once a request has been pending longer than this percentile of the
+                        endpoint's recent latencies. Defaults to 0.95.
+            initial_delay: Hedge delay used until an endpoint has `min_samples` latencies. Defaults to 0.5s.
+            min_delay: Lower bound on the hedge delay. Defaults to 0.01s.
+            max_delay: Upper bound on the hedge delay. Defaults to 5s.
+            budget: Maximum hedges per request, as a fraction (0.05 = at most 5% extra requests).
+            window: Number of recent latencies kept per endpoint. Defaults to 256.
+            min_samples: Latencies needed before the percentile is used. Defaults to 20.
+            max_workers: Threads available for hedges. Original requests never wait for one. Defaults to 32.
+            idempotent: Callable (method, endpoint) -> bool choosing which requests may be hedged.
+        """
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be between 0 and 1.")
+        if budget < 0:
+            raise ValueError("budget must not be negative.")
+
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.window = window
+        self.min_samples = min_samples
+        self.idempotent = idempotent
+
+        self._lock = threading.Lock()
+        # Map: endpoint key -> recent attempt latencies
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='aio-hedge')
+
+        self.requests = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self.hedges_denied = 0
+
+    def applies(self, method: str, endpoint: str) -> bool:
+        return self.idempotent(method, endpoint)
+
+    def delay(self, endpoint: str) -> float:
+        """Returns how long to wait before hedging a request to `endpoint`."""
+        with self._lock:
+            samples = sorted(self._latencies.get(endpoint, ()))
+        if len(samples) < self.min_samples:
+            value = self.initial_delay
+        else:
+            value = samples[max(0, math.ceil(self.percentile * len(samples)) - 1)]
+        return min(self.max_delay, max(self.min_delay, value))
+
+    def _observe(self, endpoint: str, seconds: float):
+        with self._lock:
+            samples = self._latencies.get(endpoint)
+            if samples is None:
+                samples = self._latencies[endpoint] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self.hedges_fired + 1 > self.budget * self.requests:
+                self.hedges_denied += 1
+                return False
+            self.hedges_fired += 1
+            return True
+
+    def _attempt(self, endpoint: str, send: Callable[[], requests.Response]) -> requests.Response:
+        start = time.perf_counter()
+        try:
+            return send()
+        finally:
+            # Every attempt, including losers finishing later, feeds the latency window
+            self._observe(endpoint, time.perf_counter() - start)
+
+    def _start(self, endpoint: str, send: Callable[[], requests.Response]) -> Future:
+        """
+        Sends the original request on a thread of its own, right away. Going through the
+        hedge pool would cap concurrent requests at max_workers, and time spent queued for
+        a worker would count toward the hedge delay.
+        """
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+
+        def run():
+            try:
+                future.set_result(self._attempt(endpoint, send))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name='aio-request', daemon=True).start()
+        return future
+
+    def _submit(self, endpoint: str, send: Callable[[], requests.Response]) -> Future:
+        return self._executor.submit(self._attempt, endpoint, send)
+
+    @staticmethod
+    def _succeeded(future: Future) -> bool:
+        return future.exception() is None and future.result().status_code < 500
+
+    @staticmethod
+    def _discard(future: Future):
+        def close(f: Future):
+            if f.exception() is None:
+                f.result().close()
+        future.add_done_callback(close)
+
+    def execute(self, endpoint: str, send: Callable[[], requests.Response],
+                on_event: Optional[Callable[[str], None]] = None) -> requests.Response:
+        """
+        Sends a request, hedging it if it is slow and the budget allows.
+
+        Args:
+            endpoint: The endpoint key (latencies are tracked per endpoint).
+            send: Sends the request once and returns the response. May be called twice, concurrently.
+            on_event: Optional. Called with 'hedges_fired' or 'hedges_won'.
+
+        Returns:
+            requests.Response: The first successful response, or the original request's outcome if both failed.
+        """
+        with self._lock:
+            self.requests += 1
+
+        primary = self._start(endpoint, send)
+        try:
+            return primary.result(timeout=self.delay(endpoint))
+        except FutureTimeoutError:
+            pass
+
+        if not self._take_budget():
+            return primary.result()
+
+        logger.debug(f"Hedging slow request to {endpoint}.")
+        if on_event:
+            on_event('hedges_fired')
+        hedge = self._submit(endpoint, send)
+
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if self._succeeded(future):
+                    for loser in pending:
+                        self._discard(loser)
+                    if future is hedge:
+                        with self._lock:
+                            self.hedges_won += 1
+                        if on_event:
+                            on_event('hedges_won')
+                    return future.result()
+
+        # Both failed: surface the original request's response or error
+        self._discard(hedge)
+        return primary.result()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns request and hedge counters."""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'hedges_fired': self.hedges_fired,
+                'hedges_won': self.hedges_won,
+                'hedges_denied': self.hedges_denied,
+                'hedge_rate': self.hedges_fired / self.requests if self.requests else 0.0,
+            }
+
+    def close(self):
+        """Shuts down the worker threads."""
+        self._executor.shutdown(wait=False)
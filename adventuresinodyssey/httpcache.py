@@ -0,0 +1,376 @@
+"""
+Disk-backed HTTP cache for content and content grouping responses.
+
+With an HTTPCache on a client, responses of fetch_content, fetch_content_group and
+contentgrouping/search (fetch_content_groupings, cache_episodes and the indexes built on
+them) are stored on disk with their validators, following RFC 9111 as a private cache:
+
+* a fresh response (Cache-Control max-age, or Expires) is served without a request;
+* a stale one is revalidated with If-None-Match / If-Modified-Since, so an unchanged
+  resource costs a 304 with no body;
+* no-store responses are never stored, and no-cache ones are always revalidated;
+* Vary is honoured ('Vary: *' responses are not stored).
+
+Authenticated responses are partitioned by viewer ID, so profiles never see each other's
+entries, while unauthenticated ('promo') responses are shared. Entries survive token
+refreshes and restarts. When the cache grows past `max_bytes`, the least recently used
+entries are evicted.
+
+contentgrouping/search is a POST; it is cached like a GET keyed by its JSON body, which
+RFC 9111 leaves to the cache's discretion.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterable, Union, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from ._atomicwrite import atomic_write
+from .hedging import is_idempotent
+from .transport import request_key, build_response, RECORDED_HEADERS
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+# Endpoint keys (see aioclient._endpoint_key) cached by default
+CACHEABLE_ENDPOINTS = ('content/{id}', 'contentgrouping/{id}', 'contentgrouping/search')
+
+# Heuristic freshness (RFC 9111 4.2.2) is capped at a day
+MAX_HEURISTIC_LIFETIME = 86400.0
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parses a Cache-Control header into {directive: argument or None}, with lowercase directive names."""
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or '').split(','):
+        name, _, argument = part.strip().partition('=')
+        if name:
+            directives[name.strip().lower()] = argument.strip().strip('"') or None
+    return directives
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def _seconds(value: Optional[str]) -> Optional[float]:
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+class HTTPCache:
+    """
+    Private HTTP cache stored in a directory, with conditional revalidation and LRU eviction by size.
+    """
+
+    def __init__(self, directory: Union[str, Path] = 'http_cache', max_bytes: int = 64 * 1024 * 1024,
+                 endpoints: Iterable[str] = CACHEABLE_ENDPOINTS, default_ttl: Optional[float] = None,
+                 heuristic: bool = True):
+        """
+        Args:
+            directory: Where entries are stored. Created if missing. Defaults to 'http_cache'.
+            max_bytes: Total body size kept before the least recently used entries are evicted.
+                       Defaults to 64 MiB.
+            endpoints: Endpoint keys to cache. Defaults to CACHEABLE_ENDPOINTS.
+            default_ttl: Optional. Freshness lifetime in seconds for responses that carry neither
+                         Cache-Control/Expires freshness nor Last-Modified. By default those are stored
+                         only if they have a validator, and are revalidated on every use.
+            heuristic: If True, responses with Last-Modified but no explicit freshness stay fresh for
+                       10% of their age (RFC 9111 4.2.2), up to a day. Defaults to True.
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.endpoints = frozenset(endpoints)
+        self.default_ttl = default_ttl
+        self.heuristic = heuristic
+
+        self._lock = threading.Lock()
+        # Map: entry key -> [body size, last used (epoch seconds)]; built from disk on first use
+        self._index: Optional[Dict[str, list]] = None
+        self._size = 0
+
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evicted = 0
+
+    # --- keys and lookups ---
+
+    def applies(self, method: str, endpoint: str) -> bool:
+        """True if requests to this endpoint go through the cache."""
+        return endpoint in self.endpoints and is_idempotent(method, endpoint)
+
+    @staticmethod
+    def partition(headers: Dict[str, Any]) -> str:
+        """The cache partition for a request: its viewer ID if authenticated, otherwise 'public'."""
+        headers = CaseInsensitiveDict(headers)
+        if headers.get('Authorization'):
+            return f"viewer:{headers.get('x-viewer-id') or ''}"
+        return 'public'
+
+    def key(self, method: str, url: str, params: Optional[Dict[str, Any]] = None, payload: Any = None,
+            headers: Optional[Dict[str, Any]] = None) -> str:
+        """Builds the entry key of a request: its method, URL, parameters and body, in its partition."""
+        identity = f"{self.partition(headers or {})} {request_key(method, url, params, payload)}"
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def _load_index(self):
+        """Scans the directory once, so the size limit covers entries from earlier runs."""
+        if self._index is not None:
+            return
+        self._index = {}
+        self._size = 0
+        if not self.directory.exists():
+            return
+        for body_path in self.directory.glob('*.body'):
+            try:
+                stat = body_path.stat()
+            except OSError:
+                continue
+            self._index[body_path.stem] = [stat.st_size, stat.st_mtime]
+            self._size += stat.st_size
+
+    def lookup(self, key: str, request_headers: Optional[Dict[str, Any]] = None) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Finds the stored response for a request.
+
+        Args:
+            key: The entry key (see key()).
+            request_headers: The request's headers, matched against the entry's Vary headers and
+                             checked for Cache-Control: no-cache.
+
+        Returns:
+            Tuple[Optional[Dict[str, Any]], bool]: The entry (or None), and True if it can be served
+            without revalidating.
+        """
+        meta_path, body_path = self._paths(key)
+        try:
+            with meta_path.open('r', encoding='utf-8') as f:
+                entry = json.load(f)
+            entry['body'] = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None, False
+        if entry.get('version') != CACHE_VERSION:
+            return None, False
+
+        headers = CaseInsensitiveDict(request_headers or {})
+        if any(headers.get(name) != value for name, value in entry.get('vary', {}).items()):
+            return None, False
+
+        now = time.time()
+        try:
+            os.utime(body_path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            self._load_index()
+            if key in self._index:
+                self._index[key][1] = now
+
+        fresh = 'no-cache' not in parse_cache_control(headers.get('Cache-Control')) and self._is_fresh(entry, now)
+        return entry, fresh
+
+    # --- freshness ---
+
+    def _freshness_lifetime(self, entry: Dict[str, Any]) -> float:
+        headers = CaseInsensitiveDict(entry['headers'])
+        directives = parse_cache_control(headers.get('Cache-Control'))
+        if 'no-cache' in directives:
+            return 0.0
+        # s-maxage only applies to shared caches
+        max_age = _seconds(directives.get('max-age'))
+        if max_age is not None:
+            return max_age
+
+        date = _http_date(headers.get('Date')) or entry['response_time']
+        if 'Expires' in headers:
+            expires = _http_date(headers['Expires'])
+            # An invalid Expires (e.g. '0') means already expired
+            return max(0.0, expires - date) if expires is not None else 0.0
+
+        last_modified = _http_date(headers.get('Last-Modified'))
+        if self.heuristic and last_modified is not None:
+            return min(MAX_HEURISTIC_LIFETIME, max(0.0, (date - last_modified) / 10))
+        return self.default_ttl or 0.0
+
+    def _current_age(self, entry: Dict[str, Any], now: float) -> float:
+        headers = CaseInsensitiveDict(entry['headers'])
+        response_time = entry['response_time']
+        date = _http_date(headers.get('Date'))
+        apparent_age = max(0.0, response_time - date) if date is not None else 0.0
+        age = _seconds(headers.get('Age')) or 0.0
+        response_delay = response_time - entry['request_time']
+        return max(apparent_age, age + response_delay) + (now - response_time)
+
+    def _is_fresh(self, entry: Dict[str, Any], now: float) -> bool:
+        return self._current_age(entry, now) < self._freshness_lifetime(entry)
+
+    @staticmethod
+    def conditional_headers(entry: Dict[str, Any]) -> Dict[str, str]:
+        """The If-None-Match / If-Modified-Since headers revalidating an entry."""
+        headers = CaseInsensitiveDict(entry['headers'])
+        conditional = {}
+        if headers.get('ETag'):
+            conditional['If-None-Match'] = headers['ETag']
+        if headers.get('Last-Modified'):
+            conditional['If-Modified-Since'] = headers['Last-Modified']
+        return conditional
+
+    # --- storing ---
+
+    def store(self, key: str, response: requests.Response, request_headers: Optional[Dict[str, Any]] = None,
+              request_time: Optional[float] = None) -> bool:
+        """
+        Stores a response if it is cacheable: a 200 without no-store or 'Vary: *', that can be
+        revalidated or has a freshness lifetime.
+
+        Args:
+            key: The entry key (see key()).
+            response: The response, with its body read.
+            request_headers: The request's headers, for Vary.
+            request_time: When the request was sent (epoch seconds). Defaults to now.
+
+        Returns:
+            bool: True if the response was stored.
+        """
+        request_cc = parse_cache_control(CaseInsensitiveDict(request_headers or {}).get('Cache-Control'))
+        response_cc = parse_cache_control(response.headers.get('Cache-Control'))
+        vary = [name.strip() for name in response.headers.get('Vary', '').split(',') if name.strip()]
+        if response.status_code != 200 or 'no-store' in response_cc or 'no-store' in request_cc or '*' in vary:
+            if 'no-store' in response_cc:
+                self.invalidate(key)
+            return False
+
+        now = time.time()
+        request_headers = CaseInsensitiveDict(request_headers or {})
+        entry = {
+            'version': CACHE_VERSION,
+            'url': response.url,
+            'headers': {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers},
+            'vary': {name: request_headers.get(name) for name in vary},
+            'request_time': request_time if request_time is not None else now,
+            'response_time': now,
+        }
+        if not self.conditional_headers(entry) and self._freshness_lifetime(entry) <= 0:
+            return False
+
+        body = response.content or b''
+        if len(body) > self.max_bytes:
+            return False
+        self._write(key, entry, body)
+        return True
+
+    def update(self, key: str, entry: Dict[str, Any], not_modified: requests.Response,
+               request_time: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Refreshes a stored entry from a 304 response: its headers replace the stored ones
+        (RFC 9111 4.3.4) and the entry's age starts over. The body is kept.
+
+        Returns:
+            Dict[str, Any]: The updated entry, with its 'body'.
+        """
+        now = time.time()
+        body = entry.pop('body', b'')
+        for name in RECORDED_HEADERS:
+            if name in not_modified.headers:
+                entry['headers'][name] = not_modified.headers[name]
+        entry['request_time'] = request_time if request_time is not None else now
+        entry['response_time'] = now
+        self._write(key, entry, None)
+        entry['body'] = body
+        return entry
+
+    def _write(self, key: str, entry: Dict[str, Any], body: Optional[bytes]):
+        """Atomically writes an entry's metadata, and its body unless None."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        meta_path, body_path = self._paths(key)
+        if body is not None:
+            atomic_write(body_path, body)
+        atomic_write(meta_path, json.dumps(entry, separators=(',', ':')).encode('utf-8'))
+
+        if body is not None:
+            with self._lock:
+                self._load_index()
+                previous = self._index.get(key)
+                self._size += len(body) - (previous[0] if previous else 0)
+                self._index[key] = [len(body), time.time()]
+                self._evict()
+
+    def _evict(self):
+        """Removes least recently used entries until the cache fits in max_bytes. Holds the lock."""
+        if self._size <= self.max_bytes:
+            return
+        for key, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if self._size <= self.max_bytes:
+                break
+            self._remove(key)
+            self.evicted += 1
+
+    def _remove(self, key: str):
+        """Deletes an entry's files. Holds the lock."""
+        for path in self._paths(key):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            self._size -= entry[0]
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drops one entry, or every entry if no key is given."""
+        with self._lock:
+            self._load_index()
+            keys = [key] if key is not None else list(self._index)
+            for entry_key in keys:
+                self._remove(entry_key)
+
+    # --- serving ---
+
+    def to_response(self, entry: Dict[str, Any], url: Optional[str] = None) -> requests.Response:
+        """Builds a 200 response from a stored entry."""
+        return build_response(200, entry['body'], entry['headers'], url or entry.get('url') or '')
+
+    def record(self, outcome: str):
+        """Counts a lookup outcome: 'hit', 'revalidated' or 'miss'."""
+        with self._lock:
+            if outcome == 'hit':
+                self.hits += 1
+            elif outcome == 'revalidated':
+                self.revalidated += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/revalidation/miss counts and the cache's size."""
+        with self._lock:
+            self._load_index()
+            total = self.hits + self.revalidated + self.misses
+            return {
+                'hits': self.hits,
+                'revalidated': self.revalidated,
+                'misses': self.misses,
+                'evicted': self.evicted,
+                'entries': len(self._index),
+                'bytes': self._size,
+                'hit_rate': (self.hits + self.revalidated) / total if total else 0.0,
+            }
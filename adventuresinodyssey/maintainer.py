@@ -0,0 +1,205 @@
+"""
+Background session maintenance for ClubClient.
+
+A ClubClient refreshes lazily: the first call after startup (or after the access token
+expired while idle) pays for an introspect, a token refresh and new TLS connections.
+SessionMaintainer does that work on a background thread instead:
+
+* every `keepalive_interval` seconds it introspects the access token, which also keeps a
+  pooled connection to the API host open;
+* it refreshes the token `refresh_margin` seconds before it expires (using the 'exp'
+  the server reports, or `token_lifetime` counted from when the token was first seen),
+  through the token store so processes sharing it still do one refresh between them;
+* while it is running, calls trust the token it last verified instead of introspecting
+  it on every call (a 401 still forces a check);
+* it opens `warm_connections` connections up front and keeps the signed cookie(s)
+  fetched, so fetch_signed_cookie() answers from memory.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Iterable
+
+from .clubclient import ClubClient
+
+logger = logging.getLogger(__name__)
+
+
+class SessionMaintainer:
+    """
+    Keeps a ClubClient's session fresh and its connections warm on a background thread.
+    """
+
+    def __init__(self, client: ClubClient, keepalive_interval: float = 60.0, refresh_margin: float = 300.0,
+                 token_lifetime: float = 7200.0, cookie_types: Iterable[str] = ('audio',),
+                 cookie_interval: float = 1800.0, warm_connections: int = 2):
+        """
+        Args:
+            client: The ClubClient to maintain.
+            keepalive_interval: Seconds between token checks (each also keeps a connection warm). Defaults to 60.
+            refresh_margin: Refresh the token this many seconds before it expires. Defaults to 300.
+            token_lifetime: Assumed token lifetime in seconds when the server doesn't report 'exp'.
+                            Defaults to 7200 (the Salesforce default session timeout).
+            cookie_types: Signed cookies to keep fetched ('audio', 'video'). Pass () to disable.
+            cookie_interval: Seconds between signed cookie refreshes. Defaults to 1800.
+            warm_connections: Connections to the API host opened on start. Defaults to 2.
+        """
+        self.client = client
+        self.keepalive_interval = keepalive_interval
+        self.refresh_margin = refresh_margin
+        self.token_lifetime = token_lifetime
+        self.cookie_types = list(cookie_types)
+        self.cookie_interval = cookie_interval
+        self.warm_connections = warm_connections
+
+        self._token: Optional[str] = None
+        self._token_seen_at = 0.0
+        self._cookies_fetched_at: Optional[float] = None
+        self._previous_cookie_max_age: Optional[float] = None
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- maintenance ---
+
+    def _expires_in(self, introspection: Optional[Dict[str, Any]]) -> float:
+        """Seconds until the current token expires, by the server's 'exp' or the assumed lifetime."""
+        if introspection and introspection.get('exp'):
+            return float(introspection['exp']) - time.time()
+        return self.token_lifetime - (time.monotonic() - self._token_seen_at)
+
+    def _track_token(self):
+        if self.client.session_token != self._token:
+            self._token = self.client.session_token
+            self._token_seen_at = time.monotonic()
+
+    def _trust(self, expires_in: Optional[float] = None):
+        """Lets calls skip the introspect until shortly after the next check is due (or the token expires)."""
+        window = 2 * self.keepalive_interval
+        if expires_in is not None:
+            window = min(window, max(0.0, expires_in))
+        self.client._verified_token = self.client.session_token
+        self.client._verified_until = time.monotonic() + window
+
+    def _refresh(self) -> bool:
+        """
+        Refreshes the access token ahead of expiry (or adopts one another process just got).
+        The current token still works, so if the refresh fails it is kept, and the next pass tries again.
+        """
+        client = self.client
+        token = client.session_token
+        try:
+            with client.token_store.lock():
+                if client._adopt_stored_tokens() or client._refresh_access_token():
+                    return True
+        except Exception as e:
+            logger.warning(f"Token refresh failed: {e}")
+
+        if client.session_token != token:
+            # A rejected refresh token clears the access token too; it is valid until it expires
+            client.session_token = token
+            client.session.headers['Authorization'] = f"Bearer {token}"
+        return False
+
+    def run_once(self) -> List[str]:
+        """
+        Runs one maintenance pass: checks the token, refreshes it if it is invalid or close to
+        expiry, and refreshes the signed cookies if they are due.
+
+        Returns:
+            List[str]: What was done: 'verified', 'refreshed', 'refresh_failed' (the token is kept
+                       until the next pass), 'reauthenticated', 'cookies' or 'failed'.
+        """
+        client = self.client
+        actions = []
+
+        introspection = client._introspect() if client.session_token else None
+        self._track_token()
+
+        if not introspection or not introspection.get('active'):
+            # Expired or missing: the same path a call would take, but off the request path
+            if client.ensure_authenticated():
+                actions.append('reauthenticated')
+            else:
+                actions.append('failed')
+        elif self._expires_in(introspection) <= self.refresh_margin:
+            actions.append('refreshed' if self._refresh() else 'refresh_failed')
+        else:
+            actions.append('verified')
+
+        self._track_token()
+        if actions[-1] == 'refresh_failed':
+            self._trust(self._expires_in(introspection))
+        elif actions[-1] != 'failed':
+            self._trust()
+
+        if self.cookie_types and (self._cookies_fetched_at is None or time.monotonic() - self._cookies_fetched_at >= self.cookie_interval):
+            try:
+                for content_type in self.cookie_types:
+                    client.fetch_signed_cookie(content_type, max_age=0)
+                self._cookies_fetched_at = time.monotonic()
+                actions.append('cookies')
+            except Exception as e:
+                logger.warning(f"Could not pre-fetch the signed cookie: {e}")
+
+        logger.debug(f"Session maintenance: {', '.join(actions)}.")
+        return actions
+
+    def warm(self):
+        """Opens `warm_connections` pooled connections to the API host, in parallel."""
+        client = self.client
+        url = client.config['api_base']
+        sessions = [client.session, getattr(client, '_public_session', client.session)]
+
+        def open_connection(session):
+            try:
+                # Straight to the transport: a warm-up isn't an API call, so it skips the
+                # rate limiter, metrics and request coalescing
+                client.transport.send(session, 'HEAD', url, timeout=client.timeout).close()
+            except Exception as e:
+                logger.debug(f"Connection warm-up failed: {e}")
+
+        count = max(1, self.warm_connections)
+        with ThreadPoolExecutor(max_workers=count) as pool:
+            list(pool.map(open_connection, [sessions[i % len(sessions)] for i in range(count)]))
+
+    # --- running ---
+
+    def run(self):
+        """Maintains the session until stop() is called."""
+        self.warm()
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Session maintenance failed: {e}")
+            self._stop_event.wait(self.keepalive_interval)
+
+    def start(self) -> "SessionMaintainer":
+        """Runs the maintainer on a background daemon thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            # Cookies are refreshed well before this, so fetch_signed_cookie() answers from memory
+            self._previous_cookie_max_age = self.client.signed_cookie_max_age
+            if self.cookie_types:
+                self.client.signed_cookie_max_age = self.cookie_interval + 2 * self.keepalive_interval
+            self._thread = threading.Thread(target=self.run, name='SessionMaintainer', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stops the maintainer; calls go back to checking the token themselves."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.client._verified_until = 0.0
+        self.client.signed_cookie_max_age = self._previous_cookie_max_age
+
+    def __enter__(self) -> "SessionMaintainer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
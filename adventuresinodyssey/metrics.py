@@ -0,0 +1,245 @@
+"""
+Request metrics for the Adventures in Odyssey API clients.
+
+A ClientMetrics instance is passed to AIOClient/ClubClient via the `metrics` argument.
+It aggregates per-endpoint request counts, latency histograms, response bytes and
+status codes, plus counters for auth events ('auth_reauth_401', 'auth_refresh',
+'auth_login', 'auth_introspect') and 'retries'. Aggregates can be read with
+snapshot() or exported in Prometheus text format; sinks receive every raw event
+as it happens.
+"""
+
+import logging
+import threading
+from typing import Optional, Dict, Any, List, Tuple, Callable, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implied
+DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+MetricsSink = Callable[[Dict[str, Any]], None]
+
+
+class _Histogram:
+    """Fixed-bucket latency histogram (non-cumulative counts, cumulated on export)."""
+
+    __slots__ = ('bounds', 'counts', 'total', 'count')
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimates a quantile as the upper bound of the bucket containing it."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.bounds[i] if i < len(self.bounds) else float('inf')
+        return float('inf')
+
+
+class ClientMetrics:
+    """
+    Thread-safe, in-memory metrics aggregator with pluggable event sinks.
+    """
+
+    def __init__(self, latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS, sinks: Optional[List[MetricsSink]] = None):
+        """
+        Args:
+            latency_buckets: Upper bounds (seconds) of the latency histogram buckets.
+            sinks: Optional. Callables that receive every raw event dictionary.
+        """
+        self.latency_buckets = tuple(sorted(latency_buckets))
+        self.sinks: List[MetricsSink] = list(sinks or [])
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clears all aggregated metrics (sinks are kept)."""
+        with self._lock:
+            # Map: (method, endpoint) -> request aggregates
+            self._requests: Dict[Tuple[str, str], Dict[str, Any]] = {}
+            # Map: (counter name, endpoint or '') -> count
+            self._counters: Dict[Tuple[str, str], int] = {}
+
+    def add_sink(self, sink: MetricsSink):
+        """Registers a callable that receives every raw event dictionary."""
+        self.sinks.append(sink)
+
+    def _emit(self, event: Dict[str, Any]):
+        for sink in self.sinks:
+            try:
+                sink(event)
+            except Exception as e:
+                logger.error(f"Metrics sink failed: {e}")
+
+    def record_request(self, endpoint: str, method: str, status: Optional[int], latency: float, response_bytes: int = 0):
+        """
+        Records a completed request.
+
+        Args:
+            endpoint: The endpoint key (e.g., 'content/{id}').
+            method: The HTTP method.
+            status: The HTTP status code, or None if the request raised before a response arrived.
+            latency: Wall time of the request in seconds.
+            response_bytes: Size of the response body in bytes.
+        """
+        key = (method, endpoint)
+        status_label = str(status) if status is not None else 'error'
+
+        with self._lock:
+            entry = self._requests.get(key)
+            if entry is None:
+                entry = {
+                    'count': 0,
+                    'bytes': 0,
+                    'statuses': {},
+                    'latency': _Histogram(self.latency_buckets),
+                }
+                self._requests[key] = entry
+
+            entry['count'] += 1
+            entry['bytes'] += response_bytes
+            entry['statuses'][status_label] = entry['statuses'].get(status_label, 0) + 1
+            entry['latency'].observe(latency)
+
+        self._emit({
+            'type': 'request',
+            'endpoint': endpoint,
+            'method': method,
+            'status': status,
+            'latency': latency,
+            'bytes': response_bytes,
+        })
+
+    def increment(self, name: str, endpoint: Optional[str] = None, amount: int = 1):
+        """
+        Increments a named counter, optionally scoped to an endpoint.
+
+        Args:
+            name: The counter name (e.g., 'retries', 'auth_refresh').
+            endpoint: Optional. The endpoint key the event relates to.
+            amount: How much to add. Defaults to 1.
+        """
+        key = (name, endpoint or '')
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+        self._emit({'type': 'counter', 'name': name, 'endpoint': endpoint, 'amount': amount})
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns a point-in-time copy of all aggregated metrics.
+
+        Returns:
+            Dict[str, Any]: {'requests': [...], 'counters': {...}}. Each request entry has
+                            'endpoint', 'method', 'count', 'bytes', 'statuses', 'latency_sum',
+                            'latency_avg', 'latency_p50', 'latency_p99' and 'latency_buckets'.
+                            Counters scoped to endpoints map endpoint -> count ('*' for unscoped).
+        """
+        with self._lock:
+            requests_out = []
+            for (method, endpoint), entry in sorted(self._requests.items()):
+                hist: _Histogram = entry['latency']
+                requests_out.append({
+                    'endpoint': endpoint,
+                    'method': method,
+                    'count': entry['count'],
+                    'bytes': entry['bytes'],
+                    'statuses': dict(entry['statuses']),
+                    'latency_sum': hist.total,
+                    'latency_avg': hist.total / hist.count if hist.count else None,
+                    'latency_p50': hist.quantile(0.5),
+                    'latency_p99': hist.quantile(0.99),
+                    'latency_buckets': dict(zip([*map(str, hist.bounds), '+Inf'], hist.counts)),
+                })
+
+            grouped: Dict[str, Dict[str, int]] = {}
+            for (name, endpoint), count in sorted(self._counters.items()):
+                grouped.setdefault(name, {})[endpoint or '*'] = count
+
+        # Counters never scoped to an endpoint collapse to a plain number
+        counters_out: Dict[str, Any] = {
+            name: (by_endpoint['*'] if list(by_endpoint) == ['*'] else by_endpoint)
+            for name, by_endpoint in grouped.items()
+        }
+
+        return {'requests': requests_out, 'counters': counters_out}
+
+    def slowest_endpoints(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Returns the request entries with the highest average latency."""
+        entries = [e for e in self.snapshot()['requests'] if e['latency_avg'] is not None]
+        return sorted(entries, key=lambda e: e['latency_avg'], reverse=True)[:limit]
+
+    def to_prometheus(self, prefix: str = 'aio') -> str:
+        """
+        Renders all metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix: Metric name prefix. Defaults to 'aio'.
+
+        Returns:
+            str: The exposition text, ready to serve from a /metrics endpoint.
+        """
+        def esc(value: str) -> str:
+            return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+        lines = [
+            f"# HELP {prefix}_requests_total Requests sent, by endpoint, method and status.",
+            f"# TYPE {prefix}_requests_total counter",
+        ]
+
+        with self._lock:
+            items = sorted(self._requests.items())
+            counters = sorted(self._counters.items())
+
+            for (method, endpoint), entry in items:
+                for status, count in sorted(entry['statuses'].items()):
+                    lines.append(f'{prefix}_requests_total{{endpoint="{esc(endpoint)}",method="{method}",status="{status}"}} {count}')
+
+            lines.append(f"# HELP {prefix}_response_bytes_total Response body bytes received.")
+            lines.append(f"# TYPE {prefix}_response_bytes_total counter")
+            for (method, endpoint), entry in items:
+                lines.append(f'{prefix}_response_bytes_total{{endpoint="{esc(endpoint)}",method="{method}"}} {entry["bytes"]}')
+
+            lines.append(f"# HELP {prefix}_request_duration_seconds Request latency.")
+            lines.append(f"# TYPE {prefix}_request_duration_seconds histogram")
+            for (method, endpoint), entry in items:
+                hist: _Histogram = entry['latency']
+                labels = f'endpoint="{esc(endpoint)}",method="{method}"'
+                cumulative = 0
+                for bound, count in zip([*map(str, hist.bounds), '+Inf'], hist.counts):
+                    cumulative += count
+                    lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{prefix}_request_duration_seconds_sum{{{labels}}} {hist.total}')
+                lines.append(f'{prefix}_request_duration_seconds_count{{{labels}}} {hist.count}')
+
+            seen_names = set()
+            for (name, endpoint), count in counters:
+                metric = f"{prefix}_{name}_total"
+                if metric not in seen_names:
+                    lines.append(f"# TYPE {metric} counter")
+                    seen_names.add(metric)
+                if endpoint:
+                    lines.append(f'{metric}{{endpoint="{esc(endpoint)}"}} {count}')
+                else:
+                    lines.append(f'{metric} {count}')
+
+        return '\n'.join(lines) + '\n'
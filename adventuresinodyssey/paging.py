@@ -0,0 +1,83 @@
+"""
+Page iteration for the API's paginated search endpoints.
+
+iter_pages() fetches page 1 to learn 'metadata.totalPageCount', then the remaining pages
+with up to `concurrency` requests in flight, yielding pages in order. At most
+`concurrency` pages are held at once, so memory stays flat however many pages there are.
+`max_pages` stops it early.
+"""
+
+import contextvars
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Dict, Any, Callable, Iterator, List, Deque
+
+logger = logging.getLogger(__name__)
+
+
+def total_pages(response: Dict[str, Any]) -> int:
+    """Returns a search response's 'metadata.totalPageCount' (1 if it is missing)."""
+    try:
+        return int(response['metadata']['totalPageCount'])
+    except (KeyError, TypeError, ValueError):
+        logger.warning("Could not determine totalPageCount from metadata. Assuming only one page.")
+        return 1
+
+
+def page_records(response: Dict[str, Any], key: str) -> List[Dict[str, Any]]:
+    """
+    Returns the records of a page: response[key], or the first list in the response
+    other than 'errors' if the key is missing.
+    """
+    records = response.get(key)
+    if isinstance(records, list):
+        return records
+    for name, value in response.items():
+        if name != 'errors' and isinstance(value, list):
+            return value
+    return []
+
+
+def iter_pages(fetch_page: Callable[[int], Dict[str, Any]], concurrency: int = 1,
+               max_pages: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yields every page of a paginated endpoint, in order.
+
+    Args:
+        fetch_page: Called with a 1-based page number; returns the parsed page.
+        concurrency: Maximum pages fetched at once. Defaults to 1 (one after the other).
+        max_pages: Optional. Stop after this many pages.
+
+    Yields:
+        Dict[str, Any]: Each page's response.
+    """
+    first = fetch_page(1)
+    pages = total_pages(first)
+    if max_pages is not None:
+        pages = min(pages, max_pages)
+    yield first
+    if pages <= 1:
+        return
+
+    if concurrency <= 1:
+        for number in range(2, pages + 1):
+            yield fetch_page(number)
+        return
+
+    # Worker threads don't inherit context variables (e.g., the current deadline), so run
+    # each fetch in a copy of the caller's context
+    context = contextvars.copy_context()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='aio-pages') as pool:
+        in_flight: Deque[Future] = deque()
+        next_page = 2
+        try:
+            while in_flight or next_page <= pages:
+                while next_page <= pages and len(in_flight) < concurrency:
+                    in_flight.append(pool.submit(context.copy().run, fetch_page, next_page))
+                    next_page += 1
+                yield in_flight.popleft().result()
+        finally:
+            # The consumer stopped early or a page failed: don't fetch the rest
+            for future in in_flight:
+                future.cancel()
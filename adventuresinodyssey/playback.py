@@ -0,0 +1,205 @@
+"""
+Playback queue with look-ahead prefetching.
+
+PlaybackQueue holds the episodes queued for playback and, in the background, gets the
+next `prefetch` of them ready: it fetches their playback metadata if it is missing
+(fetch_content with the 'playback' projection), builds their signed media URLs, and
+optionally requests their first `warm_bytes` bytes so the media CDN has them hot and a
+connection to it is open. The account's signed cookie comes from the client's cache
+(fetch_signed_cookie(max_age=...)), which prefetching renews before it goes stale. By the time next() is called, the track is usually ready, so
+switching tracks doesn't wait on the API.
+"""
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Dict, Any, List, Union, Deque
+
+import requests
+
+from .clubclient import ClubClient
+
+logger = logging.getLogger(__name__)
+
+MEDIA_BASE = 'https://media.adventuresinodyssey.com/'
+
+
+class _Entry:
+    def __init__(self, episode: Dict[str, Any]):
+        self.episode = episode
+        self.future: Optional[Future] = None
+
+
+class PlaybackQueue:
+    """
+    A queue of episodes to play, with the next few resolved ahead of time.
+
+    Each item returned by next() is a dict: {'id', 'episode', 'url'}, where 'episode' holds
+    the queued episode merged with its playback metadata and 'url' is the signed media URL.
+    """
+
+    def __init__(self, client: ClubClient, prefetch: int = 2, warm_bytes: int = 0, media_type: str = 'audio',
+                 cookie_ttl: float = 1800.0, max_workers: int = 4, media_base: str = MEDIA_BASE):
+        """
+        Args:
+            client: An authenticated ClubClient (media URLs need the account's signed cookie).
+            prefetch: Number of upcoming items to resolve ahead of time. Defaults to 2.
+            warm_bytes: Optional. Bytes of each upcoming item's media to request ahead of time. Defaults to 0 (off).
+            media_type: 'audio' or 'video', the signed cookie to use. Defaults to 'audio'.
+            cookie_ttl: Seconds a signed cookie is used before it is fetched again. Defaults to 1800.
+            max_workers: Threads available for prefetching. Defaults to 4.
+            media_base: The media host URLs are built on.
+        """
+        self.client = client
+        self.prefetch = prefetch
+        self.warm_bytes = warm_bytes
+        self.media_type = media_type
+        self.cookie_ttl = cookie_ttl
+        self.media_base = media_base
+
+        self._lock = threading.Lock()
+        self._entries: Deque[_Entry] = deque()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='aio-playback')
+        # Keeps connections to the media host open between warm-ups
+        self.media_session = requests.Session()
+        self.media_session.headers['Sec-Fetch-Dest'] = self.media_type
+
+        self.prefetched = 0
+        self.waited = 0
+
+        # Fetch the cookie now, so the first track doesn't wait for it
+        self._executor.submit(self._refresh_cookie)
+
+    # --- signed cookie ---
+
+    def _refresh_cookie(self):
+        """Fetches the signed cookie if it is past three quarters of cookie_ttl. Runs in the background."""
+        try:
+            self.client.fetch_signed_cookie(self.media_type, max_age=0.75 * self.cookie_ttl)
+        except Exception as e:
+            logger.warning(f"Could not fetch the signed {self.media_type} cookie: {e}")
+
+    def signed_cookie(self) -> str:
+        """Returns the signed cookie query string, fetching it if the client's is older than cookie_ttl."""
+        return self.client.fetch_signed_cookie(self.media_type, max_age=self.cookie_ttl)
+
+    def media_url(self, episode: Dict[str, Any]) -> str:
+        """
+        Builds the signed media URL for an episode.
+
+        Raises:
+            ValueError: If the episode has no 'download_url'.
+        """
+        download_url = episode.get('download_url')
+        if not download_url:
+            raise ValueError(f"Episode {episode.get('id')} has no 'download_url'.")
+        if download_url.startswith('http'):
+            return download_url + self.signed_cookie()
+        return self.media_base + download_url.lstrip('/') + self.signed_cookie()
+
+    # --- resolving ---
+
+    def _resolve(self, entry: _Entry) -> Dict[str, Any]:
+        """Fetches missing playback metadata, builds the media URL and warms the media if enabled."""
+        self._refresh_cookie()
+        episode = entry.episode
+        if not episode.get('download_url'):
+            content = self.client.fetch_content(episode['id'], projection='playback')
+            episode = {**episode, **content}
+
+        url = self.media_url(episode)
+        if self.warm_bytes > 0:
+            self._warm(url)
+        return {'id': episode['id'], 'episode': episode, 'url': url}
+
+    def _warm(self, url: str):
+        """Requests the first warm_bytes of the media; failures are logged and ignored."""
+        try:
+            with self.media_session.get(url, headers={'Range': f"bytes=0-{self.warm_bytes - 1}"},
+                                        stream=True, timeout=self.client.timeout) as response:
+                for _ in response.iter_content(chunk_size=self.warm_bytes):
+                    break
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Could not warm media {url.split('?', 1)[0]}: {e}")
+
+    def _schedule(self):
+        """Starts resolving the next `prefetch` entries that aren't already."""
+        with self._lock:
+            upcoming = list(self._entries)[:self.prefetch]
+            for entry in upcoming:
+                if entry.future is None:
+                    entry.future = self._executor.submit(self._resolve, entry)
+
+    # --- queue ---
+
+    def add(self, episode: Union[Dict[str, Any], str]):
+        """
+        Queues an episode: a dict with at least an 'id' (e.g., from cache_episodes), or a content ID.
+        """
+        if isinstance(episode, str):
+            episode = {'id': episode}
+        with self._lock:
+            self._entries.append(_Entry(episode))
+        self._schedule()
+
+    def extend(self, episodes: List[Union[Dict[str, Any], str]]):
+        for episode in episodes:
+            self.add(episode)
+
+    def clear(self):
+        """Empties the queue. Prefetches already running finish in the background and are discarded."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def episodes(self) -> List[Dict[str, Any]]:
+        """The queued episodes, in order."""
+        with self._lock:
+            return [entry.episode for entry in self._entries]
+
+    def next(self) -> Optional[Dict[str, Any]]:
+        """
+        Takes the next item off the queue, waiting only if its prefetch hasn't finished.
+
+        Returns:
+            Optional[Dict[str, Any]]: {'id', 'episode', 'url'}, or None if the queue is empty.
+
+        Raises:
+            requests.exceptions.RequestException: If resolving the item failed.
+        """
+        with self._lock:
+            if not self._entries:
+                return None
+            entry = self._entries.popleft()
+
+        if entry.future is not None and entry.future.done() and entry.future.exception() is None:
+            self.prefetched += 1
+            item = entry.future.result()
+            # The cookie may have been refreshed since the item was prefetched
+            item['url'] = self.media_url(item['episode'])
+        else:
+            self.waited += 1
+            if entry.future is not None:
+                try:
+                    item = entry.future.result()
+                except Exception as e:
+                    logger.warning(f"Prefetch of {entry.episode.get('id')} failed, retrying: {e}")
+                    item = self._resolve(entry)
+            else:
+                item = self._resolve(entry)
+
+        self._schedule()
+        return item
+
+    def stats(self) -> Dict[str, int]:
+        """Returns how many items were ready when next() was called, and how many had to be waited for."""
+        return {'queued': len(self._entries), 'prefetched': self.prefetched, 'waited': self.waited}
+
+    def close(self):
+        """Stops prefetching and closes the media connections."""
+        self._executor.shutdown(wait=False)
+        self.media_session.close()
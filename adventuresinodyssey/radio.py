@@ -0,0 +1,293 @@
+"""
+Radio schedule watcher for the Adventures in Odyssey API.
+
+RadioWatcher polls the aired and upcoming radio schedules (fetch_radio), detects changes
+by hashing each record, and fires callbacks with the episode's radio content and media
+URL already fetched. Polling is adaptive: every `min_interval` seconds while an upcoming
+episode is close to its air time, backing off to `max_interval` otherwise. When an
+upcoming episode's air time arrives, an 'aired' event is fired from the pre-resolved
+content, so listeners do no API work at air time.
+
+Events are dicts:
+    {'type': 'added' | 'changed' | 'removed' | 'aired',
+     'schedule': 'aired' | 'upcoming',
+     'id': content ID, 'record': the schedule record,
+     'content': fetch_content(id, page_type='radio') (None for 'removed'),
+     'media_url': the content's download_url, 'air_time': datetime or None}
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Callable, Tuple
+
+from .aioclient import AIOClient
+
+logger = logging.getLogger(__name__)
+
+# Record fields that may hold the air time, in order of preference
+AIR_TIME_FIELDS = ('recent_air_date', 'air_date', 'Recent_Air_Date__c')
+
+SCHEDULES = ('aired', 'upcoming')
+
+
+def _record_hash(record: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(record, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def _parse_air_time(record: Dict[str, Any]) -> Optional[datetime]:
+    """Returns the record's air time as an aware datetime (UTC if no offset is given), or None."""
+    for field in AIR_TIME_FIELDS:
+        value = record.get(field)
+        if not value:
+            continue
+        try:
+            parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except ValueError:
+            continue
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    return None
+
+
+class RadioWatcher:
+    """
+    Polls the radio schedule and notifies listeners of changes.
+    """
+
+    def __init__(self, client: Optional[AIOClient] = None, page_size: int = 5, min_interval: float = 60.0,
+                 max_interval: float = 3600.0, near_window: float = 900.0, resolve_content: bool = True):
+        """
+        Args:
+            client: Optional. The client to use (an AIOClient or ClubClient). Defaults to a new AIOClient().
+            page_size: Schedule entries fetched per schedule type. Defaults to 5.
+            min_interval: Seconds between polls near an air time. Defaults to 60.
+            max_interval: Longest time between polls. Defaults to 3600.
+            near_window: How close (in seconds) to an upcoming air time polling switches to
+                         min_interval. Defaults to 900.
+            resolve_content: Fetch each new or changed episode's radio content before notifying. Defaults to True.
+        """
+        self.client = client or AIOClient()
+        self.page_size = page_size
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.near_window = near_window
+        self.resolve_content = resolve_content
+
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+        # Map: (schedule, content ID) -> record hash
+        self._hashes: Dict[Tuple[str, str], str] = {}
+        # Map: (schedule, content ID) -> record
+        self._records: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # Map: (content ID, record hash) -> resolved content
+        self._content: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # Upcoming episodes already announced as 'aired'
+        self._fired: set = set()
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- listeners ---
+
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """Registers a callback that receives every event dict."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        self._listeners.remove(callback)
+
+    def _emit(self, event: Dict[str, Any]):
+        for callback in list(self._listeners):
+            try:
+                callback(event)
+            except Exception as e:
+                # A failing listener must not stop the watcher or the other listeners
+                logger.error(f"Radio listener failed on '{event['type']}' event for {event['id']}: {e}")
+
+    # --- polling ---
+
+    @property
+    def schedule(self) -> Dict[str, List[Dict[str, Any]]]:
+        """The latest known records, by schedule type."""
+        with self._lock:
+            result: Dict[str, List[Dict[str, Any]]] = {name: [] for name in SCHEDULES}
+            for (name, _), record in self._records.items():
+                result[name].append(record)
+            return result
+
+    def _resolve(self, content_id: str, record_hash: str) -> Optional[Dict[str, Any]]:
+        if not self.resolve_content:
+            return None
+        key = (content_id, record_hash)
+        if key not in self._content:
+            self._content[key] = self.client.fetch_content(content_id, page_type='radio')
+        return self._content[key]
+
+    def _event(self, event_type: str, schedule: str, content_id: str, record: Dict[str, Any], content: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            'type': event_type,
+            'schedule': schedule,
+            'id': content_id,
+            'record': record,
+            'content': content,
+            'media_url': content.get('download_url') if isinstance(content, dict) else None,
+            'air_time': _parse_air_time(record),
+        }
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """
+        Fetches both schedules once and notifies listeners of what changed.
+
+        The watcher's state is updated only once both schedules were fetched and resolved, so
+        if the poll fails part-way, the next one reports the same changes again.
+
+        Returns:
+            List[Dict[str, Any]]: The events fired.
+        """
+        events: List[Dict[str, Any]] = []
+        now = datetime.now(timezone.utc)
+        # Staged state changes: (schedule, content ID) -> (hash, record), or None to remove
+        updates: Dict[Tuple[str, str], Optional[Tuple[str, Dict[str, Any]]]] = {}
+        fired = set()
+
+        for schedule in SCHEDULES:
+            response = self.client.fetch_radio(page_type=schedule, page_size=self.page_size)
+            current = {record['id']: record for record in response.get('results', []) if record.get('id')}
+
+            with self._lock:
+                known = {content_id for (name, content_id) in self._hashes if name == schedule}
+
+            for content_id, record in current.items():
+                record_hash = _record_hash(record)
+                previous = self._hashes.get((schedule, content_id))
+                if previous == record_hash:
+                    continue
+
+                content = self._resolve(content_id, record_hash)
+                updates[(schedule, content_id)] = (record_hash, record)
+                air_time = _parse_air_time(record)
+                if schedule == 'upcoming' and air_time and air_time <= now:
+                    # Already on air when first seen: don't announce it late
+                    fired.add((content_id, air_time))
+                events.append(self._event('added' if previous is None else 'changed', schedule, content_id, record, content))
+
+            for content_id in known - set(current):
+                updates[(schedule, content_id)] = None
+                with self._lock:
+                    record = self._records.get((schedule, content_id), {})
+                events.append(self._event('removed', schedule, content_id, record, None))
+
+        with self._lock:
+            for key, update in updates.items():
+                if update is None:
+                    self._hashes.pop(key, None)
+                    self._records.pop(key, None)
+                else:
+                    self._hashes[key], self._records[key] = update
+            self._fired.update(fired)
+
+        # Drop content resolved for records that are gone or have changed since
+        with self._lock:
+            live = {(content_id, record_hash) for (_, content_id), record_hash in self._hashes.items()}
+        for key in set(self._content) - live:
+            del self._content[key]
+
+        for event in events:
+            self._emit(event)
+        logger.info(f"Radio schedule polled: {len(events)} change(s).")
+        return events
+
+    def _next_air_time(self) -> Optional[Tuple[datetime, str]]:
+        """Returns the earliest (air time, content ID) of an upcoming episode not yet announced."""
+        upcoming = []
+        with self._lock:
+            for (schedule, content_id), record in self._records.items():
+                air_time = _parse_air_time(record)
+                if schedule == 'upcoming' and air_time and (content_id, air_time) not in self._fired:
+                    upcoming.append((air_time, content_id))
+        return min(upcoming) if upcoming else None
+
+    def next_interval(self, now: Optional[datetime] = None) -> float:
+        """
+        Returns the seconds to wait before the next poll: min_interval within near_window of an
+        upcoming air time, otherwise the time left until that window opens (at most max_interval).
+        """
+        now = now or datetime.now(timezone.utc)
+        upcoming = self._next_air_time()
+        if upcoming is None:
+            return self.max_interval
+
+        until_air = (upcoming[0] - now).total_seconds()
+        if until_air <= self.near_window:
+            return self.min_interval
+        return max(self.min_interval, min(self.max_interval, until_air - self.near_window))
+
+    def fire_due(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Fires an 'aired' event for each upcoming episode whose air time has passed, using the
+        content resolved when it was first seen.
+
+        Returns:
+            List[Dict[str, Any]]: The events fired.
+        """
+        now = now or datetime.now(timezone.utc)
+        events = []
+        while True:
+            upcoming = self._next_air_time()
+            if upcoming is None or upcoming[0] > now:
+                break
+            air_time, content_id = upcoming
+            with self._lock:
+                self._fired.add((content_id, air_time))
+                record = self._records.get(('upcoming', content_id), {})
+            content = self._content.get((content_id, _record_hash(record)))
+            events.append(self._event('aired', 'upcoming', content_id, record, content))
+
+        for event in events:
+            self._emit(event)
+        return events
+
+    # --- running ---
+
+    def run(self, stop: Optional[Callable[[], bool]] = None):
+        """
+        Polls until the watcher is stopped (or the `stop` callback returns True), firing 'aired' events on time.
+
+        Args:
+            stop: Optional. Checked before every poll.
+        """
+        next_poll = 0.0
+        while not self._stop_event.is_set() and (stop is None or not stop()):
+            if time.monotonic() >= next_poll:
+                try:
+                    self.poll()
+                except Exception as e:
+                    logger.error(f"Radio schedule poll failed: {e}")
+                next_poll = time.monotonic() + self.next_interval()
+
+            self.fire_due()
+
+            # Wake for the next poll, or the next air time if that comes first
+            wait = next_poll - time.monotonic()
+            upcoming = self._next_air_time()
+            if upcoming is not None:
+                wait = min(wait, (upcoming[0] - datetime.now(timezone.utc)).total_seconds())
+            self._stop_event.wait(max(0.0, wait))
+
+    def start(self) -> "RadioWatcher":
+        """Runs the watcher on a background daemon thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self.run, name='RadioWatcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stops the watcher and waits for the background thread to finish."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
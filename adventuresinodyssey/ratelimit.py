@@ -0,0 +1,175 @@
+"""
+Token-bucket rate limiting for the Adventures in Odyssey API clients.
+
+A limiter is passed to AIOClient/ClubClient via the `rate_limiter` argument and is
+consulted before every request (including auth calls). Buckets reserve tokens up
+front and sleep for the deficit, so concurrent callers are paced evenly at the
+configured rate instead of bursting and then getting throttled.
+"""
+
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, List, Tuple, Union
+
+from ._filelock import FileLock
+
+logger = logging.getLogger(__name__)
+
+# Name of the bucket shared by every request (the aggregate limit)
+GLOBAL_BUCKET = '*'
+
+
+def _reserve(tokens: float, last: float, now: float, rate: float, capacity: float) -> Tuple[float, float]:
+    """
+    Refills a bucket up to `now` and reserves one token from it.
+
+    Tokens may go negative: each caller takes its token immediately and waits for the
+    deficit, which queues concurrent callers one interval apart.
+
+    Returns:
+        Tuple[float, float]: The new token count and the number of seconds to wait.
+    """
+    tokens = min(capacity, tokens + max(0.0, now - last) * rate)
+    tokens -= 1.0
+    wait = -tokens / rate if tokens < 0 else 0.0
+    return tokens, wait
+
+
+class RateLimiter:
+    """
+    In-process token-bucket rate limiter, shared safely between threads.
+
+    Every request draws from the global bucket (if `rate` is set) and from its
+    endpoint's bucket (if one is configured in `endpoint_limits`).
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: int = 1, endpoint_limits: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            rate: Optional. Aggregate requests per second across all endpoints. None disables the global bucket.
+            burst: The bucket capacity, i.e. how many requests may go out back-to-back after an idle period. Defaults to 1.
+            endpoint_limits: Optional. Requests per second for specific endpoints. Keys are either a full
+                             endpoint key (e.g., 'content/{id}', 'contentgrouping/search') or an endpoint
+                             family (e.g., 'content', 'oauth2'). The most specific match wins.
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be greater than 0.")
+        if burst < 1:
+            raise ValueError("burst must be at least 1.")
+
+        self.rate = rate
+        self.burst = burst
+        self.endpoint_limits = dict(endpoint_limits or {})
+
+        for name, limit in self.endpoint_limits.items():
+            if limit <= 0:
+                raise ValueError(f"Rate limit for endpoint '{name}' must be greater than 0.")
+
+        self._lock = threading.Lock()
+        # Map: Bucket name -> [tokens, last refill timestamp]
+        self._buckets: Dict[str, List[float]] = {}
+
+    def _buckets_for(self, endpoint: str) -> List[Tuple[str, float]]:
+        """Returns the (bucket name, rate) pairs a request to `endpoint` draws from."""
+        buckets = []
+        if self.rate is not None:
+            buckets.append((GLOBAL_BUCKET, self.rate))
+
+        if endpoint in self.endpoint_limits:
+            buckets.append((endpoint, self.endpoint_limits[endpoint]))
+        else:
+            family = endpoint.split('/', 1)[0]
+            if family in self.endpoint_limits:
+                buckets.append((family, self.endpoint_limits[family]))
+
+        return buckets
+
+    def _now(self) -> float:
+        return time.monotonic()
+
+    def _reserve_all(self, buckets: List[Tuple[str, float]], now: float) -> float:
+        """Reserves a token from every bucket and returns the longest wait."""
+        wait = 0.0
+        for name, rate in buckets:
+            tokens, last = self._buckets.get(name, (float(self.burst), now))
+            tokens, bucket_wait = _reserve(tokens, last, now, rate, float(self.burst))
+            self._buckets[name] = [tokens, now]
+            wait = max(wait, bucket_wait)
+        return wait
+
+    def acquire(self, endpoint: str = GLOBAL_BUCKET) -> float:
+        """
+        Blocks until a request to `endpoint` may be sent.
+
+        Args:
+            endpoint: The endpoint key of the request (e.g., 'content/{id}').
+
+        Returns:
+            float: The number of seconds the caller was delayed.
+        """
+        buckets = self._buckets_for(endpoint)
+        if not buckets:
+            return 0.0
+
+        with self._lock:
+            wait = self._reserve_all(buckets, self._now())
+
+        if wait > 0:
+            logger.debug(f"Rate limit reached for {endpoint}. Waiting {wait:.3f}s.")
+            time.sleep(wait)
+        return wait
+
+
+class FileRateLimiter(RateLimiter):
+    """
+    Token-bucket rate limiter whose buckets live in a shared state file.
+
+    Every process (and thread) pointing at the same `path` draws from the same
+    buckets, so the limit holds for the whole worker pool rather than per process.
+    Bucket updates are serialized with an inter-process file lock.
+    """
+
+    def __init__(self, path: Union[str, Path] = 'aio_ratelimit.json', rate: Optional[float] = None, burst: int = 1, endpoint_limits: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            path: The shared bucket state file. Defaults to 'aio_ratelimit.json'.
+            rate: Optional. Aggregate requests per second across all processes.
+            burst: The bucket capacity. Defaults to 1.
+            endpoint_limits: Optional. Requests per second for specific endpoints or endpoint families.
+        """
+        super().__init__(rate=rate, burst=burst, endpoint_limits=endpoint_limits)
+        self.path = Path(path)
+        self._file_lock = FileLock(self.path.with_name(self.path.name + '.lock'))
+
+    def _now(self) -> float:
+        # Wall-clock time, since monotonic clocks are not comparable between processes
+        return time.time()
+
+    def _read_state(self) -> Dict[str, List[float]]:
+        try:
+            with self.path.open('r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_state(self, state: Dict[str, List[float]]):
+        with self.path.open('w', encoding='utf-8') as f:
+            json.dump(state, f)
+
+    def acquire(self, endpoint: str = GLOBAL_BUCKET) -> float:
+        buckets = self._buckets_for(endpoint)
+        if not buckets:
+            return 0.0
+
+        with self._lock, self._file_lock:
+            self._buckets = self._read_state()
+            wait = self._reserve_all(buckets, self._now())
+            self._write_state(self._buckets)
+
+        if wait > 0:
+            logger.debug(f"Shared rate limit reached for {endpoint}. Waiting {wait:.3f}s.")
+            time.sleep(wait)
+        return wait
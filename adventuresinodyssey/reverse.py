@@ -0,0 +1,271 @@
+"""
+Reverse indexes from characters, authors and themes to the episodes they appear in.
+
+ReverseIndex pages through the character, author (cast and crew) and topic listings,
+fetches each entity's detail page with bounded concurrency, and stores a posting list
+per entity: the sorted ordinals of its episodes in a shared episode ID table. Queries
+intersect posting lists, smallest first, without any API call:
+
+    index.query(character='Whit', theme='Forgiveness')
+
+Rebuilds are incremental. The listings are always re-read, but an entity's detail page
+is fetched again only if it is new, its listing entry changed, its last fetch failed,
+or it is older than `max_age`. Entities gone from the listings are dropped.
+
+A character or theme that appears in a new episode keeps the same listing entry, so
+`max_age` (a day by default) is what picks up new episodes: it bounds how stale a
+posting list can get. Refetches are spread over the last quarter of `max_age`, so an
+index built in one go isn't refetched all at once.
+
+Episodes are recognised in detail pages as records whose ID has the Content__c key
+prefix ('a35'), wherever they are nested.
+"""
+
+import hashlib
+import json
+import logging
+import time
+import zlib
+from array import array
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Union, Iterable, Set
+
+from ._statefile import save_state, load_state
+from .bulk import run_bulk
+from .paging import iter_pages, page_records
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+# Detail pages older than this are fetched again on the next build (seconds)
+DEFAULT_MAX_AGE = 86400.0
+
+# Salesforce key prefix of Content__c record IDs (episodes and other content)
+CONTENT_ID_PREFIX = 'a35'
+
+# kind -> (listing method, listing records key, detail method, listing page size)
+KINDS = {
+    'character': ('fetch_characters', 'characters', 'fetch_character', 200),
+    'author': ('fetch_cast_and_crew', 'authors', 'fetch_author', 100),
+    'theme': ('fetch_themes', 'topics', 'fetch_theme', 100),
+}
+
+
+def _fingerprint(record: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(record, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def _content_ids(payload: Any, exclude: str) -> Set[str]:
+    """Collects the IDs of content records nested anywhere in a detail payload."""
+    found: Set[str] = set()
+    stack = [payload]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            record_id = value.get('id')
+            if isinstance(record_id, str) and record_id.startswith(CONTENT_ID_PREFIX) and record_id != exclude:
+                found.add(record_id)
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return found
+
+
+class ReverseIndex:
+    """
+    Posting lists from characters, authors and themes to episode IDs.
+    """
+
+    def __init__(self):
+        # Episode ID table; posting lists hold ordinals into it
+        self._episode_ids: List[str] = []
+        self._ordinals: Dict[str, int] = {}
+        # Map: kind -> entity ID -> sorted episode ordinals
+        self._postings: Dict[str, Dict[str, array]] = {kind: {} for kind in KINDS}
+        # Map: kind -> entity ID -> {'name', 'fingerprint', 'fetched_at'}
+        self.entities: Dict[str, Dict[str, Dict[str, Any]]] = {kind: {} for kind in KINDS}
+
+    def __len__(self) -> int:
+        return sum(len(postings) for postings in self._postings.values())
+
+    def _ordinal(self, episode_id: str) -> int:
+        ordinal = self._ordinals.get(episode_id)
+        if ordinal is None:
+            ordinal = self._ordinals[episode_id] = len(self._episode_ids)
+            self._episode_ids.append(episode_id)
+        return ordinal
+
+    def set_postings(self, kind: str, entity_id: str, episode_ids: Iterable[str]):
+        """Replaces an entity's posting list."""
+        self._postings[kind][entity_id] = array('I', sorted({self._ordinal(e) for e in episode_ids}))
+
+    # --- building ---
+
+    def _stale(self, kind: str, entity_id: str, fingerprint: str, max_age: Optional[float], now: float) -> bool:
+        known = self.entities[kind].get(entity_id)
+        if known is None or entity_id not in self._postings[kind] or known.get('fingerprint') != fingerprint:
+            return True
+        if max_age is None:
+            return False
+        # 75-100% of max_age, fixed per entity, so refetches are spread out
+        spread = 0.75 + 0.25 * (zlib.crc32(entity_id.encode('utf-8')) / 0xFFFFFFFF)
+        return now - known.get('fetched_at', 0) >= max_age * spread
+
+    def build(self, client, kinds: Optional[Iterable[str]] = None, concurrency: int = 8,
+              max_age: Optional[float] = DEFAULT_MAX_AGE, retries: int = 2) -> Dict[str, Dict[str, int]]:
+        """
+        Crawls the listings and (re)fetches the detail pages that need it.
+
+        Args:
+            client: An AIOClient or ClubClient.
+            kinds: Optional. Any of 'character', 'author' and 'theme'. Defaults to all three.
+            concurrency: Maximum detail pages fetched at once. Defaults to 8.
+            max_age: Refetch entities whose detail page is older than this many seconds; this is
+                     how new episodes of existing entities are picked up. Defaults to a day.
+                     None refetches only new or changed listing entries.
+            retries: Retry rounds for detail pages that fail with a retryable error. Defaults to 2.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Per kind, how many entities were 'fetched', 'unchanged',
+            'removed' and 'failed'.
+
+        Raises:
+            ValueError: If an unknown kind is given.
+        """
+        kinds = list(kinds or KINDS)
+        unknown = [kind for kind in kinds if kind not in KINDS]
+        if unknown:
+            raise ValueError(f"Unknown kind(s) {unknown}. Must be among: {', '.join(KINDS)}.")
+
+        summary = {}
+        for kind in kinds:
+            list_method, key, detail_method, page_size = KINDS[kind]
+            fetch_list = getattr(client, list_method)
+            fetch_detail = getattr(client, detail_method)
+
+            listed: Dict[str, Dict[str, Any]] = {}
+            for page in iter_pages(lambda n: fetch_list(page_number=n, page_size=page_size)):
+                for record in page_records(page, key):
+                    if record.get('id'):
+                        listed[record['id']] = record
+
+            now = time.time()
+            fingerprints = {entity_id: _fingerprint(record) for entity_id, record in listed.items()}
+            stale = [entity_id for entity_id in listed if self._stale(kind, entity_id, fingerprints[entity_id], max_age, now)]
+
+            report = run_bulk(f"reverse index ({kind})", stale, fetch_detail, max_workers=concurrency, retries=retries)
+            for result in report:
+                entity_id = result['item']
+                if not result['ok']:
+                    # Keep the old postings; a missing fingerprint makes the next build retry it
+                    self.entities[kind].setdefault(entity_id, {'name': listed[entity_id].get('name')})['fingerprint'] = None
+                    continue
+                self.set_postings(kind, entity_id, _content_ids(result['result'], entity_id))
+                self.entities[kind][entity_id] = {
+                    'name': listed[entity_id].get('name'),
+                    'fingerprint': fingerprints[entity_id],
+                    'fetched_at': now,
+                }
+
+            removed = [entity_id for entity_id in self.entities[kind] if entity_id not in listed]
+            for entity_id in removed:
+                self.entities[kind].pop(entity_id, None)
+                self._postings[kind].pop(entity_id, None)
+
+            summary[kind] = {
+                'fetched': len(report.succeeded),
+                'unchanged': len(listed) - len(stale),
+                'removed': len(removed),
+                'failed': len(report.failed),
+            }
+            logger.info(f"Reverse index ({kind}): {summary[kind]}")
+        return summary
+
+    # --- queries ---
+
+    def resolve(self, kind: str, entity: str) -> List[str]:
+        """
+        Returns the IDs of the entities matching an ID or a name (case-insensitive).
+
+        Raises:
+            ValueError: If the kind is unknown.
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Unknown kind '{kind}'. Must be one of: {', '.join(KINDS)}.")
+        if entity in self._postings[kind]:
+            return [entity]
+        name = entity.casefold()
+        return [entity_id for entity_id, info in self.entities[kind].items()
+                if (info.get('name') or '').casefold() == name]
+
+    def _posting(self, kind: str, entity: str) -> Set[int]:
+        postings = set()
+        for entity_id in self.resolve(kind, entity):
+            postings.update(self._postings[kind].get(entity_id, ()))
+        return postings
+
+    def episodes_for(self, kind: str, entity: str) -> List[str]:
+        """Returns the episode IDs of one character, author or theme (by ID or name)."""
+        return [self._episode_ids[ordinal] for ordinal in sorted(self._posting(kind, entity))]
+
+    def query(self, character: Union[str, List[str], None] = None, author: Union[str, List[str], None] = None,
+              theme: Union[str, List[str], None] = None) -> List[str]:
+        """
+        Returns the episode IDs matching every criterion (AND). Each criterion is an entity
+        ID or name, or a list of them that must all match.
+
+        Raises:
+            ValueError: If no criterion is given.
+        """
+        criteria = []
+        for kind, value in (('character', character), ('author', author), ('theme', theme)):
+            if value is None:
+                continue
+            for entity in ([value] if isinstance(value, str) else value):
+                criteria.append(self._posting(kind, entity))
+        if not criteria:
+            raise ValueError("At least one of character, author or theme is required.")
+
+        criteria.sort(key=len)
+        result = criteria[0]
+        for postings in criteria[1:]:
+            if not result:
+                break
+            result = result.intersection(postings)
+        return [self._episode_ids[ordinal] for ordinal in sorted(result)]
+
+    # --- persistence ---
+
+    def save(self, path: Union[str, Path]):
+        """Writes the index to a JSON file (atomically)."""
+        state = {
+            'episodes': self._episode_ids,
+            'postings': {kind: {entity_id: postings.tolist() for entity_id, postings in by_entity.items()}
+                         for kind, by_entity in self._postings.items()},
+            'entities': self.entities,
+        }
+        save_state(path, INDEX_VERSION, state)
+        logger.info(f"Saved reverse index ({len(self)} posting lists) to {path}")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ReverseIndex":
+        """
+        Loads an index saved with save(). Returns an empty index if the file does not
+        exist or was written by an incompatible version.
+        """
+        index = cls()
+        state = load_state(path, INDEX_VERSION, 'reverse index')
+        if state is None:
+            return index
+
+        index._episode_ids = state.get('episodes', [])
+        index._ordinals = {episode_id: ordinal for ordinal, episode_id in enumerate(index._episode_ids)}
+        for kind, by_entity in state.get('postings', {}).items():
+            if kind in KINDS:
+                index._postings[kind] = {entity_id: array('I', postings) for entity_id, postings in by_entity.items()}
+        for kind, entities in state.get('entities', {}).items():
+            if kind in KINDS:
+                index.entities[kind] = entities
+        logger.info(f"Loaded reverse index ({len(index)} posting lists) from {path}")
+        return index
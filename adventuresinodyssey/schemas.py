@@ -0,0 +1,115 @@
+"""
+Typed schemas for the most common API payloads.
+
+Pass one of these as `schema=` to get/post, fetch_content, fetch_content_groupings or
+fetch_comments to decode the response straight from bytes into compact structs.
+Only the fields listed here are decoded; everything else in the payload is skipped.
+
+Requires msgspec (pip install msgspec).
+"""
+
+from typing import Optional, Dict, Any, List
+
+try:
+    import msgspec
+except ImportError as e:
+    raise ImportError("adventuresinodyssey.schemas requires msgspec. Install it with: pip install msgspec") from e
+
+__all__ = [
+    "Metadata", "ContentSummary", "Content", "ContentGrouping", "GroupingPage",
+    "SearchColumn", "SearchResult", "SearchResultObject", "SearchResults",
+    "Comment", "CommentPage",
+]
+
+
+class _Schema(msgspec.Struct, kw_only=True, omit_defaults=True, gc=False):
+    """Base for all schemas: keyword-only, no GC tracking (payloads are acyclic)."""
+
+
+class Metadata(_Schema):
+    totalPageCount: Optional[int] = None
+    totalCount: Optional[int] = None
+
+
+class ContentSummary(_Schema):
+    """An item of a grouping's 'contentList'."""
+    id: str
+    name: Optional[str] = None
+    short_name: Optional[str] = None
+    episode_number: Optional[str] = None
+    thumbnail_small: Optional[str] = None
+    subtype: Optional[str] = None
+
+
+class Content(_Schema):
+    """Response of content/{id} (fetch_content)."""
+    id: str
+    name: Optional[str] = None
+    short_name: Optional[str] = None
+    long_name: Optional[str] = None
+    description: Optional[str] = None
+    download_url: Optional[str] = None
+    signed_cookie: Optional[str] = None
+    thumbnail_small: Optional[str] = None
+    episode_number: Optional[str] = None
+    subtype: Optional[str] = None
+    air_date: Optional[str] = None
+
+
+class ContentGrouping(_Schema):
+    id: str
+    name: Optional[str] = None
+    type: Optional[str] = None
+    image_url: Optional[str] = None
+    contentList: List[ContentSummary] = []
+
+
+class GroupingPage(_Schema):
+    """Response of contentgrouping/search (fetch_content_groupings)."""
+    metadata: Metadata = msgspec.field(default_factory=Metadata)
+    contentGroupings: List[ContentGrouping] = []
+
+
+class SearchColumn(_Schema):
+    name: Optional[str] = None
+    value: Any = None
+
+
+class SearchResult(_Schema):
+    id: str
+    column1: Optional[SearchColumn] = None
+    column2: Optional[SearchColumn] = None
+    column3: Optional[SearchColumn] = None
+    column4: Optional[SearchColumn] = None
+
+    def fields(self) -> Dict[str, Any]:
+        """Returns the result's columns as {API field name: value}."""
+        columns = (self.column1, self.column2, self.column3, self.column4)
+        return {c.name: c.value for c in columns if c is not None and c.name}
+
+
+class SearchResultObject(_Schema):
+    objectName: Optional[str] = None
+    results: List[SearchResult] = []
+
+
+class SearchResults(_Schema):
+    """Raw (uncleaned) response of the 'search' endpoint."""
+    searchTerm: Optional[str] = None
+    resultObjects: List[SearchResultObject] = []
+
+
+class Comment(_Schema):
+    id: str
+    message: Optional[str] = None
+    relatedToId: Optional[str] = None
+    relatedToObject: Optional[str] = None
+    relatedToName: Optional[str] = None
+    inReplyToCommentId: Optional[str] = None
+    CreatedDate: Optional[str] = None
+
+
+class CommentPage(_Schema):
+    """Response of comment/search (fetch_comments)."""
+    metadata: Metadata = msgspec.field(default_factory=Metadata)
+    comments: List[Comment] = []
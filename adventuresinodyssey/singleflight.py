@@ -0,0 +1,150 @@
+"""
+Single-flight coalescing of identical in-flight calls.
+
+While a call for a key is running, further calls for the same key wait for it and
+receive its result (or its exception) instead of making their own. Once the call
+finishes, the next call for that key starts a new one; nothing is cached.
+
+With a SingleFlight on a client, identical idempotent requests (GETs, and POSTs to
+'.../search' endpoints, with the same URL, parameters, body and auth headers) share one
+upstream request. Each caller still decodes the shared response body itself, so every
+caller gets its own result to modify. Clients run on threads; asyncio code that calls
+them through asyncio.to_thread() or run_in_executor() is coalesced the same way.
+do_async() coalesces coroutines directly.
+"""
+
+import asyncio
+import json
+import threading
+from typing import Optional, Dict, Any, Callable, Hashable, Tuple, Awaitable
+
+from .deadline import DeadlineExceeded, current_deadline
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Map: key -> call in flight
+        self._calls: Dict[Hashable, _Call] = {}
+        # Map: (event loop, key) -> future of the coroutine in flight
+        self._async_calls: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+
+        self.calls = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def request_key(method: str, url: str, params: Any = None, payload: Any = None, headers: Any = None) -> Hashable:
+        """Builds a key identifying a request by method, URL, query parameters, JSON body and headers."""
+        def canonical(value: Any) -> Optional[str]:
+            if value is None:
+                return None
+            return json.dumps(value if not hasattr(value, 'items') else dict(value.items()), sort_keys=True, default=str)
+        return (method.upper(), url, canonical(params), canonical(payload), canonical(headers))
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Runs `func`, or waits for the identical call already running.
+
+        A waiting caller gives up when its own deadline (see adventuresinodyssey.deadline)
+        passes; the shared call carries on for the others. If the shared call fails because
+        the caller that started it ran out of time, waiters make the call again under their
+        own deadlines instead of sharing that DeadlineExceeded.
+
+        Returns:
+            Tuple[Any, bool]: The result, and True if it came from another caller's call.
+
+        Raises:
+            DeadlineExceeded: If the caller's deadline passes while waiting.
+            Exception: Whatever the shared call raised (other than the leader's DeadlineExceeded).
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if leader:
+            try:
+                call.result = func()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+                call.done.set()
+        else:
+            deadline = current_deadline()
+            if not call.done.wait(deadline.remaining() if deadline is not None else None):
+                raise DeadlineExceeded(f"Deadline of {deadline.seconds:.3g}s exceeded waiting for a shared request")
+
+        if call.error is not None:
+            if not leader and isinstance(call.error, DeadlineExceeded):
+                # The leader's deadline, not ours: try again (or join a newer call)
+                return self.do(key, func)
+            raise call.error
+        return call.result, not leader
+
+    async def do_async(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Awaits `func()`, or the identical coroutine already running on this event loop.
+
+        Returns:
+            Tuple[Any, bool]: The result, and True if it came from another caller's call.
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        future = self._async_calls.get(flight_key)
+        if future is not None:
+            with self._lock:
+                self.coalesced += 1
+            # Shield it, so a cancelled waiter doesn't cancel the call for everyone
+            try:
+                return await asyncio.shield(future), True
+            except DeadlineExceeded:
+                # The leader's deadline, not ours: try again (or join a newer call)
+                return await self.do_async(key, func)
+
+        future = loop.create_future()
+        self._async_calls[flight_key] = future
+        with self._lock:
+            self.calls += 1
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieve it, so a call nobody else waited for doesn't log "exception never retrieved"
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            self._async_calls.pop(flight_key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the number of calls made and calls coalesced into them."""
+        with self._lock:
+            total = self.calls + self.coalesced
+            return {
+                'calls': self.calls,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls) + len(self._async_calls),
+                'coalesced_rate': self.coalesced / total if total else 0.0,
+            }
@@ -0,0 +1,239 @@
+"""
+Catalog snapshots and change feeds.
+
+A CatalogSnapshot records a content hash for every episode and content grouping in the
+catalog. Diffing two snapshots gives the records added, removed and changed between them
+in one pass over each (linear time), so a scheduled refresh can hand downstream consumers
+only the deltas:
+
+    previous = CatalogSnapshot.load('catalog_snapshot.json')
+    current = client.snapshot_catalog()
+    for change in current.diff(previous).feed():
+        ...   # {'op': 'changed', 'kind': 'episode', 'id': 'a35...', 'hash': '...', 'record': {...}}
+    current.save('catalog_snapshot.json')
+
+Records:
+    'episode':  an episode as cache_episodes returns it (with 'album_id', the first grouping listing it)
+    'grouping': a content grouping from fetch_content_groupings, with 'episode_ids' in place of
+                its 'contentList', so reordered or re-filed episodes show up as a changed grouping
+
+Saved snapshots hold only the hashes; the records themselves are kept in memory by the
+snapshot that captured them, for its change feed.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Union, Iterator, Iterable
+
+from ._statefile import save_state, load_state
+from .episodes import grouping_episodes
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+KINDS = ('episode', 'grouping')
+
+
+def content_hash(record: Dict[str, Any]) -> str:
+    """Hashes a record's canonical JSON form, so equal records hash equally whatever their key order."""
+    canonical = json.dumps(record, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class CatalogDiff:
+    """
+    The records added, removed and changed between two snapshots.
+    """
+
+    def __init__(self, snapshot: "CatalogSnapshot", previous: Optional["CatalogSnapshot"] = None):
+        """
+        Args:
+            snapshot: The newer snapshot.
+            previous: Optional. The older snapshot. Without one, every record counts as added.
+        """
+        self.snapshot = snapshot
+        self.previous_taken_at = previous.taken_at if previous is not None else None
+        # Map: kind -> record IDs
+        self.added: Dict[str, List[str]] = {}
+        self.removed: Dict[str, List[str]] = {}
+        self.changed: Dict[str, List[str]] = {}
+
+        for kind in KINDS:
+            current = snapshot.hashes[kind]
+            old = previous.hashes.get(kind, {}) if previous is not None else {}
+            added, changed = [], []
+            for record_id, digest in current.items():
+                old_digest = old.get(record_id)
+                if old_digest is None:
+                    added.append(record_id)
+                elif old_digest != digest:
+                    changed.append(record_id)
+            self.added[kind] = added
+            self.changed[kind] = changed
+            self.removed[kind] = [record_id for record_id in old if record_id not in current]
+
+    def __len__(self) -> int:
+        return sum(len(ids[kind]) for ids in (self.added, self.removed, self.changed) for kind in KINDS)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """Returns the number of records added, removed and changed, per kind."""
+        return {kind: {'added': len(self.added[kind]), 'removed': len(self.removed[kind]), 'changed': len(self.changed[kind])}
+                for kind in KINDS}
+
+    def feed(self, include_records: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Yields one change per record: {'op', 'kind', 'id'}, plus the new 'hash' (and the 'record',
+        if the snapshot still holds it and include_records is True) for 'added' and 'changed'.
+        Groupings come after episodes, so a consumer has seen the episodes a grouping refers to.
+
+        Args:
+            include_records: If False, changes carry only IDs and hashes. Defaults to True.
+
+        Yields:
+            Dict[str, Any]: Change entries.
+        """
+        for kind in KINDS:
+            hashes = self.snapshot.hashes[kind]
+            records = self.snapshot.records[kind]
+            for op, ids in (('added', self.added[kind]), ('changed', self.changed[kind])):
+                for record_id in ids:
+                    change = {'op': op, 'kind': kind, 'id': record_id, 'hash': hashes[record_id]}
+                    if include_records and record_id in records:
+                        change['record'] = records[record_id]
+                    yield change
+            for record_id in self.removed[kind]:
+                yield {'op': 'removed', 'kind': kind, 'id': record_id}
+
+
+class CatalogSnapshot:
+    """
+    Content hashes of every episode and content grouping, keyed by record ID.
+    """
+
+    def __init__(self, taken_at: Optional[float] = None):
+        """
+        Args:
+            taken_at: Optional. When the snapshot was taken (epoch seconds). Defaults to now.
+        """
+        self.taken_at = taken_at if taken_at is not None else time.time()
+        # Map: kind -> record ID -> content hash
+        self.hashes: Dict[str, Dict[str, str]] = {kind: {} for kind in KINDS}
+        # Map: kind -> record ID -> record (only for snapshots captured in this process)
+        self.records: Dict[str, Dict[str, Dict[str, Any]]] = {kind: {} for kind in KINDS}
+
+    def __len__(self) -> int:
+        return sum(len(hashes) for hashes in self.hashes.values())
+
+    def add(self, kind: str, record: Dict[str, Any], keep_record: bool = True) -> Optional[str]:
+        """
+        Hashes a record into the snapshot. A record whose ID is already present is ignored
+        (the first one found wins, as in cache_episodes).
+
+        Args:
+            kind: 'episode' or 'grouping'.
+            record: The record, with an 'id'.
+            keep_record: If True, the record is kept for the change feed. Defaults to True.
+
+        Returns:
+            Optional[str]: The record's hash, or None if it was ignored.
+
+        Raises:
+            ValueError: If the kind is unknown.
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Unknown kind '{kind}'. Must be one of: {', '.join(KINDS)}.")
+        record_id = record.get('id')
+        if not record_id or record_id in self.hashes[kind]:
+            return None
+        digest = self.hashes[kind][record_id] = content_hash(record)
+        if keep_record:
+            self.records[kind][record_id] = record
+        return digest
+
+    def add_grouping(self, grouping: Dict[str, Any], grouping_type: str, include_bonus: bool = False,
+                     keep_records: bool = True) -> int:
+        """
+        Adds a content grouping (a 'contentGroupings' item) and the episodes it lists.
+
+        Returns:
+            int: The number of episodes not seen before.
+        """
+        if not grouping.get('id'):
+            # iter_groupings already skips (and logs) these
+            return 0
+
+        episode_ids = []
+        added = 0
+        # The same records cache_episodes yields
+        for episode in grouping_episodes(grouping, include_bonus):
+            if episode.get('id'):
+                episode_ids.append(episode['id'])
+            if self.add('episode', episode, keep_records) is not None:
+                added += 1
+
+        record = {key: value for key, value in grouping.items() if key != 'contentList'}
+        record.setdefault('type', grouping_type)
+        record['episode_ids'] = episode_ids
+        self.add('grouping', record, keep_records)
+        return added
+
+    @classmethod
+    def capture(cls, client, grouping_types: Iterable[str] = ('Album',), include_bonus: bool = False,
+                page_size: int = 100, concurrency: int = 1, keep_records: bool = True) -> "CatalogSnapshot":
+        """
+        Takes a snapshot of the catalog, paging through iter_groupings once per grouping type.
+
+        Args:
+            client: An AIOClient or ClubClient.
+            grouping_types: The grouping types to include. Defaults to ('Album',), the episodes
+                            cache_episodes returns.
+            include_bonus: If True, episodes starting with "BONUS" are included. Defaults to False.
+            page_size: Groupings per request. Defaults to 100.
+            concurrency: Pages fetched at once. Defaults to 1.
+            keep_records: If True, the records are kept for the change feed. Defaults to True.
+
+        Returns:
+            CatalogSnapshot: The snapshot.
+        """
+        snapshot = cls()
+        for grouping_type in grouping_types:
+            for grouping in client.iter_groupings(grouping_type, page_size=page_size, concurrency=concurrency):
+                snapshot.add_grouping(grouping, grouping_type, include_bonus, keep_records)
+        logger.info(f"Catalog snapshot: {len(snapshot.hashes['episode'])} episodes, "
+                    f"{len(snapshot.hashes['grouping'])} groupings.")
+        return snapshot
+
+    def diff(self, previous: Optional["CatalogSnapshot"] = None) -> CatalogDiff:
+        """Returns what was added, removed and changed since `previous` (everything, if None)."""
+        return CatalogDiff(self, previous)
+
+    # --- persistence ---
+
+    def save(self, path: Union[str, Path]):
+        """Writes the snapshot's hashes to a JSON file (atomically)."""
+        save_state(path, SNAPSHOT_VERSION, {'taken_at': self.taken_at, 'hashes': self.hashes})
+        logger.info(f"Saved catalog snapshot ({len(self)} records) to {path}")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Optional["CatalogSnapshot"]:
+        """
+        Loads a snapshot saved with save(). Returns None if the file does not exist or was
+        written by an incompatible version, so the next diff reports everything as added.
+        """
+        state = load_state(path, SNAPSHOT_VERSION, 'catalog snapshot')
+        if state is None:
+            return None
+
+        snapshot = cls(taken_at=state.get('taken_at'))
+        for kind, hashes in state.get('hashes', {}).items():
+            if kind in KINDS:
+                snapshot.hashes[kind] = hashes
+        logger.info(f"Loaded catalog snapshot ({len(snapshot)} records) from {path}")
+        return snapshot
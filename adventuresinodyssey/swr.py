@@ -0,0 +1,139 @@
+"""
+Stale-while-revalidate caching for landing-page endpoints.
+
+With a StaleWhileRevalidateCache on a client, fetch_home_playlists, fetch_carousel and
+fetch_radio answer from the last good response:
+
+* younger than `soft_ttl`: served as-is.
+* older than `soft_ttl`: served at once, and refreshed on a background thread.
+* older than `hard_ttl`: fetched again before returning (the caller waits).
+
+A failed background refresh keeps the old response, so upstream errors and slowness
+don't reach callers until the response is older than `hard_ttl`.
+"""
+
+import copy
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StaleWhileRevalidateCache:
+    """
+    In-memory cache that serves stale responses while refreshing them in the background.
+    """
+
+    def __init__(self, soft_ttl: float = 60.0, hard_ttl: float = 3600.0, max_workers: int = 2):
+        """
+        Args:
+            soft_ttl: Age in seconds after which a response is refreshed in the background. Defaults to 60.
+            hard_ttl: Age in seconds after which a response is no longer served. Defaults to 3600.
+            max_workers: Threads available for background refreshes. Defaults to 2.
+        """
+        if hard_ttl < soft_ttl:
+            raise ValueError("hard_ttl must not be shorter than soft_ttl.")
+
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+
+        self._lock = threading.Lock()
+        # Map: key -> (stored at, value)
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        # Keys with a background refresh in flight
+        self._refreshing: set = set()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='aio-swr')
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    def _store(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+
+    def _refresh(self, key: Hashable, load: Callable[[], Any], on_event: Optional[Callable[[str], None]]):
+        try:
+            self._store(key, load())
+            with self._lock:
+                self.refreshes += 1
+            logger.debug(f"Refreshed cached response for {key}.")
+        except Exception as e:
+            with self._lock:
+                self.refresh_errors += 1
+            if on_event:
+                on_event('swr_refresh_errors')
+            logger.warning(f"Background refresh of {key} failed; still serving the cached response: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get(self, key: Hashable, load: Callable[[], Any], on_event: Optional[Callable[[str], None]] = None) -> Any:
+        """
+        Returns the cached value for `key`, loading or refreshing it as its age requires.
+
+        Args:
+            key: Identifies the request (e.g., ('radio', 'aired', 1, 5)).
+            load: Fetches a fresh value. Called on this thread on a miss, otherwise in the background.
+            on_event: Optional. Called with 'swr_hits', 'swr_stale_hits', 'swr_misses' or 'swr_refresh_errors'.
+
+        Returns:
+            Any: A copy of the cached value, so callers may modify it.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            age = now - entry[0] if entry is not None else None
+            if age is None or age >= self.hard_ttl:
+                event = 'swr_misses'
+                self.misses += 1
+            elif age < self.soft_ttl:
+                event = 'swr_hits'
+                self.hits += 1
+            else:
+                event = 'swr_stale_hits'
+                self.stale_hits += 1
+                refresh = key not in self._refreshing
+                if refresh:
+                    self._refreshing.add(key)
+
+        if on_event:
+            on_event(event)
+
+        if event == 'swr_misses':
+            value = load()
+            self._store(key, value)
+            return copy.deepcopy(value)
+
+        if event == 'swr_stale_hits' and refresh:
+            self._executor.submit(self._refresh, key, load, on_event)
+        return copy.deepcopy(entry[1])
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drops one cached response, or all of them."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit, miss and refresh counters."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'refreshes': self.refreshes,
+                'refresh_errors': self.refresh_errors,
+            }
+
+    def close(self):
+        """Shuts down the refresh threads."""
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,145 @@
+"""
+Shared token storage for ClubClient sessions.
+
+A token store holds the refresh token, access token, viewer ID and PIN, and provides
+an inter-process lock. ClubClient takes the lock around refreshes and logins, and
+re-reads the store inside it, so N worker processes sharing a store perform a single
+refresh (or login) between them and adopt each other's access tokens instead of
+rotating the refresh token out from under one another.
+
+Backends:
+* FileTokenStore: a JSON file (the classic 'club_session.json'), written atomically.
+* SQLiteTokenStore: a row in a SQLite database, so one file can hold several accounts.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager, closing
+from pathlib import Path
+from typing import Dict, Any, Iterator, Union
+
+from ._atomicwrite import atomic_write
+from ._filelock import FileLock
+
+logger = logging.getLogger(__name__)
+
+
+class TokenStore:
+    """
+    Base token store. Subclasses implement load(), save() and lock().
+    """
+
+    def load(self) -> Dict[str, Any]:
+        """Returns the stored session state, or an empty dict if there is none."""
+        raise NotImplementedError
+
+    def save(self, state: Dict[str, Any]):
+        """Replaces the stored session state."""
+        raise NotImplementedError
+
+    def lock(self):
+        """Returns a context manager holding an exclusive inter-process lock on the store."""
+        raise NotImplementedError
+
+
+class FileTokenStore(TokenStore):
+    """
+    Stores the session state in a JSON file.
+
+    Writes go to a temporary file that is then renamed over the original, so readers
+    never see a half-written file. The lock is a separate '<path>.lock' file.
+    """
+
+    def __init__(self, path: Union[str, Path] = 'club_session.json'):
+        """
+        Args:
+            path: The session file. Defaults to 'club_session.json'.
+        """
+        self.path = Path(path)
+        self._lock = FileLock(self.path.with_name(self.path.name + '.lock'))
+
+    def load(self) -> Dict[str, Any]:
+        try:
+            with self.path.open('r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def save(self, state: Dict[str, Any]):
+        atomic_write(self.path, json.dumps(state, indent=4), fsync=True)
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        with self._lock:
+            yield
+
+
+class SQLiteTokenStore(TokenStore):
+    """
+    Stores the session state as a row in a SQLite database.
+
+    Several accounts can share one database by using different `key`s. The lock is
+    an IMMEDIATE transaction, which SQLite serializes across processes.
+    """
+
+    def __init__(self, path: Union[str, Path] = 'club_session.db', key: str = 'default', timeout: float = 60.0):
+        """
+        Args:
+            path: The database file. Defaults to 'club_session.db'.
+            key: The row to use, e.g. the account email. Defaults to 'default'.
+            timeout: Seconds to wait for another process's lock. Defaults to 60.
+        """
+        self.path = Path(path)
+        self.key = key
+        self.timeout = timeout
+        # Connection holding the lock, per thread, so load/save inside lock() join its transaction
+        self._local = threading.local()
+
+        with closing(self._connect()) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS sessions (key TEXT PRIMARY KEY, state TEXT NOT NULL, updated_at REAL NOT NULL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.path), timeout=self.timeout, isolation_level=None)
+
+    def load(self) -> Dict[str, Any]:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            row = conn.execute("SELECT state FROM sessions WHERE key = ?", (self.key,)).fetchone()
+        else:
+            with closing(self._connect()) as conn:
+                row = conn.execute("SELECT state FROM sessions WHERE key = ?", (self.key,)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def save(self, state: Dict[str, Any]):
+        query = "INSERT OR REPLACE INTO sessions (key, state, updated_at) VALUES (?, ?, ?)"
+        params = (self.key, json.dumps(state), time.time())
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.execute(query, params)
+        else:
+            with closing(self._connect()) as conn:
+                conn.execute(query, params)
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        if getattr(self._local, 'conn', None) is not None:
+            # Re-entrant: already inside this thread's transaction
+            yield
+            return
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.conn = conn
+        try:
+            yield
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._local.conn = None
+            conn.close()
@@ -0,0 +1,248 @@
+"""
+Tracing hooks for the clients.
+
+With a tracer on a client, every public method call opens a span ('aio.<method>'), and
+the work underneath it opens nested spans tagged with the phase the time went to
+(attribute 'aio.phase'):
+
+    auth         ensure_authenticated (and the introspect/refresh requests under it)
+    network      one span per HTTP request ('GET content/{id}'), hedges and retries included
+    decode       JSON decoding of a response body
+    postprocess  reshaping decoded data (search result cleanup, content projections)
+
+Client methods get their span from the @traced decorator; @traced(phase='auth') marks
+ensure_authenticated's time as auth. The default NoOpTracer does nothing. OpenTelemetryTracer sends the spans to
+OpenTelemetry (pip install opentelemetry-api, plus an SDK/exporter to see them).
+RecordingTracer keeps them in memory and adds up the time spent in each phase.
+"""
+
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, Iterator, Callable
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:
+    otel_trace = None
+
+PHASE_ATTRIBUTE = 'aio.phase'
+PHASES = ('auth', 'network', 'decode', 'postprocess')
+
+
+class Span:
+    """A span handle. The base class ignores everything."""
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def record_exception(self, error: BaseException):
+        pass
+
+
+_NOOP_SPAN = Span()
+
+
+class Tracer:
+    """
+    Base tracer; also the no-op default. Subclasses override span().
+    """
+
+    enabled = False
+
+    @contextmanager
+    def span(self, name: str, phase: Optional[str] = None, **attributes: Any) -> Iterator[Span]:
+        """
+        Opens a span around a block.
+
+        Args:
+            name: The span name (e.g., 'aio.search_all', 'GET content/{id}').
+            phase: Optional. One of PHASES, recorded as the 'aio.phase' attribute.
+            **attributes: Span attributes (None values are dropped).
+        """
+        yield _NOOP_SPAN
+
+
+class NoOpTracer(Tracer):
+    """Tracer that records nothing (the default)."""
+
+
+def _clean(phase: Optional[str], attributes: Dict[str, Any]) -> Dict[str, Any]:
+    cleaned = {key: value for key, value in attributes.items() if value is not None}
+    if phase:
+        cleaned[PHASE_ATTRIBUTE] = phase
+    return cleaned
+
+
+def traced(func: Optional[Callable] = None, *, phase: Optional[str] = None, name: Optional[str] = None) -> Callable:
+    """
+    Decorator running a client method in a span ('aio.<method>' unless `name` is given) when
+    the client's tracer is enabled. Not for generators: a span kept current across a yield
+    would also cover the consumer's work, so generators open a span per page instead.
+
+    Args:
+        phase: Optional. One of PHASES, for methods whose time belongs to a phase (e.g. 'auth').
+        name: Optional. The span name. Defaults to 'aio.<method name>'.
+    """
+    def decorate(func: Callable) -> Callable:
+        span_name = name or f"aio.{func.__name__}"
+        if inspect.isgeneratorfunction(func):
+            raise TypeError(f"@traced can't wrap the generator {func.__name__}(); open a span per page inside it instead.")
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            tracer = getattr(self, 'tracer', None)
+            if tracer is None or not tracer.enabled:
+                return func(self, *args, **kwargs)
+            with tracer.span(span_name, phase=phase):
+                return func(self, *args, **kwargs)
+        return wrapper
+
+    return decorate(func) if func is not None else decorate
+
+
+class _OTelSpan(Span):
+    def __init__(self, span):
+        self._span = span
+
+    def set_attribute(self, key: str, value: Any):
+        if value is not None:
+            self._span.set_attribute(key, value)
+
+    def record_exception(self, error: BaseException):
+        self._span.record_exception(error)
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    Tracer that creates OpenTelemetry spans. Requires opentelemetry-api.
+    """
+
+    enabled = True
+
+    def __init__(self, tracer=None, name: str = 'adventuresinodyssey'):
+        """
+        Args:
+            tracer: Optional. An opentelemetry.trace.Tracer. Defaults to trace.get_tracer(name)
+                    from the globally configured TracerProvider.
+            name: The instrumentation name used when no tracer is given.
+        """
+        if otel_trace is None:
+            raise ImportError("OpenTelemetryTracer requires opentelemetry-api. Install it with: pip install opentelemetry-api")
+        self._tracer = tracer or otel_trace.get_tracer(name)
+
+    @contextmanager
+    def span(self, name: str, phase: Optional[str] = None, **attributes: Any) -> Iterator[Span]:
+        # start_as_current_span records exceptions and sets the error status itself
+        with self._tracer.start_as_current_span(name, attributes=_clean(phase, attributes)) as span:
+            yield _OTelSpan(span)
+
+
+class _RecordedSpan(Span):
+    def __init__(self, record: Dict[str, Any]):
+        self.record = record
+
+    def set_attribute(self, key: str, value: Any):
+        if value is not None:
+            self.record['attributes'][key] = value
+
+    def record_exception(self, error: BaseException):
+        self.record['error'] = repr(error)
+
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar('aio_recorded_span', default=None)
+
+
+class RecordingTracer(Tracer):
+    """
+    Tracer that keeps finished spans in memory, for profiling and tests.
+
+    Each span is a dict: {'id', 'parent', 'name', 'phase', 'start', 'duration', 'attributes', 'error'}.
+    """
+
+    enabled = True
+
+    def __init__(self, max_spans: int = 10000):
+        """
+        Args:
+            max_spans: Spans kept; older ones are dropped first. Defaults to 10000.
+        """
+        self.max_spans = max_spans
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    @contextmanager
+    def span(self, name: str, phase: Optional[str] = None, **attributes: Any) -> Iterator[Span]:
+        with self._lock:
+            self._next_id += 1
+            span_id = self._next_id
+        parent = _current_span.get()
+        record = {
+            'id': span_id,
+            'parent': parent,
+            'name': name,
+            'phase': phase,
+            'start': time.time(),
+            'duration': None,
+            'attributes': _clean(None, attributes),
+            'error': None,
+        }
+        token = _current_span.set(span_id)
+        start = time.perf_counter()
+        handle = _RecordedSpan(record)
+        try:
+            yield handle
+        except BaseException as e:
+            handle.record_exception(e)
+            raise
+        finally:
+            record['duration'] = time.perf_counter() - start
+            _current_span.reset(token)
+            with self._lock:
+                self.spans.append(record)
+                if len(self.spans) > self.max_spans:
+                    del self.spans[:len(self.spans) - self.max_spans]
+
+    def clear(self):
+        with self._lock:
+            self.spans.clear()
+
+    def phase_totals(self, root: Optional[int] = None) -> Dict[str, float]:
+        """
+        Adds up the time spent in each phase: each span's own time, minus its children's,
+        goes to the outermost phase among it and its ancestors, so the requests made while
+        authenticating count as 'auth'. Time outside any phase is 'other'.
+
+        Args:
+            root: Optional. Only count this span (a span 'id') and its descendants.
+
+        Returns:
+            Dict[str, float]: Seconds per phase.
+        """
+        with self._lock:
+            spans = {span['id']: span for span in self.spans}
+
+        children_time: Dict[int, float] = {}
+        for span in spans.values():
+            if span['parent'] in spans:
+                children_time[span['parent']] = children_time.get(span['parent'], 0.0) + span['duration']
+
+        def lineage(span: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+            while span is not None:
+                yield span
+                span = spans.get(span['parent'])
+
+        totals = {phase: 0.0 for phase in PHASES}
+        totals['other'] = 0.0
+        for span in spans.values():
+            chain = list(lineage(span))
+            if root is not None and all(s['id'] != root for s in chain):
+                continue
+            phase = next((s['phase'] for s in reversed(chain) if s['phase']), 'other')
+            # Work on threads of its own (e.g. hedges) can overlap its parent; don't go negative
+            totals[phase] += max(0.0, span['duration'] - children_time.get(span['id'], 0.0))
+        return totals
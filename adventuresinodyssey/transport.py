@@ -0,0 +1,342 @@
+"""
+Pluggable HTTP transports for the Adventures in Odyssey API clients.
+
+The clients send every request through a Transport (see AIOClient._request):
+
+* LiveTransport: talks to the API over the network (the default).
+* RecordingTransport: talks to the API and appends each request -> response pair to a cassette file.
+* ReplayTransport: serves responses from a cassette with zero network access,
+  optionally simulating latency. Useful offline and for deterministic load tests.
+* HTTP2Transport: multiplexes concurrent requests over a single HTTP/2 connection
+  (requires httpx with HTTP/2 support: pip install httpx[http2]).
+
+Cassettes are JSON Lines files (gzip-compressed if the name ends in '.gz'). Secrets such
+as tokens and the client secret are stripped from recorded URLs and ignored when matching.
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterable, Union
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that are never written to a cassette or used for matching
+SENSITIVE_PARAMS = ('client_secret', 'client_id', 'refresh_token', 'token', 'code')
+
+# Connection-specific headers that must not be sent over HTTP/2
+HOP_BY_HOP_HEADERS = ('connection', 'keep-alive', 'proxy-connection', 'transfer-encoding', 'upgrade')
+
+# Response headers kept in a cassette (everything else is dropped to keep it compact)
+RECORDED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Date', 'Expires', 'Age', 'Vary')
+
+
+class CassetteMissError(LookupError):
+    """Raised by ReplayTransport when a request has no recorded response."""
+
+
+def _open_cassette(path: Path, mode: str):
+    if path.suffix == '.gz':
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return path.open(mode, encoding='utf-8')
+
+
+def request_key(method: str, url: str, params: Optional[Dict[str, Any]] = None, json_body: Any = None,
+                data: Any = None, ignore_params: Iterable[str] = SENSITIVE_PARAMS) -> str:
+    """
+    Builds the matching key for a request: method, URL with sorted query parameters
+    (sensitive ones removed) and a short hash of the body.
+
+    Returns:
+        str: e.g. 'POST https://.../contentgrouping/search #1f2e3d4c5b6a7988'
+    """
+    parsed = urlparse(url)
+    query = parse_qsl(parsed.query, keep_blank_values=True)
+    if params:
+        query.extend((k, str(v)) for k, v in params.items() if v is not None)
+    ignored = set(ignore_params)
+    query = sorted((k, v) for k, v in query if k not in ignored)
+    canonical_url = urlunparse(parsed._replace(query=urlencode(query)))
+
+    key = f"{method.upper()} {canonical_url}"
+
+    if json_body is not None:
+        body = json.dumps(json_body, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    elif data is not None:
+        body = data.encode('utf-8') if isinstance(data, str) else bytes(data)
+    else:
+        body = None
+    if body:
+        key += ' #' + hashlib.sha1(body).hexdigest()[:16]
+    return key
+
+
+def build_response(status: int, body: bytes, headers: Optional[Dict[str, str]] = None, url: str = '', reason: str = '') -> requests.Response:
+    """Builds a requests.Response from raw parts, for transports that don't use requests."""
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.url = url
+    response.reason = reason or ('OK' if status < 400 else 'Error')
+    response.encoding = 'utf-8'
+    return response
+
+
+class Transport:
+    """
+    Base transport. Subclasses override send().
+    """
+
+    def send(self, session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Sends one request.
+
+        Args:
+            session: The client's session (supplies default headers and connection pooling).
+            method: The HTTP method.
+            url: The absolute URL.
+            **kwargs: requests keyword arguments (params, json, data, headers, timeout).
+
+        Returns:
+            requests.Response: The response.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Releases any resources held by the transport."""
+
+
+class LiveTransport(Transport):
+    """Sends requests over the network with the client's requests.Session."""
+
+    def send(self, session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
+        return session.request(method, url, **kwargs)
+
+
+class HTTP2Transport(Transport):
+    """
+    Sends requests with a shared httpx client over HTTP/2.
+
+    All concurrent requests to the API host are multiplexed as streams over one
+    connection, instead of one TCP+TLS connection per in-flight request. Share a
+    single instance between clients (e.g., an AIOClient and a ClubClient) so the
+    authenticated and unauthenticated paths use the same connection. The client's
+    requests.Session only supplies default headers.
+    """
+
+    def __init__(self, max_connections: int = 100, keepalive_expiry: float = 60.0, http2: bool = True):
+        """
+        Args:
+            max_connections: Upper bound on open connections. Over HTTP/2 a single connection per host
+                             carries all streams; the bound only matters if a server falls back to
+                             HTTP/1.1. Defaults to 100.
+            keepalive_expiry: Seconds an idle connection is kept open. Defaults to 60.
+            http2: Negotiate HTTP/2 (default). Set False to use httpx over HTTP/1.1.
+        """
+        if httpx is None:
+            raise ImportError("HTTP2Transport requires httpx with HTTP/2 support. Install it with: pip install httpx[http2]")
+
+        self.client = httpx.Client(
+            http2=http2,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections, keepalive_expiry=keepalive_expiry),
+        )
+
+    def send(self, session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
+        headers = {k: v for k, v in session.headers.items() if k.lower() not in HOP_BY_HOP_HEADERS}
+        for k, v in (kwargs.get('headers') or {}).items():
+            if k.lower() not in HOP_BY_HOP_HEADERS:
+                headers[k] = v
+
+        timeout = kwargs.get('timeout')
+        try:
+            response = self.client.request(
+                method, url,
+                params=kwargs.get('params'),
+                json=kwargs.get('json'),
+                content=kwargs.get('data'),
+                headers=headers,
+                timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+            )
+        # Surface requests exceptions so callers' existing error handling keeps working
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+        return build_response(response.status_code, response.content, dict(response.headers), str(response.url), response.reason_phrase)
+
+    def close(self):
+        self.client.close()
+
+
+class RecordingTransport(Transport):
+    """
+    Sends requests with an inner transport and appends every exchange to a cassette.
+    """
+
+    def __init__(self, cassette: Union[str, Path], inner: Optional[Transport] = None, ignore_params: Iterable[str] = SENSITIVE_PARAMS):
+        """
+        Args:
+            cassette: Path of the cassette file to append to ('.gz' for gzip).
+            inner: Optional. The transport that performs the requests. Defaults to LiveTransport().
+            ignore_params: Query parameters stripped from recordings and matching keys.
+        """
+        self.path = Path(cassette)
+        self.inner = inner or LiveTransport()
+        self.ignore_params = tuple(ignore_params)
+        self._lock = threading.Lock()
+        self._file = None
+
+    def send(self, session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
+        start = time.perf_counter()
+        response = self.inner.send(session, method, url, **kwargs)
+        elapsed = time.perf_counter() - start
+
+        key = request_key(method, url, kwargs.get('params'), kwargs.get('json'), kwargs.get('data'), self.ignore_params)
+        body = response.content or b''
+        try:
+            entry_body = {'text': body.decode('utf-8')}
+        except UnicodeDecodeError:
+            entry_body = {'base64': base64.b64encode(body).decode('ascii')}
+
+        entry = {
+            'key': key,
+            'status': response.status_code,
+            'headers': {h: response.headers[h] for h in RECORDED_HEADERS if h in response.headers},
+            'elapsed': round(elapsed, 4),
+            **entry_body,
+        }
+
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = _open_cassette(self.path, 'a')
+            self._file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+            self._file.flush()
+
+        return response
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class ReplayTransport(Transport):
+    """
+    Serves responses from a cassette without touching the network.
+
+    Requests are matched by request_key(). If the same request was recorded several
+    times, the recordings are served in order and the last one repeats.
+    """
+
+    def __init__(self, cassette: Union[str, Path], latency: Union[float, str, None] = None, strict: bool = True,
+                 ignore_params: Iterable[str] = SENSITIVE_PARAMS):
+        """
+        Args:
+            cassette: Path of the cassette file to replay.
+            latency: Optional. None (default) for no delay, a number of seconds to add to
+                     every response, or 'recorded' to replay each response's recorded latency.
+            strict: If True (default), unmatched requests raise CassetteMissError.
+                    If False, they get a 404 response.
+            ignore_params: Query parameters ignored when matching (must match the recording).
+        """
+        if isinstance(latency, str) and latency != 'recorded':
+            raise ValueError(f"Invalid latency '{latency}'. Must be a number, None or 'recorded'.")
+
+        self.path = Path(cassette)
+        self.latency = latency
+        self.strict = strict
+        self.ignore_params = tuple(ignore_params)
+        self._lock = threading.Lock()
+        # Map: request key -> list of (status, body, headers, elapsed)
+        self._index: Dict[str, List[tuple]] = {}
+        # Map: request key -> index of the next recording to serve
+        self._cursors: Dict[str, int] = {}
+        self._load()
+
+    def _load(self):
+        with _open_cassette(self.path, 'r') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if 'base64' in entry:
+                    body = base64.b64decode(entry['base64'])
+                else:
+                    body = entry.get('text', '').encode('utf-8')
+                self._index.setdefault(entry['key'], []).append(
+                    (entry['status'], body, entry.get('headers', {}), entry.get('elapsed', 0.0))
+                )
+        logger.info(f"Loaded {sum(len(v) for v in self._index.values())} recorded responses from {self.path}")
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def send(self, session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
+        key = request_key(method, url, kwargs.get('params'), kwargs.get('json'), kwargs.get('data'), self.ignore_params)
+
+        recordings = self._index.get(key)
+        if not recordings:
+            if self.strict:
+                raise CassetteMissError(f"No recorded response for: {key}")
+            logger.warning(f"No recorded response for: {key}")
+            return build_response(404, b'{}', {'Content-Type': 'application/json'}, url, 'Not Recorded')
+
+        with self._lock:
+            position = self._cursors.get(key, 0)
+            self._cursors[key] = min(position + 1, len(recordings) - 1)
+        status, body, headers, elapsed = recordings[position]
+
+        if self.latency == 'recorded':
+            time.sleep(elapsed)
+        elif self.latency:
+            time.sleep(self.latency)
+
+        return build_response(status, body, headers, url)
+
+    def rewind(self):
+        """Restarts every request's recordings from the first one."""
+        with self._lock:
+            self._cursors.clear()
+
+
+def create_transport(mode: str = 'live', cassette: Union[str, Path, None] = None, **kwargs) -> Transport:
+    """
+    Creates a transport for one of the three modes.
+
+    Args:
+        mode: 'live' (default), 'http2', 'record' or 'replay'.
+        cassette: The cassette path. Required for 'record' and 'replay'.
+        **kwargs: Passed to the transport class (e.g., latency=0.05 for replay).
+
+    Returns:
+        Transport: The transport to pass to a client's `transport` argument.
+    """
+    if mode == 'live':
+        return LiveTransport()
+    if mode == 'http2':
+        return HTTP2Transport(**kwargs)
+    if mode not in ('record', 'replay'):
+        raise ValueError(f"Invalid mode '{mode}'. Must be 'live', 'http2', 'record' or 'replay'.")
+    if cassette is None:
+        raise ValueError(f"A cassette path is required for '{mode}' mode.")
+    if mode == 'record':
+        return RecordingTransport(cassette, **kwargs)
+    return ReplayTransport(cassette, **kwargs)
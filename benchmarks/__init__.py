@@ -0,0 +1,3 @@
+"""
+Benchmarks for the adventuresinodyssey clients. Run with `python -m benchmarks.run`.
+"""
@@ -0,0 +1,83 @@
+"""
+Decoding benchmark: stdlib json vs orjson vs msgspec (generic and typed schemas).
+
+Usage (from the repository root):
+
+    python -m benchmarks.decode
+    python -m benchmarks.decode --page-size 100 --repeat 200
+
+Payloads are a contentgrouping/search page (page_size groupings, each with a nested
+contentList), a content/{id} page, and a comment/search page, generated by FakeCatalog.
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Optional, Dict, Any, List, Callable, Tuple
+
+from adventuresinodyssey.decoding import JSONDecoder, orjson, msgspec
+from .fake_server import FakeCatalog
+
+
+def build_payloads(page_size: int) -> Dict[str, Tuple[bytes, str]]:
+    catalog = FakeCatalog(albums=page_size, episodes_per_album=12, comments=page_size)
+    content = next(iter(catalog.episodes.values()))
+    payloads: Dict[str, Tuple[Any, str]] = {
+        'grouping_page': ({'metadata': {'totalPageCount': 5}, 'errors': [], 'contentGroupings': catalog.albums}, 'GroupingPage'),
+        'content': (content, 'Content'),
+        'comment_page': ({'metadata': {'totalPageCount': 1}, 'comments': catalog.comments}, 'CommentPage'),
+    }
+    return {name: (json.dumps(body).encode('utf-8'), schema) for name, (body, schema) in payloads.items()}
+
+
+def time_decoder(decode: Callable[[bytes], Any], body: bytes, repeat: int) -> float:
+    """Returns the best per-call time in microseconds over `repeat` calls."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        decode(body)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark JSON decoding backends on typical API payloads.")
+    parser.add_argument('--page-size', type=int, default=100, help="Groupings per grouping page.")
+    parser.add_argument('--repeat', type=int, default=100, help="Calls per measurement.")
+    args = parser.parse_args(argv)
+
+    backends: List[Tuple[str, Callable[[bytes, str], Any]]] = [('json', lambda b, s: JSONDecoder().decode(b))]
+    if orjson is not None:
+        backends.append(('orjson', lambda b, s: orjson.loads(b)))
+    if msgspec is not None:
+        from adventuresinodyssey import schemas
+        generic = msgspec.json.Decoder()
+        typed = {}
+
+        def decode_typed(body: bytes, schema_name: str):
+            decoder = typed.get(schema_name)
+            if decoder is None:
+                decoder = typed[schema_name] = msgspec.json.Decoder(getattr(schemas, schema_name))
+            return decoder.decode(body)
+
+        backends.append(('msgspec', lambda b, s: generic.decode(b)))
+        backends.append(('msgspec typed', decode_typed))
+
+    payloads = build_payloads(args.page_size)
+
+    header = f"{'payload':<16}{'bytes':>10}" + ''.join(f"{name:>16}" for name, _ in backends) + f"{'speedup':>10}"
+    print(header)
+    print('-' * len(header))
+    for name, (body, schema_name) in payloads.items():
+        timings = [time_decoder(lambda b: decode(b, schema_name), body, args.repeat) for _, decode in backends]
+        cells = ''.join(f"{t:>14.1f}us" for t in timings)
+        print(f"{name:<16}{len(body):>10}{cells}{timings[0] / min(timings):>9.1f}x")
+
+    if msgspec is None:
+        print("\nmsgspec is not installed; typed schemas were skipped (pip install msgspec).")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
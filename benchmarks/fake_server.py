@@ -0,0 +1,404 @@
+"""
+Local stand-in for the Adventures in Odyssey 'apexrest/v1' API, used by the benchmarks.
+
+Serves a deterministic, generated catalog over plain HTTP with configurable latency,
+jitter and error injection. Point a client at it with:
+
+    server = FakeAIOServer(latency=0.02, jitter=0.01).start()
+    client = AIOClient()
+    client.config['api_base'] = server.api_base
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Any, List
+from urllib.parse import urlparse, parse_qs
+
+SERVICES_PREFIX = '/aio/services/'
+API_PREFIX = SERVICES_PREFIX + 'apexrest/v1/'
+
+# Responses sent with an ETag (content, content groupings and the grouping search)
+VALIDATED_PATH = re.compile(r'/apexrest/v1/(content/[A-Za-z0-9]{18}|contentgrouping/([A-Za-z0-9]{18}|search))$')
+
+
+def make_id(prefix: str, number: int) -> str:
+    """Builds an 18-character Salesforce-style record ID."""
+    return f"{prefix}{number:0{18 - len(prefix)}d}"
+
+
+class FakeCatalog:
+    """Deterministic catalog of albums, episodes and comments."""
+
+    def __init__(self, albums: int = 250, episodes_per_album: int = 12, comments: int = 500, seed: int = 1):
+        rng = random.Random(seed)
+        self.albums: List[Dict[str, Any]] = []
+        self.episodes: Dict[str, Dict[str, Any]] = {}
+
+        episode_number = 0
+        for a in range(albums):
+            album_id = make_id('a31Uh', a)
+            content_list = []
+            for _ in range(episodes_per_album):
+                episode_number += 1
+                episode_id = make_id('a354W', episode_number)
+                name = f"BONUS: Extra {episode_number}" if episode_number % 25 == 0 else f"Episode {episode_number}"
+                summary = {
+                    'id': episode_id,
+                    'name': name,
+                    'short_name': name,
+                    'episode_number': str(episode_number),
+                    'thumbnail_small': f"https://media.example.com/thumbs/{episode_id}.jpg",
+                    'subtype': 'Episode',
+                }
+                content_list.append(summary)
+                self.episodes[episode_id] = {
+                    **summary,
+                    'long_name': f"#{episode_number}: {name}",
+                    'description': ' '.join(rng.choice(['Whit', 'Connie', 'Eugene', 'Odyssey', 'adventure', 'faith']) for _ in range(60)),
+                    'download_url': f"https://media.example.com/audio/{episode_id}.mp3",
+                    'signed_cookie': "https://media.example.com/*?Policy=abc&Signature=def&Key-Pair-Id=ghi",
+                    'air_date': f"20{10 + episode_number % 15}-0{1 + episode_number % 9}-1{episode_number % 9}",
+                    'album_id': album_id,
+                    'tags': [{'id': make_id('a3H4W', episode_number % 40), 'name': f"Theme {episode_number % 40}"}],
+                    'characters': [{'id': make_id('a2t4W', episode_number % 30), 'name': f"Character {episode_number % 30}"}],
+                    'authors': [{'id': make_id('a2s4W', episode_number % 20), 'name': f"Author {episode_number % 20}"}],
+                    'recommendations': [{'id': make_id('a354W', (episode_number + k) % max(1, albums * episodes_per_album) + 1)} for k in range(1, 6)],
+                }
+            self.albums.append({
+                'id': album_id,
+                'name': f"Album {a + 1}",
+                'type': 'Album',
+                'image_url': f"https://media.example.com/albums/{album_id}.jpg",
+                'contentList': content_list,
+            })
+
+        # Characters, authors and topics referenced by the episodes, as their search endpoints list them
+        self.people: Dict[str, List[Dict[str, Any]]] = {}
+        for key, field in (('characters', 'characters'), ('authors', 'authors'), ('topics', 'tags')):
+            seen: Dict[str, Dict[str, Any]] = {}
+            for episode in self.episodes.values():
+                for ref in episode[field]:
+                    seen.setdefault(ref['id'], {'id': ref['id'], 'name': ref['name']})
+            self.people[key] = sorted(seen.values(), key=lambda e: e['id'])
+
+        episode_ids = list(self.episodes)
+        self.comments: List[Dict[str, Any]] = []
+        for c in range(comments):
+            comment_id = make_id('a0xUh', c + 1)
+            if c > 10 and rng.random() < 0.4:
+                parent = rng.choice(self.comments)
+                comment = {'relatedToObject': 'Comment', 'relatedToId': parent['id'], 'inReplyToCommentId': parent['id']}
+            else:
+                page_id = rng.choice(episode_ids)
+                comment = {'relatedToObject': 'Content__c', 'relatedToId': page_id, 'relatedToName': self.episodes[page_id]['name']}
+            comment.update({
+                'id': comment_id,
+                'message': f"Comment {c + 1}",
+                'CreatedDate': f"2024-01-01T00:{c // 60:02d}:{c % 60:02d}.000Z",
+            })
+            self.comments.append(comment)
+        # The API returns comments newest first
+        self.comments.reverse()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = 'FakeAIO/1.0'
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without this, delayed ACKs add ~40ms per request
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    # --- helpers ---
+
+    def _send_json(self, status: int, body: Any, validate: bool = False):
+        data = json.dumps(body).encode('utf-8')
+        etag = None
+        if validate and status == 200:
+            # Content and groupings carry a validator; an unchanged one is answered with a bodiless 304
+            etag = '"' + hashlib.sha1(data).hexdigest()[:20] + '"'
+            if self.headers.get('If-None-Match') == etag:
+                status, data = 304, b''
+        self.server.fake.count_bytes(len(data))
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        if etag is not None:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'private, no-cache')
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up on the request (e.g., its deadline passed)
+            self.close_connection = True
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return {}
+
+    def _dispatch(self, method: str):
+        fake: FakeAIOServer = self.server.fake
+        parsed = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        body = self._read_json() if method in ('POST', 'PUT') else {}
+
+        fake.count_request(parsed.path)
+        fake.sleep()
+
+        if fake.should_fail():
+            self._send_json(503, {'errors': ['injected failure']})
+            return
+
+        if parsed.path.startswith(API_PREFIX) and fake.auth_required and 'Authorization' in self.headers:
+            if self.headers['Authorization'] != f"Bearer {fake.access_token}":
+                self._send_json(401, [{'errorCode': 'INVALID_SESSION_ID'}])
+                return
+
+        status, payload = fake.route(method, parsed.path, query, body)
+        self._send_json(status, payload, validate=bool(VALIDATED_PATH.search(parsed.path)))
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+
+class FakeAIOServer:
+    """
+    Threaded local HTTP server that imitates the endpoints the clients use.
+
+    Supported: contentgrouping/search, contentgrouping/{id}, content/{id}, content/search,
+    search, comment/search, character/author/topic search and detail, viewer, viewer/home,
+    oauth2/token and oauth2/introspect.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, catalog: Optional[FakeCatalog] = None, seed: int = 1,
+                 tail_rate: float = 0.0, tail_latency: float = 1.0):
+        """
+        Args:
+            host: Interface to bind. Defaults to 127.0.0.1.
+            port: Port to bind. Defaults to 0 (any free port).
+            latency: Base delay in seconds added to every response.
+            jitter: Extra uniformly random delay (0..jitter seconds) added to every response.
+            error_rate: Fraction (0..1) of requests answered with an injected 503.
+            catalog: Optional. The catalog to serve. Defaults to FakeCatalog().
+            seed: Seed for jitter and error injection.
+            tail_rate: Fraction (0..1) of requests that are slow, to simulate tail latency.
+            tail_latency: Extra delay in seconds for those slow requests. Defaults to 1.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.error_rate = error_rate
+        self.catalog = catalog or FakeCatalog()
+        self.access_token = 'fake-access-token-1'
+        self.refresh_token = 'fake-refresh-token'
+        self.auth_required = True
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.request_counts: Dict[str, int] = {}
+        self.bytes_sent = 0
+        self.mutations = 0
+
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_base(self) -> str:
+        """Value to use for a client's config['api_base']."""
+        return self.url + SERVICES_PREFIX
+
+    def start(self) -> "FakeAIOServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeAIOServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- behaviour knobs ---
+
+    def count_request(self, path: str):
+        key = re.sub(r'/[A-Za-z0-9]{18}(?=/|$)', '/{id}', path)
+        with self._lock:
+            self.request_counts[key] = self.request_counts.get(key, 0) + 1
+
+    def count_bytes(self, size: int):
+        with self._lock:
+            self.bytes_sent += size
+
+    def sleep(self):
+        with self._lock:
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            if self.tail_rate and self._rng.random() < self.tail_rate:
+                delay += self.tail_latency
+        if delay > 0:
+            time.sleep(delay)
+
+    def should_fail(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._rng.random() < self.error_rate
+
+    def rotate_access_token(self):
+        """Invalidates the current access token so authenticated calls get a 401."""
+        with self._lock:
+            number = int(self.access_token.rsplit('-', 1)[1]) + 1
+            self.access_token = f"fake-access-token-{number}"
+
+    # --- routing ---
+
+    def route(self, method: str, path: str, query: Dict[str, str], body: Dict[str, Any]):
+        if path == SERVICES_PREFIX + 'oauth2/token':
+            return 200, {'access_token': self.access_token, 'refresh_token': self.refresh_token, 'token_type': 'Bearer'}
+        if path == SERVICES_PREFIX + 'oauth2/introspect':
+            return 200, {'active': query.get('token') == self.access_token}
+
+        if not path.startswith(API_PREFIX):
+            return 404, {'errors': ['not found']}
+
+        endpoint = path[len(API_PREFIX):]
+        catalog = self.catalog
+
+        if endpoint == 'contentgrouping/search' and method == 'POST':
+            return 200, self._page(catalog.albums, body, 'contentGroupings')
+
+        if endpoint.startswith('contentgrouping/') and method == 'GET':
+            group_id = endpoint.split('/', 1)[1]
+            album = next((a for a in catalog.albums if a['id'] == group_id), None)
+            return (200, {'contentGroupings': [album]}) if album else (404, {'errors': ['not found']})
+
+        if endpoint == 'content/search':
+            page_size = int(query.get('pagecount', 5))
+            page_number = int(query.get('pagenum', 1))
+            episodes = list(catalog.episodes.values())
+            if query.get('orderby', '').endswith('ASC'):
+                episodes = episodes[::-1]
+            start = (page_number - 1) * page_size
+            return 200, {
+                'metadata': {'totalPageCount': -(-len(episodes) // page_size)},
+                'results': episodes[start:start + page_size],
+            }
+
+        if endpoint.startswith('content/') and method == 'GET':
+            content_id = endpoint.split('/', 1)[1]
+            episode = catalog.episodes.get(content_id)
+            return (200, self._include(episode, query)) if episode else (404, {'errors': ['not found']})
+
+        if endpoint == 'search' and method == 'POST':
+            return 200, self._search(body)
+
+        if endpoint == 'comment/search' and method == 'POST':
+            return 200, self._page(catalog.comments, body, 'comments')
+
+        for kind, key in (('character', 'characters'), ('author', 'authors'), ('topic', 'topics')):
+            if endpoint == f'{kind}/search' and method == 'POST':
+                return 200, self._page(catalog.people[key], body, key)
+            if endpoint.startswith(f'{kind}/') and method == 'GET':
+                entity_id = endpoint.split('/', 1)[1]
+                entity = next((e for e in catalog.people[key] if e['id'] == entity_id), None)
+                if entity is None:
+                    return 404, {'errors': ['not found']}
+                related = [{'id': e['id'], 'name': e['name']} for e in catalog.episodes.values()
+                           if any(ref['id'] == entity_id for ref in e['tags' if key == 'topics' else key])]
+                return 200, {key: [dict(entity, contentList=related)]}
+
+        if endpoint == 'viewer/home':
+            albums = catalog.albums[:10]
+            if query.get('carousel') == 'true':
+                return 200, {'carousel': [{'id': a['id'], 'name': a['name'], 'image_url': a['image_url']} for a in albums],
+                             'notifications': []}
+            return 200, {'playlists': albums, 'personal_playlists': []}
+
+        if endpoint == 'viewer':
+            return 200, {'profiles': [{'viewer_id': make_id('a3JUh', 1), 'username': 'bench', 'hasPIN': False}]}
+
+        # Mutations are acknowledged but not applied, so bulk operations can be benchmarked
+        if method in ('POST', 'PUT') and endpoint in ('bookmark', 'comment', 'content', 'contentgrouping'):
+            with self._lock:
+                self.mutations += 1
+                created_id = make_id('a3mUh', self.mutations)
+            if endpoint == 'contentgrouping':
+                return 200, {'metadata': {}, 'errors': [], 'contentGroupings': [{'id': created_id}]}
+            return 200, {'id': created_id, 'success': True}
+
+        return 404, {'errors': ['not found']}
+
+    def _page(self, items: List[Dict[str, Any]], body: Dict[str, Any], key: str) -> Dict[str, Any]:
+        page_size = int(body.get('pageSize', 25))
+        page_number = int(body.get('pageNumber', 1))
+        start = (page_number - 1) * page_size
+        return {
+            'metadata': {'totalPageCount': -(-len(items) // page_size), 'totalCount': len(items)},
+            'errors': [],
+            key: items[start:start + page_size],
+        }
+
+    @staticmethod
+    def _include(episode: Dict[str, Any], query: Dict[str, str]) -> Dict[str, Any]:
+        """Drops the parts of a content payload whose include flag (tag, recommendations, player) is not 'true'."""
+        dropped = set()
+        if query.get('tag') != 'true':
+            dropped.update(('tags', 'characters', 'authors'))
+        if query.get('recommendations') != 'true':
+            dropped.add('recommendations')
+        if query.get('player') != 'true':
+            dropped.update(('download_url', 'signed_cookie'))
+        return {k: v for k, v in episode.items() if k not in dropped}
+
+    def _search(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        term = str(body.get('searchTerm', '')).lower()
+        matches = [e for e in self.catalog.episodes.values() if term in e['name'].lower()] or list(self.catalog.episodes.values())
+        result_objects = []
+        for search_object in body.get('searchObjects', []):
+            fields = search_object.get('fields', ['Name'])
+            page_size = int(search_object.get('pageSize', 9))
+            results = []
+            for episode in matches[:page_size]:
+                result = {'id': episode['id']}
+                for i, field in enumerate(fields, start=1):
+                    result[f"column{i}"] = {'name': field, 'value': episode.get(field.lower().replace('__c', ''), episode['name'])}
+                results.append(result)
+            result_objects.append({
+                'objectName': search_object.get('objectName'),
+                'metadata': {'totalCount': len(matches), 'fields': fields},
+                'results': results,
+            })
+        return {'searchTerm': body.get('searchTerm', ''), 'resultObjects': result_objects}
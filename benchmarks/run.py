@@ -0,0 +1,334 @@
+"""
+End-to-end benchmarks for AIOClient/ClubClient against the local FakeAIOServer.
+
+Usage (from the repository root):
+
+    python -m benchmarks.run                                  # run everything, print a table
+    python -m benchmarks.run --latency 0.02 --jitter 0.01     # simulate network latency
+    python -m benchmarks.run --output results.json            # save results for later comparison
+    python -m benchmarks.run --compare baseline.json          # compare against a saved run
+
+Every scenario reports operations, wall time, throughput (ops/s), p50/p99 latency
+and errors. --compare exits with status 1 if any scenario's throughput dropped or
+p99 grew by more than --threshold (default 10%).
+"""
+
+import argparse
+import json
+import math
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Callable
+
+from adventuresinodyssey import (AIOClient, ClubClient, RecordingTransport, ReplayTransport, HedgingPolicy,
+                                 StaleWhileRevalidateCache, HTTPCache, __version__)
+from .fake_server import FakeAIOServer, FakeCatalog, make_id
+
+
+def percentile(samples: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _timed(func: Callable[[], Any], latencies: List[float], errors: List[Exception]):
+    start = time.perf_counter()
+    try:
+        func()
+    except Exception as e:
+        errors.append(e)
+    latencies.append(time.perf_counter() - start)
+
+
+def make_aio_client(server: FakeAIOServer) -> AIOClient:
+    client = AIOClient()
+    client.config['api_base'] = server.api_base
+    return client
+
+
+def make_club_client(server: FakeAIOServer, workdir: Path) -> ClubClient:
+    """Builds a ClubClient with a saved session, so it refreshes instead of launching a browser."""
+    session_file = workdir / 'club_session.json'
+    session_file.write_text(json.dumps({
+        'refresh_token': server.refresh_token,
+        'viewer_id': make_id('a3JUh', 1),
+        'pin': '0000',
+    }))
+    client = ClubClient(email='bench@example.com', password='unused', config_path=str(session_file), auto_relogin=False)
+    client.config['api_base'] = server.api_base
+    return client
+
+
+# --- scenarios ---
+# Each scenario returns the latency of every operation it ran; errors are collected separately.
+
+def bench_cache_episodes(server: FakeAIOServer, args: argparse.Namespace, errors: List[Exception]) -> List[float]:
+    client = make_aio_client(server)
+    latencies: List[float] = []
+    for _ in range(args.iterations):
+        _timed(lambda: client.cache_episodes(), latencies, errors)
+    return latencies
+
+
+def bench_search_all(server: FakeAIOServer, args: argparse.Namespace, errors: List[Exception]) -> List[float]:
+    client = make_aio_client(server)
+    latencies: List[float] = []
+    for i in range(args.iterations * 20):
+        _timed(lambda: client.search_all(f"Episode {i % 50}"), latencies, errors)
+    return latencies
+
+
+def bench_fetch_content_batch(server: FakeAIOServer, args: argparse.Namespace, errors: List[Exception]) -> List[float]:
+    client = make_aio_client(server)
+    content_ids = list(server.catalog.episodes)[:args.batch_size]
+    latencies: List[float] = []
+
+    def fetch(content_id: str):
+        _timed(lambda: client.fetch_content(content_id), latencies, errors)
+
+    for _ in range(args.iterations):
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            list(pool.map(fetch, content_ids))
+    return latencies
+
+
+def bench_fetch_content_playback(server: FakeAIOServer, args: argparse.Namespace, errors: List[Exception]) -> List[float]:
+    """Same batch as fetch_content_batch, with the slim 'playback' projection."""
+    client = make_aio_client(server)
+    content_ids = list(server.catalog.episodes)[:args.batch_size]
+    latencies: List[float] = []
+
+    def fetch(content_id: str):
+        _timed(lambda: client.fetch_content(content_id, projection='playback'), latencies, errors)
+
+    for _ in range(args.iterations):
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            list(pool.map(fetch, content_ids))
+    return latencies
+
+
+def bench_fetch_content_hedged(server: FakeAIOServer, args: argparse.Namespace, errors: List[Exception]) -> List[float]:
+    """Same batch as fetch_content_batch, with a HedgingPolicy (most useful with --tail-rate)."""
+    client = make_aio_client(server)
+    client.hedging = HedgingPolicy(budget=0.1)
+    content_ids = list(server.catalog.episodes)[:args.batch_size]
+    latencies: List[float] = []
+
+    def fetch(content_id: str):
+        _timed(lambda: client.fetch_content(content_id), latencies, errors)
+
+    for _ in range(args.iterations):
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            list(pool.map(fetch, content_ids))
+    client.hedging.close()
+    return latencies
+
+
+def bench_fetch_content_cached(server: FakeAIOServer, args: argparse.Namespace, errors: List[Exception]) -> List[float]:
+    """Same batch as fetch_content_batch through an HTTPCache, so repeat fetches are answered with a 304."""
+    client = make_aio_client(server)
+    content_ids = list(server.catalog.episodes)[:args.batch_size]
+    latencies: List[float] = []
+
+    def fetch(content_id: str):
+        _timed(lambda: client.fetch_content(content_id), latencies, errors)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        client.http_cache = HTTPCache(Path(workdir) / 'http_cache')
+        for _ in range(args.iterations):
+            with ThreadPoolExecutor(max_workers=args.workers) as pool:
+                list(pool.map(fetch, content_ids))
+    return latencies
+
+
+def _landing_pages(client: AIOClient, args: argparse.Namespace, errors: List[Exception]) -> List[float]:
+    latencies: List[float] = []
+
+    def load(_):
+        _timed(lambda: (client.fetch_home_playlists(), client.fetch_carousel(), client.fetch_radio('aired')), latencies, errors)
+
+    for _ in range(args.iterations):
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            list(pool.map(load, range(args.batch_size)))
+    return latencies
+
+
+def bench_landing_pages(server: FakeAIOServer, args: argparse.Namespace, errors: List[Exception]) -> List[float]:
+    """fetch_home_playlists + fetch_carousel + fetch_radio per page load."""
+    return _landing_pages(make_aio_client(server), args, errors)
+
+
+def bench_landing_pages_swr(server: FakeAIOServer, args: argparse.Namespace, errors: List[Exception]) -> List[float]:
+    """The same page loads through a StaleWhileRevalidateCache with a short soft TTL."""
+    client = make_aio_client(server)
+    client.swr_cache = StaleWhileRevalidateCache(soft_ttl=0.05, hard_ttl=60)
+    try:
+        return _landing_pages(client, args, errors)
+    finally:
+        client.swr_cache.close()
+
+
+def bench_authenticated(server: FakeAIOServer, args: argparse.Namespace, errors: List[Exception]) -> List[float]:
+    with tempfile.TemporaryDirectory() as workdir:
+        client = make_club_client(server, Path(workdir))
+        content_ids = list(server.catalog.episodes)[:args.batch_size]
+        latencies: List[float] = []
+        for i in range(args.iterations):
+            if i:
+                # Force one 401 -> refresh -> retry cycle per iteration
+                server.rotate_access_token()
+            for content_id in content_ids[:20]:
+                _timed(lambda: client.fetch_content(content_id), latencies, errors)
+        return latencies
+
+
+def bench_bulk_bookmark(server: FakeAIOServer, args: argparse.Namespace, errors: List[Exception]) -> List[float]:
+    """Bookmarks a batch of IDs with bulk_bookmark() (one auth check for the whole batch)."""
+    with tempfile.TemporaryDirectory() as workdir:
+        client = make_club_client(server, Path(workdir))
+        content_ids = list(server.catalog.episodes)[:args.batch_size]
+        latencies: List[float] = []
+        for _ in range(args.iterations):
+            _timed(lambda: client.bulk_bookmark(content_ids, max_workers=args.workers), latencies, errors)
+        return latencies
+
+
+def bench_replay(server: FakeAIOServer, args: argparse.Namespace, errors: List[Exception]) -> List[float]:
+    """Records one crawl + search, then replays it from the cassette with no network."""
+    with tempfile.TemporaryDirectory() as workdir:
+        cassette = Path(workdir) / 'cassette.jsonl'
+        recorder = RecordingTransport(cassette)
+        client = AIOClient(transport=recorder)
+        client.config['api_base'] = server.api_base
+        client.cache_episodes()
+        client.search_all("Episode 1")
+        recorder.close()
+
+        client = AIOClient(transport=ReplayTransport(cassette))
+        client.config['api_base'] = server.api_base
+        latencies: List[float] = []
+        for _ in range(args.iterations * 10):
+            _timed(lambda: (client.cache_episodes(), client.search_all("Episode 1")), latencies, errors)
+        return latencies
+
+
+SCENARIOS: Dict[str, Callable[..., List[float]]] = {
+    'cache_episodes': bench_cache_episodes,
+    'search_all': bench_search_all,
+    'fetch_content_batch': bench_fetch_content_batch,
+    'fetch_content_playback': bench_fetch_content_playback,
+    'fetch_content_hedged': bench_fetch_content_hedged,
+    'fetch_content_cached': bench_fetch_content_cached,
+    'landing_pages': bench_landing_pages,
+    'landing_pages_swr': bench_landing_pages_swr,
+    'authenticated_fetch_content': bench_authenticated,
+    'bulk_bookmark': bench_bulk_bookmark,
+    'replay_crawl_and_search': bench_replay,
+}
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    catalog = FakeCatalog(albums=args.albums, episodes_per_album=args.episodes_per_album)
+    results: Dict[str, Any] = {}
+
+    with FakeAIOServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, catalog=catalog,
+                       tail_rate=args.tail_rate, tail_latency=args.tail_latency) as server:
+        for name, scenario in SCENARIOS.items():
+            if args.only and name not in args.only:
+                continue
+            errors: List[Exception] = []
+            requests_before = sum(server.request_counts.values())
+            bytes_before = server.bytes_sent
+            start = time.perf_counter()
+            latencies = scenario(server, args, errors)
+            elapsed = time.perf_counter() - start
+
+            results[name] = {
+                'operations': len(latencies),
+                'seconds': elapsed,
+                'throughput': len(latencies) / elapsed if elapsed else None,
+                'p50_ms': percentile(latencies, 0.50) * 1000 if latencies else None,
+                'p99_ms': percentile(latencies, 0.99) * 1000 if latencies else None,
+                'errors': len(errors),
+                'http_requests': sum(server.request_counts.values()) - requests_before,
+                'http_kb': (server.bytes_sent - bytes_before) / 1024,
+            }
+
+    return {
+        'package_version': __version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'config': {k: v for k, v in vars(args).items() if k not in ('output', 'compare')},
+        'results': results,
+    }
+
+
+def print_results(report: Dict[str, Any]):
+    header = f"{'scenario':<30}{'ops':>8}{'ops/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}{'http':>8}{'KB':>10}"
+    print(header)
+    print('-' * len(header))
+    for name, r in report['results'].items():
+        print(f"{name:<30}{r['operations']:>8}{r['throughput']:>12.1f}{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}{r['errors']:>8}{r['http_requests']:>8}{r.get('http_kb', 0):>10.1f}")
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> bool:
+    """Prints per-scenario deltas against a baseline. Returns False if anything regressed."""
+    ok = True
+    print(f"\nComparison against baseline ({baseline.get('package_version')}, {baseline.get('timestamp')}):")
+    for name, current in report['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous:
+            print(f"  {name}: no baseline")
+            continue
+
+        throughput_delta = (current['throughput'] - previous['throughput']) / previous['throughput']
+        p99_delta = (current['p99_ms'] - previous['p99_ms']) / previous['p99_ms']
+        regressed = throughput_delta < -threshold or p99_delta > threshold
+        ok = ok and not regressed
+        flag = 'REGRESSION' if regressed else 'ok'
+        print(f"  {name}: throughput {throughput_delta:+.1%}, p99 {p99_delta:+.1%} [{flag}]")
+    return ok
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the AIO clients against a local fake API server.")
+    parser.add_argument('--latency', type=float, default=0.0, help="Base server latency in seconds.")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Extra random server latency (0..jitter seconds).")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with a 503.")
+    parser.add_argument('--tail-rate', type=float, default=0.0, help="Fraction of requests delayed by --tail-latency.")
+    parser.add_argument('--tail-latency', type=float, default=1.0, help="Extra delay in seconds for tail requests.")
+    parser.add_argument('--iterations', type=int, default=3, help="Repetitions per scenario.")
+    parser.add_argument('--workers', type=int, default=8, help="Thread pool size for batched scenarios.")
+    parser.add_argument('--batch-size', type=int, default=100, help="Content IDs per batched fetch.")
+    parser.add_argument('--albums', type=int, default=250, help="Albums in the fake catalog.")
+    parser.add_argument('--episodes-per-album', type=int, default=12, help="Episodes per album in the fake catalog.")
+    parser.add_argument('--only', nargs='*', choices=list(SCENARIOS), help="Run only these scenarios.")
+    parser.add_argument('--output', help="Write the results as JSON to this file.")
+    parser.add_argument('--compare', help="Compare against a previously saved JSON result.")
+    parser.add_argument('--threshold', type=float, default=0.10, help="Allowed regression before --compare fails.")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    print_results(report)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nResults saved to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if not compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,7 +3,7 @@ import random
 from datetime import timedelta
 from dotenv import load_dotenv
 
-from adventuresinodyssey import ClubClient
+from adventuresinodyssey import ClubClient, PlaybackQueue
 from adventuresinodyssey import set_logging_level
 import mpv
 
@@ -73,8 +73,7 @@ class OdysseyTUI(App):
         self.client = None
         self.all_episodes = []
         self.filtered_episodes = [] 
-        self.queue = [] 
-        self.current_cookie = ""
+        self.queue = None
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -110,9 +109,10 @@ class OdysseyTUI(App):
                 profile_username=os.getenv("AIO_PROFILE_USERNAME"),
                 pin=os.getenv("AIO_PIN"),
             )
+            # Resolves the next tracks (and their first 256 KB) while the current one plays
+            self.queue = PlaybackQueue(self.client, prefetch=2, warm_bytes=256 * 1024)
             self.all_episodes = self.client.cache_episodes()
             self.filtered_episodes = list(self.all_episodes)
-            self.current_cookie = self.client.fetch_signed_cookie('audio')
             self.call_from_thread(self.populate_table)
         except Exception as e:
             self.notify(f"Login Failed: {e}", severity="error")
@@ -151,26 +151,26 @@ class OdysseyTUI(App):
         self.add_to_queue(episode)
 
     def add_to_queue(self, episode):
-        self.queue.append(episode)
+        self.queue.add(episode)
         self.query_one("#queue_list").append(ListItem(Label(episode['short_name'])))
         if not self.player.filename:
             self.play_next()
 
     def play_next(self):
-        if not self.queue:
+        item = self.queue.next() if self.queue else None
+        if item is None:
             self.query_one("#now_playing").update("Queue Empty")
             self.query_one("#percentage_label").update("0% Remaining")
             self.player.stop()
             return
 
-        episode = self.queue.pop(0)
+        episode = item['episode']
         try:
             self.query_one("#queue_list").pop(0)
         except: pass
 
-        url = "https://media.adventuresinodyssey.com/" + episode["download_url"] + self.current_cookie
         self.query_one("#now_playing").update(f"Playing: {episode['short_name']}")
-        self.player.play(url)
+        self.player.play(item['url'])
 
     def update_status(self):
         if self.player.time_pos is not None and self.player.duration is not None: